@@ -1,36 +1,248 @@
-import joblib
-import numpy as np
-from config.paths_config import MODEL_OUTPUT_PATH
-from flask import Flask, render_template, request
+import os
+import time
+from src.instrumentation import ImportProfiler
+
+startup_start = time.perf_counter()
+
+# hanya module yang dibutuhkan inference yang di-import (tanpa pandas, sklearn, lightgbm, mlflow, google-cloud),
+# waktu import per package dicatat untuk mengukur cold start pod serving
+with ImportProfiler() as import_profile:
+    from config.paths_config import MODEL_OUTPUT_PATH, COMPILED_MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH, CALIBRATOR_OUTPUT_PATH, MODEL_REGISTRY_DIR, SCORING_JOBS_DIR, CONFIG_PATH
+    from flask import Flask, render_template, request, jsonify, g, Response, send_file, url_for
+    from src.model_registry import ModelRegistry
+    from src.prediction_cache import PredictionCache
+    from src.scoring_jobs import ScoringJobManager
+    from src.instrumentation import MetricsRegistry, peak_rss_mb
+    from src.logger import get_logger
+    from utils.common_functions import read_yaml
+
+logger = get_logger(__name__)
+request_logger = get_logger('application.requests')  # 1 log per request, disampling lewat LOG_SAMPLING
 
 app = Flask(__name__)
 
-loaded_model = joblib.load(MODEL_OUTPUT_PATH)
+serving_config = read_yaml(CONFIG_PATH)['serving']
+micro_batching = serving_config['micro_batching']
+registry_config = serving_config['model_registry']
+cache_config = serving_config['prediction_cache']
+jobs_config = serving_config['scoring_jobs']
+
+# mode opsional: request single booking yang datang bersamaan digabung jadi 1 batch ke model
+use_micro_batching = micro_batching['enabled'] or os.environ.get('MICRO_BATCHING') == '1'
+
+# mode opsional: hasil prediksi untuk vektor fitur yang sama (re-quote, refresh UI) diambil dari cache
+prediction_cache = None
+if cache_config['enabled'] or os.environ.get('PREDICTION_CACHE') == '1':
+    prediction_cache = PredictionCache(cache_config['max_entries'], cache_config['ttl_seconds'])
+
+# model & artifact preprocessing dibaca dari versi terbaru di registry (atau artifact di artifacts/models jika registry masih kosong),
+# lalu versi baru yang dipublish oleh training dimuat di background tanpa restart (MODEL_RELOAD=0 untuk mematikan)
+model_registry = ModelRegistry(
+    MODEL_REGISTRY_DIR,
+    (MODEL_OUTPUT_PATH, COMPILED_MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH, CALIBRATOR_OUTPUT_PATH),
+    poll_interval=registry_config['poll_interval_seconds'] if os.environ.get('MODEL_RELOAD', '1') != '0' else None,
+    warmup_rows=registry_config['warmup_rows'],
+    micro_batching=(micro_batching['max_batch_size'], micro_batching['max_latency_ms']) if use_micro_batching else None,
+    cache=prediction_cache
+)
+
+model_load_start = time.perf_counter()
+model_registry.load()
+model_load_seconds = time.perf_counter() - model_load_start
+
+# scoring file besar (JSONL / Parquet) dijalankan di proses terpisah, status & hasil disimpan di folder job
+scoring_jobs = ScoringJobManager(SCORING_JOBS_DIR, model_registry, jobs_config['batch_size'], jobs_config['max_concurrent_jobs'])
+
+# metrics serving dalam format prometheus, dibaca dari endpoint /metrics;
+# nilai disimpan per proses worker gunicorn, setiap series diberi label worker_pid (lihat config/gunicorn_config.py)
+metrics = MetricsRegistry(const_labels_fn=lambda: {'worker_pid': os.getpid()})
+request_latency = metrics.histogram('http_request_duration_seconds', 'latency of http requests in seconds', ['endpoint', 'method'])
+request_count = metrics.counter('http_requests_total', 'number of http requests', ['endpoint', 'method', 'status'])
+predicted_rows = metrics.counter('predicted_rows_total', 'number of rows scored by the model', ['endpoint'])
+invalid_rows = metrics.counter('invalid_rows_total', 'number of rows rejected by feature validation', ['endpoint'])
+metrics.gauge('process_peak_rss_bytes', 'peak resident memory of the serving process', lambda: int(peak_rss_mb() * 1024 * 1024))
+metrics.gauge('model_version_loads', 'number of model versions loaded by this process', lambda: model_registry.reloads)
+metrics.gauge('startup_import_seconds', 'time spent importing serving modules at startup', lambda: round(import_profile.total_seconds, 4))
+metrics.gauge('startup_model_load_seconds', 'time spent loading and warming up the first model version', lambda: round(model_load_seconds, 4))
+
+if prediction_cache is not None:
+    metrics.gauge('prediction_cache_hits_total', 'rows answered from the prediction cache', lambda: prediction_cache.hits, 'counter')
+    metrics.gauge('prediction_cache_misses_total', 'rows sent to the model after a cache miss', lambda: prediction_cache.misses, 'counter')
+    metrics.gauge('prediction_cache_evictions_total', 'entries evicted from the prediction cache', lambda: prediction_cache.evictions, 'counter')
+    metrics.gauge('prediction_cache_entries', 'entries currently held in the prediction cache', lambda: len(prediction_cache))
+
+
+@app.before_request
+
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+
+def record_request(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'  # pakai pola route agar jumlah label tetap kecil
+
+    duration = time.perf_counter() - g.request_start
+    request_latency.observe(duration, endpoint=endpoint, method=request.method)
+    request_count.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+
+    # pesan & field diformat di thread logging, request tidak menunggu I/O disk
+    request_logger.info(
+        '%s %s %s %.2fms', request.method, endpoint, response.status_code, duration * 1000,
+        extra={'endpoint': endpoint, 'method': request.method, 'status': response.status_code, 'duration_ms': round(duration * 1000, 3)}
+    )
+
+    return response
+
 
 @app.route('/', methods=['GET', 'POST'])
 
 def index():
     if request.method=='POST':
 
-        lead_time = int(request.form['lead_time'])
-        no_of_special_request = int(request.form['no_of_special_request'])
-        avg_price_per_room = float(request.form['avg_price_per_room'])
-        arrival_month = int(request.form['arrival_month'])
-        arrival_date = int(request.form['arrival_date'])
-        market_segment_type = int(request.form['market_segment_type'])
-        no_of_week_nights = int(request.form['no_of_week_nights'])
-        no_of_weekend_nights = int(request.form['no_of_weekend_nights'])
-        type_of_meal_plan = int(request.form['type_of_meal_plan'])
-        room_type_reserved = int(request.form['room_type_reserved'])
+        # nilai form dikirim apa adanya (string), konversi tipe & pengecekan range dilakukan oleh feature schema
+        record = {
+            'lead_time': request.form.get('lead_time'),
+            'no_of_special_requests': request.form.get('no_of_special_request'),
+            'avg_price_per_room': request.form.get('avg_price_per_room'),
+            'arrival_month': request.form.get('arrival_month'),
+            'arrival_date': request.form.get('arrival_date'),
+            'market_segment_type': request.form.get('market_segment_type'),
+            'no_of_week_nights': request.form.get('no_of_week_nights'),
+            'no_of_weekend_nights': request.form.get('no_of_weekend_nights'),
+            'type_of_meal_plan': request.form.get('type_of_meal_plan'),
+            'room_type_reserved': request.form.get('room_type_reserved')
+        }
 
-        features = np.array([[lead_time, no_of_special_request, avg_price_per_room, arrival_month, arrival_date, market_segment_type, no_of_week_nights, no_of_weekend_nights, type_of_meal_plan, room_type_reserved]])
+        _, batch_predictor = model_registry.current()
+        result = batch_predictor.predict_records([record])
 
-        prediction = loaded_model.predict(features)
+        if result['errors']:
+            return render_template('index.html', prediction=None, errors=result['errors'][0]['errors']), 400
 
-        return render_template('index.html', prediction=prediction[0])
+        predicted_rows.inc(endpoint='/')
+
+        return render_template('index.html', prediction=result['predictions'][0], cancellation_probability=result.get('cancellation_probabilities', [None])[0])
     
     return render_template('index.html', prediction=None)
 
 
+@app.route('/predict/batch', methods=['POST'])
+
+def predict_batch():
+    try:
+        model_version, batch_predictor = model_registry.current()
+
+        records = batch_predictor.parse_payload(request.get_data(), request.content_type)
+        result = batch_predictor.predict_records(records)
+        result['model_version'] = model_version
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    predicted_rows.inc(result['valid_count'], endpoint='/predict/batch')
+    invalid_rows.inc(result['count'] - result['valid_count'], endpoint='/predict/batch')
+
+    # baris yang tidak valid dilaporkan di 'errors', request hanya ditolak jika tidak ada satupun baris yang valid
+    if result['valid_count'] == 0:
+        return jsonify(result), 400
+
+    return jsonify(result)
+
+
+@app.route('/jobs', methods=['POST'])
+
+def submit_job():
+    # file dikirim sebagai multipart (field 'file') atau langsung sebagai body request
+    upload = request.files.get('file')
+    filename = upload.filename if upload is not None else ''
+    content_type = request.content_type or ''
+
+    input_format = request.args.get('format')
+    if input_format is None:
+        input_format = 'parquet' if filename.endswith('.parquet') or 'parquet' in content_type else 'jsonl'
+
+    try:
+        status = scoring_jobs.submit(upload.stream if upload is not None else request.stream, input_format)
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    status['status_url'] = url_for('job_status', job_id=status['job_id'])
+    status['result_url'] = url_for('job_result', job_id=status['job_id'])
+
+    return jsonify(status), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+
+def job_status(job_id):
+    try:
+        status = scoring_jobs.status(job_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if status is None:
+        return jsonify({'error': f'job {job_id} not found'}), 404
+
+    return jsonify(status)
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+
+def job_result(job_id):
+    try:
+        status = scoring_jobs.status(job_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if status is None:
+        return jsonify({'error': f'job {job_id} not found'}), 404
+
+    if status['status'] != 'completed':
+        return jsonify({'error': f"job {job_id} is {status['status']}", 'progress': status['progress']}), 409
+
+    return send_file(os.path.abspath(scoring_jobs.result_path(job_id)), mimetype='application/x-ndjson', as_attachment=True, download_name=f'{job_id}.jsonl')
+
+
+@app.route('/health', methods=['GET'])
+
+def health():
+    # liveness : proses worker masih hidup & bisa melayani request
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+
+@app.route('/ready', methods=['GET'])
+
+def ready():
+    # readiness : model sudah dimuat & di-warm-up, baru boleh menerima traffic
+    model_version, batch_predictor = model_registry.current()
+
+    if batch_predictor is None:
+        return jsonify({'status': 'loading'}), 503
+
+    return jsonify({
+        'status': 'ready',
+        'model_version': model_version,
+        'model': type(batch_predictor.model).__name__,
+        'features': len(batch_predictor.feature_columns)
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+logger.info(
+    'serving app ready in %.3fs : imports %.3fs %s, model load %.3fs',
+    time.perf_counter() - startup_start, import_profile.total_seconds, import_profile.breakdown(), model_load_seconds,
+    extra={'import_seconds': import_profile.breakdown(top=None)}
+)
+
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8080)
\ No newline at end of file
+    # dev server 1 proses; untuk production pakai : gunicorn --config config/gunicorn_config.py application:app
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import json
+import argparse
+import tempfile
+from src.data_preprocessing import DataProcessor
+from src.feature_selection import compare_methods, SELECTION_METHODS
+from config.paths_config import TRAIN_FILE_PATH, CONFIG_PATH
+from utils.common_functions import load_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='compare runtime and ranking stability of feature selection methods')
+    parser.add_argument('--input', default=TRAIN_FILE_PATH)
+    parser.add_argument('--methods', nargs='+', default=SELECTION_METHODS)
+    parser.add_argument('--sample-size', type=int, default=20000)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as processed_dir:
+        processor = DataProcessor(None, None, processed_dir, CONFIG_PATH)
+
+        # data yang diranking sama dengan di pipeline : hasil preprocessing + SMOTE
+        df = processor.balance_data(processor.preprocessed_data(load_data(args.input), 'benchmark', fit=True))
+
+    X = df.drop(columns=['booking_status'])
+    y = df['booking_status']
+    top_k = processor.config['data_processing']['no_of_features']
+
+    report = {
+        'rows': len(X),
+        'top_k': top_k,
+        'results': compare_methods(X, y, top_k, methods=args.methods, sample_size=args.sample_size, n_jobs=args.n_jobs)
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+from src.data_preprocessing import DataProcessor
+from config.paths_config import RAW_FILE_PATH, CONFIG_PATH
+from utils.common_functions import read_yaml, optimize_dtypes
+
+
+def replicate(df, factor):
+    # setiap replika diberi Booking_ID & harga yang sedikit berbeda agar tidak terbuang oleh drop_duplicates
+    replicas = []
+    for i in range(factor):
+        replica = df.copy()
+        replica['Booking_ID'] = replica['Booking_ID'] + f'_{i}'
+        replica['avg_price_per_room'] = replica['avg_price_per_room'] + i * 0.001
+        replicas.append(replica)
+    return pd.concat(replicas, ignore_index=True)
+
+
+def legacy_preprocessed_data(df, config):
+    # implementasi lama DataProcessor.preprocessed_data (sebelum vectorized) sebagai pembanding
+    df.drop(columns=['Booking_ID'], inplace=True)
+    df.drop_duplicates(inplace=True)
+
+    cat_cols = config['data_processing']['categorical_columns']
+    num_cols = config['data_processing']['numerical_columns']
+
+    label_encoder = LabelEncoder()
+    mappings = {}
+
+    for col in cat_cols:
+        df[col] = label_encoder.fit_transform(df[col])
+        mappings[col] = {label:code for label, code in zip(label_encoder.classes_, label_encoder.transform(label_encoder.classes_))}
+
+    skew_threshold = config['data_processing']['skewness_threshold']
+    skewness = df[num_cols].apply(lambda x:x.skew())
+
+    for column in skewness[skewness > skew_threshold].index:
+        df[column] = np.log1p(df[column])
+
+    return df
+
+
+def measure(name, fn, df):
+    df = df.copy()
+    n_rows = len(df)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'name': name,
+        'rows': n_rows,
+        'output_rows': len(result),
+        'seconds': round(elapsed, 4),
+        'rows_per_sec': round(n_rows / elapsed),
+        'peak_memory_mb': round(peak / 1e6, 2),
+        'output_memory_mb': round(result.memory_usage(deep=True).sum() / 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark DataProcessor.preprocessed_data before and after vectorization')
+    parser.add_argument('--input', default=RAW_FILE_PATH)
+    parser.add_argument('--factor', type=int, default=10)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    config = read_yaml(CONFIG_PATH)
+    data = replicate(pd.read_csv(args.input), args.factor)
+
+    with tempfile.TemporaryDirectory() as processed_dir:
+        processor = DataProcessor(None, None, processed_dir, CONFIG_PATH)
+
+        results = [
+            measure('legacy', lambda df: legacy_preprocessed_data(df, config), data),
+            measure('vectorized', lambda df: processor.preprocessed_data(df, 'benchmark', fit=True), data),
+            measure('vectorized_typed_input', lambda df: processor.preprocessed_data(df, 'benchmark', fit=True), optimize_dtypes(data.copy()))
+        ]
+
+    report = {'factor': args.factor, 'results': results}
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import json
+import argparse
+
+METRICS = ['wall_seconds', 'latency_p50_ms']
+
+
+def load_results(path):
+    with open(path, 'r') as f:
+        report = json.load(f)
+
+    results = {}
+    for size, records in report['results'].items():
+        for record in records:
+            results[size, record['name'], record.get('rows')] = record
+
+    return report, results
+
+
+def compare(baseline_path, candidate_path, threshold):
+    baseline_report, baseline = load_results(baseline_path)
+    candidate_report, candidate = load_results(candidate_path)
+
+    rows = []
+    for key in baseline.keys() & candidate.keys():
+        for metric in METRICS:
+            before, after = baseline[key].get(metric), candidate[key].get(metric)
+            if not before or after is None:
+                continue
+
+            ratio = after / before
+            rows.append({
+                'size': key[0],
+                'name': key[1],
+                'rows': key[2],
+                'metric': metric,
+                'baseline': before,
+                'candidate': after,
+                'ratio': round(ratio, 3),
+                'regression': ratio > 1 + threshold
+            })
+
+    return baseline_report.get('commit'), candidate_report.get('commit'), sorted(rows, key=lambda row: (row['size'], row['name'], row['rows'] or 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='compare two run_benchmarks.py result files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.1, help='kenaikan waktu relatif yang dianggap regresi')
+    args = parser.parse_args()
+
+    baseline_commit, candidate_commit, rows = compare(args.baseline, args.candidate, args.threshold)
+
+    print(f'baseline {baseline_commit} vs candidate {candidate_commit}')
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f"{row['size']:>5} {row['name']:<40} {str(row['rows']):>8} {row['metric']:<15} {row['baseline']:>10} -> {row['candidate']:<10} x{row['ratio']:<6} {flag}")
+
+    if any(row['regression'] for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
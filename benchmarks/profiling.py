@@ -0,0 +1,61 @@
+import time
+import resource
+import tracemalloc
+import multiprocessing
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # linux : KB
+
+
+def measure(name, fn, rows=None, **extra):
+    # wall time, cpu time, puncak alokasi python/numpy (tracemalloc) dan puncak RSS proses
+    rss_before = max_rss_mb()
+    tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    result = fn()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record = {
+        'name': name,
+        'rows': rows,
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'rows_per_sec': round(rows / wall) if rows and wall > 0 else None,
+        'traced_peak_mb': round(peak / 1e6, 2),
+        'max_rss_mb': round(max_rss_mb(), 1),
+        'rss_growth_mb': round(max_rss_mb() - rss_before, 1),
+        **extra
+    }
+    return record, result
+
+
+def _child(fn, args, connection):
+    try:
+        connection.send(('ok', fn(*args)))
+    except Exception as e:
+        connection.send(('error', repr(e)))
+    finally:
+        connection.close()
+
+
+def run_isolated(fn, *args):
+    # tiap grup stage dijalankan di proses anak (fork) agar puncak RSS satu stage tidak terbawa ke stage lain
+    context = multiprocessing.get_context('fork')
+    parent_connection, child_connection = context.Pipe(duplex=False)
+
+    process = context.Process(target=_child, args=(fn, args, child_connection))
+    process.start()
+    child_connection.close()
+
+    status, payload = parent_connection.recv()
+    process.join()
+
+    if status != 'ok':
+        raise RuntimeError(payload)
+    return payload
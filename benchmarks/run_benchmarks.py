@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import numpy as np
+from datetime import datetime
+from config.paths_config import *
+from utils.common_functions import read_yaml, load_data
+from benchmarks.synthetic_data import write_synthetic_csv
+from benchmarks.profiling import measure, run_isolated
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZES = {'10k': 10000, '100k': 100000, '1m': 1000000, '10m': 10000000}
+STAGES = ['ingestion', 'preprocessing', 'training', 'serving']
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def prepare_workspace(workdir, n_rows, seed):
+    # semua path di config/paths_config.py relatif, jadi tiap ukuran data dijalankan di folder kerja sendiri
+    workspace = os.path.join(workdir, f'rows_{n_rows}')
+    os.makedirs(os.path.join(workspace, 'config'), exist_ok=True)
+    shutil.copyfile(CONFIG_PATH, os.path.join(workspace, CONFIG_PATH))
+
+    raw_path = os.path.join(workspace, RAW_FILE_PATH)
+    if not os.path.exists(raw_path):
+        write_synthetic_csv(raw_path, n_rows, seed=seed)
+
+    return workspace
+
+
+def bench_ingestion(n_rows):
+    from src.data_ingestion import DataIngestion
+
+    ingestion = DataIngestion(read_yaml(CONFIG_PATH))
+    results = []
+
+    record, _ = measure('ingestion.split_data_streaming', ingestion.split_data_streaming, n_rows)
+    results.append(record)
+
+    # split_data dijalankan terakhir agar train/test untuk stage berikutnya sama dengan pipeline default
+    record, _ = measure('ingestion.split_data', ingestion.split_data, n_rows)
+    results.append(record)
+
+    return results
+
+
+def bench_preprocessing(n_rows):
+    from src.data_preprocessing import DataProcessor
+
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    results = []
+
+    record, train_df = measure('preprocessing.load_data', lambda: load_data(TRAIN_FILE_PATH), None)
+    record['rows'] = len(train_df)
+    results.append(record)
+    test_df = load_data(TEST_FILE_PATH)
+
+    record, train_df = measure('preprocessing.preprocessed_data', lambda: processor.preprocessed_data(train_df, TRAIN_NAME_PATH, fit=True), len(train_df))
+    results.append(record)
+    test_df = processor.preprocessed_data(test_df, TEST_NAME_PATH)
+
+    method = processor.config['data_processing'].get('balancing', {}).get('method', 'smote')
+    record, train_df = measure('preprocessing.balance_data', lambda: processor.balance_data(train_df), len(train_df), method=method)
+    record['output_rows'] = len(train_df)
+    results.append(record)
+
+    method = processor.config['data_processing'].get('feature_selection', {}).get('method', 'random_forest')
+    record, train_df = measure('preprocessing.select_feature', lambda: processor.select_feature(train_df), len(train_df), method=method)
+    results.append(record)
+    test_df = test_df[train_df.columns]
+
+    def save():
+        processor.save_data(train_df, PROCESSED_TRAIN_DATA_PATH)
+        processor.save_data(test_df, PROCESSED_TEST_DATA_PATH)
+        processor.save_transformer(train_df)
+
+    record, _ = measure('preprocessing.save_data', save, len(train_df) + len(test_df))
+    results.append(record)
+
+    return results
+
+
+def bench_training(n_rows, search_mode=None):
+    from src.model_training import ModelTraining
+
+    training = ModelTraining(PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH)
+    if search_mode:
+        training.search_mode = search_mode
+
+    X_train, y_train, X_test, y_test = training.load_and_split_data()
+
+    record, model = measure('training.train_lgbm', lambda: training.train_lgbm(X_train, y_train), len(X_train), search_mode=training.search_mode)
+    record.update(training.evaluate_model(model, X_test, y_test))
+
+    # model disimpan supaya stage serving memakai artifact yang sama seperti saat deploy
+    training.save_model(model)
+    training.compile_model(model, X_test)
+
+    return [record]
+
+
+def bench_serving(n_rows, batch_sizes, repeats):
+    import pandas as pd
+
+    record, application = measure('serving.startup', lambda: __import__('application'), None)
+    results = [record]
+
+    client = application.app.test_client()
+    _, batch_predictor = application.model_registry.current()
+    features = batch_predictor.feature_columns
+    raw_test = pd.read_csv(RAW_FILE_PATH, usecols=features, nrows=max(batch_sizes))
+
+    for batch_size in batch_sizes:
+        payload = raw_test.head(batch_size).to_json(orient='records')
+
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            response = client.post('/predict/batch', data=payload, content_type='application/json')
+            latencies.append(time.perf_counter() - start)
+
+            if response.status_code != 200:
+                raise RuntimeError(f'predict endpoint returned {response.status_code} : {response.get_data(as_text=True)}')
+
+        latencies = np.asarray(latencies) * 1000
+        results.append({
+            'name': 'serving.predict_batch',
+            'rows': batch_size,
+            'repeats': repeats,
+            'model': type(batch_predictor.model).__name__,
+            'latency_p50_ms': round(float(np.percentile(latencies, 50)), 3),
+            'latency_p95_ms': round(float(np.percentile(latencies, 95)), 3),
+            'rows_per_sec': round(batch_size / np.median(latencies) * 1000)
+        })
+
+    return results
+
+
+def run_size(workspace, n_rows, stages, args):
+    os.chdir(workspace)
+    results = []
+
+    if 'ingestion' in stages:
+        results += bench_ingestion(n_rows)
+    if 'preprocessing' in stages:
+        results += run_isolated(bench_preprocessing, n_rows)
+    if 'training' in stages:
+        results += run_isolated(bench_training, n_rows, args.search_mode)
+    if 'serving' in stages:
+        results += run_isolated(bench_serving, n_rows, args.batch_sizes, args.repeats)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='end-to-end benchmark of ingestion, preprocessing, training and serving on synthetic data')
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k'], choices=list(SIZES))
+    parser.add_argument('--stages', nargs='+', default=STAGES, choices=STAGES)
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--search-mode', default=None, choices=['random', 'halving'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workdir', default=None, help='folder kerja yang dipertahankan, data sintetis dipakai ulang antar run')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    root = os.getcwd()
+    sys.path.insert(0, ROOT_DIR)  # stage dijalankan dari folder kerja lain, modul repo (src, application) tetap harus bisa di-import
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='hotel_benchmark_')
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'results': {}
+    }
+
+    try:
+        for size in args.sizes:
+            n_rows = SIZES[size]
+            print(f'benchmarking {n_rows} rows', file=sys.stderr)
+
+            workspace = prepare_workspace(workdir, n_rows, args.seed)
+            # tiap ukuran dijalankan di proses anak sendiri, puncak memori tidak terbawa dari ukuran sebelumnya
+            report['results'][size] = run_isolated(run_size, workspace, n_rows, args.stages, args)
+
+    finally:
+        os.chdir(root)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+
+    output = args.output or os.path.join('benchmarks', 'results', f'{report["timestamp"].replace(":", "")}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
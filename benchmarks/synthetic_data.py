@@ -0,0 +1,55 @@
+import os
+import numpy as np
+import pandas as pd
+
+MEAL_PLANS = ['Meal Plan 1', 'Not Selected', 'Meal Plan 2', 'Meal Plan 3']
+ROOM_TYPES = [f'Room_Type {i}' for i in range(1, 8)]
+MARKET_SEGMENTS = ['Online', 'Offline', 'Corporate', 'Complementary', 'Aviation']
+
+
+def generate_bookings(n_rows, seed=42, start_id=0):
+    # data sintetis dengan kolom & distribusi yang mirip Hotel_Reservations.csv
+    rng = np.random.default_rng(seed)
+
+    lead_time = np.minimum(rng.exponential(85, n_rows), 443).astype(np.int16)
+    special_requests = np.minimum(rng.poisson(0.6, n_rows), 5).astype(np.int8)
+    price = np.clip(rng.normal(103, 35, n_rows), 0, 540).round(2)
+    segment = rng.choice(len(MARKET_SEGMENTS), n_rows, p=[0.64, 0.29, 0.055, 0.011, 0.004])
+    repeated_guest = (rng.random(n_rows) < 0.026).astype(np.int8)
+
+    # peluang cancel naik bersama lead time & harga, turun dengan special request & tamu berulang
+    logit = -1.6 + 0.009 * lead_time - 0.9 * special_requests + 0.008 * (price - 103) - 2.0 * repeated_guest - 0.8 * (segment == 1)
+    canceled = rng.random(n_rows) < 1 / (1 + np.exp(-logit))
+
+    return pd.DataFrame({
+        'Booking_ID': [f'INN{i:08d}' for i in range(start_id + 1, start_id + n_rows + 1)],
+        'no_of_adults': rng.choice(5, n_rows, p=[0.004, 0.21, 0.72, 0.063, 0.003]).astype(np.int8),
+        'no_of_children': rng.choice(4, n_rows, p=[0.925, 0.045, 0.029, 0.001]).astype(np.int8),
+        'no_of_weekend_nights': np.minimum(rng.poisson(0.8, n_rows), 7).astype(np.int8),
+        'no_of_week_nights': np.minimum(rng.poisson(2.2, n_rows), 17).astype(np.int8),
+        'type_of_meal_plan': np.asarray(MEAL_PLANS)[rng.choice(4, n_rows, p=[0.7668, 0.1414, 0.0916, 0.0002])],
+        'required_car_parking_space': (rng.random(n_rows) < 0.031).astype(np.int8),
+        'room_type_reserved': np.asarray(ROOM_TYPES)[rng.choice(7, n_rows, p=[0.775, 0.019, 0.0002, 0.167, 0.0073, 0.0266, 0.0049])],
+        'lead_time': lead_time,
+        'arrival_year': rng.choice([2017, 2018], n_rows, p=[0.18, 0.82]).astype(np.int16),
+        'arrival_month': rng.integers(1, 13, n_rows).astype(np.int8),
+        'arrival_date': rng.integers(1, 32, n_rows).astype(np.int8),
+        'market_segment_type': np.asarray(MARKET_SEGMENTS)[segment],
+        'repeated_guest': repeated_guest,
+        'no_of_previous_cancellations': (repeated_guest * rng.poisson(0.9, n_rows)).astype(np.int8),
+        'no_of_previous_bookings_not_canceled': (repeated_guest * rng.poisson(6, n_rows)).astype(np.int16),
+        'avg_price_per_room': price,
+        'no_of_special_requests': special_requests,
+        'booking_status': np.where(canceled, 'Canceled', 'Not_Canceled')
+    })
+
+
+def write_synthetic_csv(path, n_rows, seed=42, chunk_size=1000000):
+    # ditulis per chunk sehingga 10 juta baris tidak perlu berada di memori sekaligus
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    for i, start in enumerate(range(0, n_rows, chunk_size)):
+        chunk = generate_bookings(min(chunk_size, n_rows - start), seed=seed + i, start_id=start)
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+
+    return path
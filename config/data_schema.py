@@ -0,0 +1,47 @@
+# tipe data kolom untuk artifact antar tahapan pipeline (raw split & processed)
+# dipakai agar kolom tidak disimpan sebagai int64/float64 hasil inferensi pandas
+
+COLUMN_DTYPES = {
+    'no_of_adults': 'int8',
+    'no_of_children': 'int8',
+    'no_of_weekend_nights': 'int8',
+    'no_of_week_nights': 'int8',
+    'required_car_parking_space': 'int8',
+    'lead_time': 'int16',
+    'arrival_year': 'int16',
+    'arrival_month': 'int8',
+    'arrival_date': 'int8',
+    'repeated_guest': 'int8',
+    'no_of_previous_cancellations': 'int8',
+    'no_of_previous_bookings_not_canceled': 'int16',
+    'avg_price_per_room': 'float32',
+    'no_of_special_requests': 'int8',
+
+    # setelah label encoding kolom kategori berisi code integer kecil
+    'type_of_meal_plan': 'int8',
+    'room_type_reserved': 'int8',
+    'market_segment_type': 'int8',
+    'booking_status': 'int8'
+}
+
+# kolom string yang disimpan sebagai dictionary/category (bukan object)
+CATEGORICAL_COLUMNS = ['type_of_meal_plan', 'room_type_reserved', 'market_segment_type', 'booking_status']
+
+# batas nilai yang masih masuk akal untuk request serving (lebih longgar dari rentang data train)
+# dipakai src/feature_schema.py untuk menolak baris yang salah sebelum masuk ke model
+FEATURE_RANGES = {
+    'no_of_adults': (0, 10),
+    'no_of_children': (0, 10),
+    'no_of_weekend_nights': (0, 30),
+    'no_of_week_nights': (0, 90),
+    'required_car_parking_space': (0, 1),
+    'lead_time': (0, 1000),
+    'arrival_year': (2015, 2100),
+    'arrival_month': (1, 12),
+    'arrival_date': (1, 31),
+    'repeated_guest': (0, 1),
+    'no_of_previous_cancellations': (0, 100),
+    'no_of_previous_bookings_not_canceled': (0, 1000),
+    'avg_price_per_room': (0, 10000),
+    'no_of_special_requests': (0, 10)
+}
@@ -0,0 +1,45 @@
+import os
+import gc
+import multiprocessing
+
+# gunicorn --config config/gunicorn_config.py application:app
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+
+# prediksi bersifat cpu-bound : 1 worker per core, thread tambahan agar micro-batching bisa menggabungkan request
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# metrics (/metrics) disimpan di memori masing-masing worker dan tidak digabung antar worker :
+# 1 scrape hanya berisi counter milik worker yang kebetulan melayani request tersebut. Semua series diberi label worker_pid,
+# sehingga scrape yang jatuh ke worker lain tidak terbaca sebagai counter reset; agregasi dilakukan di prometheus,
+# mis. sum without (worker_pid) (rate(http_requests_total[5m])). Untuk angka yang lengkap tiap worker harus ter-scrape
+# secara rutin (interval scrape jauh lebih pendek dari jendela rate), atau jalankan WEB_CONCURRENCY=1 per container
+# dan scrape setiap container sebagai target terpisah
+
+# model & artifact preprocessing dimuat sekali di master sebelum fork, halaman memorinya dipakai bersama (copy-on-write)
+# catatan : dengan preload, SIGHUP hanya me-restart worker secara graceful, file model tidak dibaca ulang
+preload_app = os.environ.get('PRELOAD_APP', '1') != '0'
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# worker di-restart bergiliran setelah sejumlah request untuk membatasi fragmentasi memori
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # objek yang sudah dimuat di master dikeluarkan dari garbage collector,
+    # sehingga gc di worker tidak menyentuh (dan meng-copy) halaman memori model
+    gc.freeze()
+    server.log.info(f'master ready, {workers} workers x {threads} threads, preload_app={preload_app}')
+
+
+def post_fork(server, worker):
+    server.log.info(f'worker {worker.pid} forked')
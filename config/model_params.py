@@ -16,4 +16,17 @@ RANDOM_SEARCH_PARAMS = {
     'verbose': 2,
     'random_state': 42,
     'scoring': 'accuracy'
-}
\ No newline at end of file
+}
+
+
+SEARCH_MODE = 'random'  # random (RandomizedSearchCV) / halving (successive halving, kandidat lemah dihentikan lebih awal)
+
+HALVING_SEARCH_PARAMS = {
+    'n_candidates': 128,
+    'min_rounds': 20,
+    'eta': 3,
+    'cv': 2,
+    'n_jobs': -1,
+    'random_state': 42,
+    'metric': 'binary_logloss'
+}
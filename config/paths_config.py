@@ -1,14 +1,22 @@
 import os
 
+########################  ARTIFACT FORMAT  ########################
+
+ARTIFACT_FORMAT = os.environ.get('ARTIFACT_FORMAT', 'parquet')  # format file antar tahapan pipeline : parquet / feather / csv
+ARTIFACT_EXTENSIONS = {'parquet': 'parquet', 'feather': 'feather', 'csv': 'csv'}
+ARTIFACT_EXT = ARTIFACT_EXTENSIONS[ARTIFACT_FORMAT]
+
+
 ########################  DATA INGESTION  ########################
 
 RAW_DIR = 'artifacts/raw'  # tentukan lokasi setelah data diextract dari gcp
-RAW_FILE_PATH = os.path.join(RAW_DIR, 'raw.csv')
-TRAIN_FILE_PATH = os.path.join(RAW_DIR, 'train.csv')
-TEST_FILE_PATH = os.path.join(RAW_DIR, 'test.csv')
+RAW_FILE_PATH = os.path.join(RAW_DIR, 'raw.csv')  # file dari gcp tetap berformat csv
+BLOB_CACHE_DIR = 'artifacts/blob_cache'  # cache file dari bucket berdasarkan generation/md5
+TRAIN_FILE_PATH = os.path.join(RAW_DIR, f'train.{ARTIFACT_EXT}')
+TEST_FILE_PATH = os.path.join(RAW_DIR, f'test.{ARTIFACT_EXT}')
 
-TRAIN_NAME_PATH = 'train.csv'
-TEST_NAME_PATH = 'test.csv'
+TRAIN_NAME_PATH = f'train.{ARTIFACT_EXT}'
+TEST_NAME_PATH = f'test.{ARTIFACT_EXT}'
 
 CONFIG_PATH = 'config/config.yaml'
 
@@ -16,10 +24,27 @@ CONFIG_PATH = 'config/config.yaml'
 ########################  DATA PROCESSING  ########################
 
 PROCESSED_DIR = 'artifacts/processed'  # buat folder processed didalam artifacts
-PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR, 'processed_train.csv')  # simpan file processed_train.csv didalam folder processed
-PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR, 'processed_test.csv')  # simpan file processed_test.csv didalam folder processed
+PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR, f'processed_train.{ARTIFACT_EXT}')  # simpan file processed_train didalam folder processed
+PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR, f'processed_test.{ARTIFACT_EXT}')  # simpan file processed_test didalam folder processed
 
 
 ########################  MODEL TRAINING  ########################
 
-MODEL_OUTPUT_PATH = 'artifacts/models/lgbm_model.pkl'
\ No newline at end of file
+MODEL_OUTPUT_PATH = 'artifacts/models/lgbm_model.pkl'
+COMPILED_MODEL_OUTPUT_PATH = 'artifacts/models/lgbm_model_compiled.npz'  # tree LightGBM dalam bentuk array numpy untuk serving
+PREPROCESSOR_OUTPUT_PATH = 'artifacts/models/preprocessor.json'  # label encoding, kolom log1p & urutan fitur hasil preprocessing
+CALIBRATOR_OUTPUT_PATH = 'artifacts/models/calibrator.json'  # tabel kalibrasi probabilitas pembatalan & threshold optimal berdasarkan biaya
+MODEL_REGISTRY_DIR = 'artifacts/models/registry'  # 1 folder per versi model + file LATEST, dibaca ulang oleh server tanpa restart
+TRAINING_STATE_PATH = 'artifacts/models/training_state.json'  # watermark (posisi baris file raw), distribusi referensi & metrik baseline untuk incremental training
+INCREMENTAL_MODEL_DIR = 'artifacts/models/incremental'  # artifact hasil incremental training sebelum dipublish, output stage cache tidak ditimpa
+
+
+########################  SERVING  ########################
+
+SCORING_JOBS_DIR = 'artifacts/scoring_jobs'  # 1 folder per job scoring file (input, status.json, results.jsonl)
+
+
+########################  PIPELINE CACHE  ########################
+
+CACHE_DIR = 'artifacts/cache'  # output tiap stage disimpan berdasarkan hash input, config & kode
+EVALUATION_CACHE_DIR = os.path.join(CACHE_DIR, 'evaluation')  # probabilitas out-of-fold backtest, berdasarkan hash data & parameter model
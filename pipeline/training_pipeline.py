@@ -1,21 +1,88 @@
+import os
+import sys
 from src.data_ingestion import *
 from src.data_preprocessing import *
 from src.model_training import *
+from src.stage_cache import StageCache, local_module_files
+from src.model_registry import publish_if_changed
+from src.incremental_training import IncrementalTrainer
+from src.instrumentation import track_stage
 
 
 if __name__ == '__main__':
+    config = read_yaml(CONFIG_PATH)
+
+    # PIPELINE_CACHE=0 untuk memaksa semua stage dijalankan ulang
+    cache = StageCache(CACHE_DIR, enabled=os.environ.get('PIPELINE_CACHE', '1') != '0')
+
+    data_ingestion = DataIngestion(config)
+    source_fingerprint = data_ingestion.get_source_fingerprint()
+
+    incremental_trainer = IncrementalTrainer(config)
+
+    # 0. Incremental Training (TRAINING_MODE=incremental) : booster lama dilanjutkan dengan baris baru,
+    # full pipeline hanya dijalankan jika drift/quality gate gagal atau belum ada model sebelumnya
+
+    if os.environ.get('TRAINING_MODE', 'incremental' if config.get('incremental_training', {}).get('enabled') else 'full') == 'incremental':
+        with track_stage('incremental_training'):
+            decision = incremental_trainer.run(source_fingerprint)
+
+        if decision != 'full_retrain':
+            sys.exit(0)
+
     # 1. Data Ingestion
 
-    data_ingestion = DataIngestion(read_yaml(CONFIG_PATH))
-    data_ingestion.run()
+    with track_stage('data_ingestion'):
+        cache.run(
+            'data_ingestion',
+            data_ingestion.run,
+            outputs=[RAW_FILE_PATH, TRAIN_FILE_PATH, TEST_FILE_PATH],
+            config=config['data_ingestion'],
+            code_files=local_module_files(['src/data_ingestion.py']),
+            extra=source_fingerprint,
+            cacheable=source_fingerprint is not None
+        )
 
     # 2. Data Preprocessing
 
     preprocessing = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
-    preprocessing.process()
+
+    with track_stage('data_processing'):
+        cache.run(
+            'data_processing',
+            preprocessing.process,
+            outputs=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, PREPROCESSOR_OUTPUT_PATH],
+            input_files=[TRAIN_FILE_PATH, TEST_FILE_PATH],
+            config=config['data_processing'],
+            code_files=local_module_files(['src/data_preprocessing.py'])
+        )
 
     # 3. Model Training
     model_training = ModelTraining(PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH)
-    model_training.run()
 
-    # set GOOGLE_APPLICATION_CREDENTIALS=C:\Users\zacky ferdiansyah\Downloads\melodic-park-442312-k0-ae3c5c0fbe79.json
\ No newline at end of file
+    with track_stage('model_training'):
+        restored_from_cache = cache.run(
+            'model_training',
+            model_training.run,
+            outputs=[MODEL_OUTPUT_PATH, COMPILED_MODEL_OUTPUT_PATH] + ([CALIBRATOR_OUTPUT_PATH] if config.get('calibration', {}).get('enabled') else []),
+            input_files=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, TRAIN_FILE_PATH, PREPROCESSOR_OUTPUT_PATH],
+            config={'balancing': config['data_processing'].get('balancing'), 'evaluation': config.get('evaluation'), 'calibration': config.get('calibration')},
+            # backtest mengulang langkah preprocessing pada data train mentah
+            code_files=local_module_files(['src/model_training.py', 'src/data_preprocessing.py'])
+        )
+
+        # saat stage di-restore dari cache model_training.run tidak dijalankan, artifact hasil restore dipublish
+        # jika berbeda dengan LATEST (mis. LATEST masih menunjuk model hasil incremental training)
+        publish_if_changed(
+            MODEL_REGISTRY_DIR,
+            [path for path in (MODEL_OUTPUT_PATH, COMPILED_MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH, CALIBRATOR_OUTPUT_PATH) if os.path.exists(path)],
+            metadata={'training_mode': 'full', 'restored_from_cache': restored_from_cache},
+            keep_versions=model_training.keep_versions
+        )
+
+    # 4. Training State : watermark & baseline untuk incremental training berikutnya
+
+    with track_stage('training_state'):
+        incremental_trainer.save_state(source_fingerprint)
+
+    # set GOOGLE_APPLICATION_CREDENTIALS=C:\Users\zacky ferdiansyah\Downloads\melodic-park-442312-k0-ae3c5c0fbe79.json
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.neighbors import NearestNeighbors
+
+
+def _neighbour_indices(X_class, query_index, k_neighbors, n_jobs, chunk_size):
+    nn = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=1).fit(X_class)
+    neighbours = np.empty((len(query_index), k_neighbors), dtype=np.int64)
+
+    def query(start):
+        end = min(start + chunk_size, len(query_index))
+        # kolom pertama adalah titik itu sendiri
+        neighbours[start:end] = nn.kneighbors(X_class[query_index[start:end]], return_distance=False)[:, 1:]
+
+    # pencarian tetangga per chunk dijalankan paralel (query KD-tree melepas GIL)
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        list(executor.map(query, range(0, len(query_index), chunk_size)))
+
+    return neighbours
+
+
+def smote_oversample(X, y, k_neighbors=5, integer_columns=None, random_state=42, n_jobs=-1, chunk_size=10000):
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    rng = np.random.default_rng(random_state)
+
+    classes, counts = np.unique(y, return_counts=True)
+    n_target = counts.max()
+
+    # sampel sintetis dibuat di antara 2 sampel 1 kelas, kelas minoritas dengan 1 sampel tidak punya tetangga
+    too_small = [label for label, count in zip(classes.tolist(), counts.tolist()) if count < 2 and count < n_target]
+    if too_small:
+        raise ValueError(f'smote needs at least 2 samples per minority class, classes {too_small} have only 1')
+    n_synthetic = int((n_target - counts).sum())
+
+    # buffer output dialokasikan sekali : baris asli di depan, baris sintetis ditulis langsung ke belakangnya
+    X_out = np.empty((len(X) + n_synthetic, X.shape[1]), dtype=np.float32)
+    y_out = np.empty(len(X) + n_synthetic, dtype=y.dtype)
+    X_out[:len(X)] = X
+    y_out[:len(y)] = y
+
+    position = len(X)
+    for label, count in zip(classes, counts):
+        n_new = int(n_target - count)
+        if n_new == 0:
+            continue
+
+        X_class = X[y == label]
+        k = min(k_neighbors, count - 1)
+
+        base = rng.integers(0, count, n_new)
+        unique_base, inverse = np.unique(base, return_inverse=True)
+
+        # tetangga hanya dicari untuk sampel yang benar-benar dipakai sebagai basis
+        neighbours = _neighbour_indices(X_class, unique_base, k, n_jobs, chunk_size)
+        partner = neighbours[inverse, rng.integers(0, k, n_new)]
+        gap = rng.random(n_new, dtype=np.float32)
+
+        for start in range(0, n_new, chunk_size):
+            end = min(start + chunk_size, n_new)
+            out = X_out[position + start:position + end]
+
+            np.subtract(X_class[partner[start:end]], X_class[base[start:end]], out=out)
+            out *= gap[start:end, None]
+            out += X_class[base[start:end]]
+
+            # kolom integer (count & code kategori) dibulatkan agar tetap bernilai valid
+            if integer_columns is not None:
+                out[:, integer_columns] = np.rint(out[:, integer_columns])
+
+        y_out[position:position + n_new] = label
+        position += n_new
+
+    return X_out, y_out
@@ -0,0 +1,157 @@
+import json
+import numpy as np
+from src.micro_batcher import MicroBatcher
+from src.feature_schema import FeatureSchema
+
+
+class BatchPredictor:
+
+    def __init__(self, model, feature_columns=None, transformer=None, calibrator=None):
+        self.model = model
+        self.transformer = transformer
+        self.calibrator = calibrator    # ProbabilityCalibrator : probabilitas pembatalan terkalibrasi & threshold hasil tuning biaya
+
+        # urutan fitur harus sama persis dengan urutan saat model ditraining
+        if feature_columns is None and transformer is not None and transformer.selected_features:
+            feature_columns = transformer.selected_features
+        if feature_columns is None:
+            feature_columns = getattr(model, 'feature_name_', None)
+        if feature_columns is None:
+            raise ValueError('feature columns are required when the model does not expose feature names')
+
+        self.feature_columns = list(feature_columns)
+        self.schema = FeatureSchema.from_transformer(self.feature_columns, transformer)
+        self.micro_batcher = None
+        self.cache = None
+        self.cache_version = None
+
+    def enable_micro_batching(self, max_batch_size=64, max_latency_ms=2.0):
+        self.micro_batcher = MicroBatcher(self.predict_matrix, max_batch_size, max_latency_ms)
+
+    def enable_cache(self, cache, model_version):
+        # versi model ikut menjadi key, hasil dari versi lain tidak pernah terbaca
+        self.cache = cache
+        self.cache_version = model_version
+
+    def close(self):
+        if self.micro_batcher is not None:
+            self.micro_batcher.close()
+
+    @staticmethod
+    def parse_payload(body, content_type=None):
+        # body bisa berupa JSON array ([{...}, {...}]) atau JSON-lines (1 record per baris)
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+
+        text = body.strip()
+        if not text:
+            raise ValueError('request body is empty')
+
+        is_json_lines = content_type is not None and ('ndjson' in content_type or 'jsonl' in content_type)
+
+        if not is_json_lines and text[0] == '[':
+            records = json.loads(text)
+        elif not is_json_lines and text[0] == '{' and '\n' not in text:
+            records = [json.loads(text)]
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError('every record must be a JSON object')
+
+        return records
+
+    def predict_matrix(self, X):
+        # cukup 1x predict_proba untuk seluruh batch
+        proba = self.model.predict_proba(X)
+
+        # dengan calibrator, label ditentukan oleh cutoff skor mentah yang sudah dihitung saat training (bukan argmax / 0.5)
+        if self.calibrator is not None:
+            return proba[:, 1], self.calibrator.decide(proba[:, 1])
+
+        labels = self.model.classes_[np.argmax(proba, axis=1)]
+        return proba[:, 1], labels
+
+    def _predict(self, X):
+        # request kecil digabung dengan request lain yang datang bersamaan, batch besar langsung ke model
+        if self.micro_batcher is not None and len(X) < self.micro_batcher.max_batch_size:
+            return self.micro_batcher.predict(X)
+
+        return self.predict_matrix(X)
+
+    def _predict_cached(self, X):
+        keys = self.cache.row_keys(X, self.cache_version)
+        cached = self.cache.get_many(keys)
+
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if not missing:
+            probabilities, labels = zip(*cached)
+            return np.asarray(probabilities), np.asarray(labels)
+
+        # hanya baris yang belum ada di cache yang dikirim ke model (tetap dalam 1 batch)
+        new_probabilities, new_labels = self._predict(X[missing])
+        self.cache.put_many([keys[i] for i in missing], list(zip(new_probabilities.tolist(), new_labels.tolist())))
+
+        if len(missing) == len(X):
+            return new_probabilities, new_labels
+
+        probabilities = np.empty(len(X), dtype=np.float64)
+        labels = np.empty(len(X), dtype=new_labels.dtype)
+        probabilities[missing] = new_probabilities
+        labels[missing] = new_labels
+
+        for i, value in enumerate(cached):
+            if value is not None:
+                probabilities[i], labels[i] = value
+
+        return probabilities, labels
+
+    def predict_valid_rows(self, records):
+        # baris yang gagal validasi tidak ikut ke model, baris lain dalam batch yang sama tetap diprediksi
+        X, valid_rows, errors = self.schema.validate(records)
+
+        if len(valid_rows) == 0:
+            return valid_rows, np.empty(0), np.empty(0, dtype=np.int64), errors
+
+        if self.cache is not None:
+            probabilities, labels = self._predict_cached(X)
+        else:
+            probabilities, labels = self._predict(X)
+
+        return valid_rows, probabilities, labels, errors
+
+    def predict_records(self, records):
+        valid_rows, probabilities, labels, errors = self.predict_valid_rows(records)
+
+        if self.calibrator is None:
+            outputs = {'probabilities': probabilities.tolist(), 'predictions': labels.tolist()}
+        else:
+            # dengan calibrator, output predict_proba hanya skor mentah (belum dikalibrasi, tidak dipakai untuk label) :
+            # label = Canceled jika cancellation_probability >= decision_threshold
+            outputs = {
+                'raw_scores': probabilities.tolist(),
+                'cancellation_probabilities': self.calibrator.transform(probabilities).tolist(),
+                'predictions': labels.tolist()
+            }
+        if self.transformer is not None:
+            outputs['prediction_labels'] = self.transformer.decode_target(labels).tolist()
+
+        # output tetap sejajar dengan urutan input, baris yang tidak valid diisi null
+        if errors:
+            for key, values in outputs.items():
+                aligned = [None] * len(records)
+                for row, value in zip(valid_rows.tolist(), values):
+                    aligned[row] = value
+                outputs[key] = aligned
+
+        result = {
+            'count': len(records),
+            'valid_count': len(valid_rows),
+            'features': self.feature_columns,
+            **outputs,
+            'errors': errors
+        }
+        if self.calibrator is not None:
+            result['decision_threshold'] = self.calibrator.threshold
+
+        return result
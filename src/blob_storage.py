@@ -0,0 +1,187 @@
+import os
+import sys
+import json
+import base64
+import shutil
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+BlobInfo = namedtuple('BlobInfo', ['name', 'size', 'md5', 'generation'])
+
+_gcs_client = None
+
+
+def md5_base64(path, chunk_size=1024 * 1024):
+    # format md5 sama dengan metadata md5_hash di GCS (base64 dari digest)
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode('ascii')
+
+
+class GCSBackend:
+
+    def __init__(self, bucket_name):
+        self.bucket_name = bucket_name
+
+    def _bucket(self):
+        global _gcs_client
+
+        # 1 client dipakai ulang untuk semua request (koneksi http ikut dipakai ulang)
+        if _gcs_client is None:
+            from google.cloud import storage
+            _gcs_client = storage.Client()
+
+        return _gcs_client.bucket(self.bucket_name)
+
+    def stat(self, name):
+        blob = self._bucket().get_blob(name)
+        if blob is None:
+            raise FileNotFoundError(f'gs://{self.bucket_name}/{name} does not exist')
+
+        return BlobInfo(name, blob.size, blob.md5_hash, str(blob.generation))
+
+    def read_range(self, name, start, end, generation=None):
+        blob = self._bucket().blob(name, generation=int(generation) if generation else None)
+        return blob.download_as_bytes(start=start, end=end - 1)  # end di GCS bersifat inclusive
+
+
+class LocalBackend:
+
+    # pengganti GCS berbasis folder lokal, untuk test / development tanpa koneksi ke cloud
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def _path(self, name):
+        return os.path.join(self.root_dir, name)
+
+    def stat(self, name):
+        path = self._path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'{path} does not exist')
+
+        return BlobInfo(name, os.path.getsize(path), md5_base64(path), str(os.stat(path).st_mtime_ns))
+
+    def read_range(self, name, start, end, generation=None):
+        with open(self._path(name), 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+
+def make_storage_backend(config):
+    backend = config.get('storage_backend', 'gcs')
+
+    if backend == 'gcs':
+        return GCSBackend(config['bucket_name'])
+    if backend == 'local':
+        return LocalBackend(config['local_storage_dir'])
+
+    raise ValueError(f'unknown storage backend {backend}')
+
+
+class BlobDownloader:
+
+    def __init__(self, backend, cache_dir, chunk_size=8 * 1024 * 1024, max_workers=8):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def cache_path(self, info):
+        # key cache = nama blob + generation/md5, blob yang tidak berubah tidak pernah didownload ulang
+        version = info.generation or (info.md5 or '').replace('/', '_')
+        return os.path.join(self.cache_dir, info.name.replace('/', '_'), version, 'blob')
+
+    def _load_progress(self, progress_path, info):
+        if not os.path.exists(progress_path):
+            return set()
+
+        with open(progress_path, 'r') as f:
+            progress = json.load(f)
+
+        if progress.get('size') != info.size or progress.get('chunk_size') != self.chunk_size:
+            return set()
+
+        return set(progress['done'])
+
+    def _save_progress(self, progress_path, info, done):
+        tmp_path = f'{progress_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'size': info.size, 'chunk_size': self.chunk_size, 'done': sorted(done)}, f)
+        os.replace(tmp_path, progress_path)
+
+    def _fetch(self, info, cache_path):
+        part_path = f'{cache_path}.part'
+        progress_path = f'{cache_path}.progress'
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+        done = self._load_progress(progress_path, info) if os.path.exists(part_path) else set()
+
+        n_chunks = max(1, -(-info.size // self.chunk_size))
+        pending = [i for i in range(n_chunks) if i not in done]
+
+        if done:
+            logger.info(f'resuming download of {info.name}, {len(done)}/{n_chunks} chunks already present')
+
+        # file .part dialokasikan sesuai ukuran blob, tiap chunk ditulis langsung ke offset-nya
+        with open(part_path, 'ab') as f:
+            f.truncate(info.size)
+
+        lock = threading.Lock()
+        fd = os.open(part_path, os.O_WRONLY)
+
+        def download_chunk(index):
+            start = index * self.chunk_size
+            end = min(start + self.chunk_size, info.size)
+            data = self.backend.read_range(info.name, start, end, info.generation)
+
+            if len(data) != end - start:
+                raise IOError(f'short read for chunk {index} of {info.name}')
+
+            os.pwrite(fd, data, start)
+
+            with lock:
+                done.add(index)
+                self._save_progress(progress_path, info, done)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(download_chunk, pending))
+        finally:
+            os.close(fd)
+
+        if info.md5 and md5_base64(part_path) != info.md5:
+            os.remove(part_path)
+            os.remove(progress_path)
+            raise IOError(f'md5 mismatch for {info.name}, cached download discarded')
+
+        os.replace(part_path, cache_path)
+        if os.path.exists(progress_path):
+            os.remove(progress_path)
+
+    def download(self, name, destination):
+        try:
+            info = self.backend.stat(name)
+            cache_path = self.cache_path(info)
+
+            if os.path.exists(cache_path):
+                logger.info(f'{name} (generation {info.generation}) found in local blob cache')
+            else:
+                logger.info(f'downloading {name} ({info.size} bytes) with {self.max_workers} workers')
+                self._fetch(info, cache_path)
+
+            os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+            shutil.copyfile(cache_path, destination)
+
+            return info
+
+        except Exception as e:
+            logger.error(f'error while downloading blob {name} {e}')
+            raise CustomException(f'failed to download blob {name}', sys)
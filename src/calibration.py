@@ -0,0 +1,131 @@
+import os
+import json
+import numpy as np
+
+CALIBRATION_METHODS = ['isotonic', 'platt']
+
+
+def fit_isotonic(scores, y):
+    from sklearn.isotonic import IsotonicRegression
+
+    isotonic = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(scores, y)
+    return isotonic.X_thresholds_, isotonic.y_thresholds_
+
+
+def fit_platt(scores, y, n_knots=256, eps=1e-6):
+    # regresi logistik pada logit skor, lalu ditabulasi di grid quantile skor agar serving cukup memakai np.interp
+    from sklearn.linear_model import LogisticRegression
+
+    clipped = np.clip(scores, eps, 1 - eps)
+    logits = np.log(clipped / (1 - clipped)).reshape(-1, 1)
+    platt = LogisticRegression(C=1e6).fit(logits, y)
+
+    knots = np.unique(np.r_[0.0, np.quantile(scores, np.linspace(0, 1, n_knots)), 1.0])
+    knot_logits = np.log(np.clip(knots, eps, 1 - eps) / (1 - np.clip(knots, eps, 1 - eps))).reshape(-1, 1)
+    return knots, platt.predict_proba(knot_logits)[:, 1]
+
+
+def optimal_threshold(y, proba, cost_false_positive, cost_false_negative):
+    # semua kandidat threshold dievaluasi dari 1x sort : baris dengan proba >= threshold diprediksi positif
+    order = np.argsort(-proba, kind='mergesort')
+    sorted_proba = proba[order]
+    tps = np.cumsum(y[order])
+    fps = np.arange(1, len(y) + 1) - tps
+
+    # hanya di akhir grup probabilitas yang sama, ditambah opsi "tidak ada yang positif"
+    last = np.r_[np.flatnonzero(np.diff(sorted_proba)), len(y) - 1]
+    thresholds = np.r_[sorted_proba[last], np.inf]
+    false_positives = np.r_[fps[last], 0]
+    false_negatives = np.r_[y.sum() - tps[last], y.sum()]
+
+    costs = cost_false_positive * false_positives + cost_false_negative * false_negatives
+    best = int(np.argmin(costs))
+    return float(thresholds[best]), float(costs[best] / len(y))
+
+
+class ProbabilityCalibrator:
+
+    # tabel lookup (skor mentah -> probabilitas terkalibrasi) & cutoff skor mentah hasil threshold yang optimal,
+    # serving hanya memakai numpy : 1x np.interp & 1x perbandingan per batch
+    def __init__(self, knots, calibrated, threshold, positive_label=0, negative_label=1, method='platt', metrics=None):
+        self.knots = np.asarray(knots, dtype=np.float64)
+        self.calibrated = np.asarray(calibrated, dtype=np.float64)
+        self.threshold = float(threshold)
+        self.positive_label = positive_label    # kelas yang probabilitasnya dikalibrasi (Canceled = 0)
+        self.negative_label = negative_label
+        self.method = method
+        self.metrics = metrics or {}
+
+        self.score_cutoff = self._score_cutoff()
+
+    def _score_cutoff(self):
+        # kurva kalibrasi monoton naik, jadi "calibrated >= threshold" sama dengan "skor mentah >= cutoff"
+        above = np.flatnonzero(self.calibrated >= self.threshold)
+        if len(above) == 0:
+            return np.inf
+        i = above[0]
+        if i == 0:
+            return -np.inf
+
+        x0, x1 = self.knots[i - 1], self.knots[i]
+        y0, y1 = self.calibrated[i - 1], self.calibrated[i]
+        return float(x0 + (self.threshold - y0) * (x1 - x0) / (y1 - y0))
+
+    def scores(self, probabilities):
+        # probabilities : P(kelas 1) dari predict_proba, diubah menjadi skor kelas positif
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        return probabilities if self.positive_label == 1 else 1.0 - probabilities
+
+    def transform(self, probabilities):
+        return np.interp(self.scores(probabilities), self.knots, self.calibrated)
+
+    def decide(self, probabilities):
+        return np.where(self.scores(probabilities) >= self.score_cutoff, self.positive_label, self.negative_label)
+
+    @classmethod
+    def fit(cls, probabilities, y, method='platt', positive_label=0, negative_label=1, cost_false_positive=3.0, cost_false_negative=1.0):
+        if method not in CALIBRATION_METHODS:
+            raise ValueError(f'unknown calibration method {method}, choose one of {CALIBRATION_METHODS}')
+
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        scores = probabilities if positive_label == 1 else 1.0 - probabilities
+        y_positive = (np.asarray(y) == positive_label).astype(np.int64)
+
+        knots, calibrated = fit_isotonic(scores, y_positive) if method == 'isotonic' else fit_platt(scores, y_positive)
+        calibrated = np.maximum.accumulate(calibrated)  # pastikan monoton untuk cutoff skor mentah
+
+        threshold, _ = optimal_threshold(y_positive, np.interp(scores, knots, calibrated), cost_false_positive, cost_false_negative)
+
+        return cls(knots, calibrated, threshold, positive_label, negative_label, method)
+
+    def to_dict(self):
+        return {
+            'method': self.method,
+            'positive_label': self.positive_label,
+            'negative_label': self.negative_label,
+            'threshold': self.threshold,
+            'knots': self.knots.tolist(),
+            'calibrated': self.calibrated.tolist(),
+            'metrics': self.metrics
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            state = json.load(f)
+
+        return cls(
+            state['knots'],
+            state['calibrated'],
+            state['threshold'],
+            state['positive_label'],
+            state['negative_label'],
+            state['method'],
+            state.get('metrics')
+        )
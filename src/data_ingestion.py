@@ -1,11 +1,12 @@
 import os
 import pandas as pd
-from google.cloud import storage
 from sklearn.model_selection import train_test_split
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.blob_storage import BlobDownloader, make_storage_backend
+from src.instrumentation import track_stage
 from config.paths_config import *
-from utils.common_functions import read_yaml
+from utils.common_functions import read_yaml, load_data, write_data, ArtifactWriter
 
 logger = get_logger(__name__)
 
@@ -16,18 +17,35 @@ class DataIngestion:
         self.bucket_name = self.config['bucket_name']       # diambil dari config/config.yaml
         self.file_name = self.config['bucket_file_name']    # diambil dari config/config.yaml
         self.train_test_ratio = self.config['train_ratio']  # diambil dari config/config.yaml
+        self.split_mode = self.config.get('split_mode', 'random')
+        self.chunk_size = self.config.get('chunk_size', 100000)
+
+        self.storage_backend = make_storage_backend(self.config)
+        self.downloader = BlobDownloader(
+            self.storage_backend,
+            BLOB_CACHE_DIR,
+            chunk_size=self.config.get('download_chunk_mb', 8) * 1024 * 1024,
+            max_workers=self.config.get('download_workers', 8)
+        )
 
         os.makedirs(RAW_DIR, exist_ok=True)  # diambil dari path_config.py dibagian data ingestion
 
         logger.info(f'data ingestion started with {self.bucket_name} and file is {self.file_name}')
     
-    def download_csv_from_gcp(self):
+    def get_source_fingerprint(self):
+        # metadata blob (generation & md5) cukup untuk tahu apakah file di bucket berubah tanpa mendownloadnya
         try:
-            client = storage.Client()
-            bucket = client.bucket(self.bucket_name)
-            blob = bucket.blob(self.file_name)
+            info = self.storage_backend.stat(self.file_name)
+            return {'bucket': self.bucket_name, 'name': info.name, 'generation': info.generation, 'md5': info.md5}
+
+        except Exception as e:
+            logger.warning(f'unable to read blob metadata {e}')
+            return None
 
-            blob.download_to_filename(RAW_FILE_PATH)
+    def download_csv_from_gcp(self):
+        try:
+            # download paralel per range byte, bisa dilanjutkan jika terputus, dan di-cache per generation/md5
+            self.downloader.download(self.file_name, RAW_FILE_PATH)
 
             logger.info(f'csv file is succesfully download to {RAW_FILE_PATH}')
 
@@ -38,11 +56,11 @@ class DataIngestion:
     def split_data(self):
         try:
             logger.info('starting the splitting process')
-            data = pd.read_csv(RAW_FILE_PATH)  # membaca dari config/paths_config.py, karena setelah diextrack dari gcp akan masuk ke raw.csv
+            data = load_data(RAW_FILE_PATH)  # membaca dari config/paths_config.py, karena setelah diextrack dari gcp akan masuk ke raw.csv
             train_data, test_data = train_test_split(data, test_size=1-self.train_test_ratio, random_state=42)
             
-            train_data.to_csv(TRAIN_FILE_PATH)  # setelah displit data masih berbentuk dataframe, akan diubah ke format csv, dan letakkan di TRAIN_FILE_PATH / path yang sudah dibuat sebelumnya di paths_config.py
-            test_data.to_csv(TEST_FILE_PATH)    # setelah displit data masih berbentuk dataframe, akan diubah ke format csv, dan letakkan di TRAIN_FILE_PATH / path yang sudah dibuat sebelumnya di paths_config.py
+            write_data(train_data, TRAIN_FILE_PATH)  # setelah displit data masih berbentuk dataframe, akan disimpan (parquet/feather/csv) di TRAIN_FILE_PATH / path yang sudah dibuat sebelumnya di paths_config.py
+            write_data(test_data, TEST_FILE_PATH)    # setelah displit data masih berbentuk dataframe, akan disimpan (parquet/feather/csv) di TEST_FILE_PATH / path yang sudah dibuat sebelumnya di paths_config.py
 
             logger.info(f'train data saved to {TRAIN_FILE_PATH}')
             logger.info(f'test data saved to {TEST_FILE_PATH}')
@@ -51,13 +69,42 @@ class DataIngestion:
             logger.error('error while splitting data')
             raise CustomException('failed to split data into training ang testing data', e)
     
+    def assign_train_rows(self, booking_ids, n_buckets=10000):
+        # hash Booking_ID -> bucket, sehingga baris yang sama selalu masuk ke partisi yang sama tanpa shuffle
+        hashed = pd.util.hash_pandas_object(booking_ids, index=False).to_numpy()
+        return (hashed % n_buckets) < int(round(self.train_test_ratio * n_buckets))
+
+    def split_data_streaming(self):
+        try:
+            logger.info(f'starting the streaming splitting process with chunk size {self.chunk_size}')
+
+            with ArtifactWriter(TRAIN_FILE_PATH) as train_writer, ArtifactWriter(TEST_FILE_PATH) as test_writer:
+                for chunk in pd.read_csv(RAW_FILE_PATH, chunksize=self.chunk_size):
+                    is_train = self.assign_train_rows(chunk['Booking_ID'])
+
+                    train_writer.write(chunk[is_train])
+                    test_writer.write(chunk[~is_train])
+
+            logger.info(f'train data saved to {TRAIN_FILE_PATH} ({train_writer.rows} rows)')
+            logger.info(f'test data saved to {TEST_FILE_PATH} ({test_writer.rows} rows)')
+
+        except Exception as e:
+            logger.error(f'error while streaming split data {e}')
+            raise CustomException('failed to split data into training ang testing data', e)
+    
     def run(self):
 
         try:
             logger.info('starting data ingestion process')
 
-            self.download_csv_from_gcp()
-            self.split_data()
+            with track_stage('data_ingestion.download'):
+                self.download_csv_from_gcp()
+
+            with track_stage(f'data_ingestion.split_{self.split_mode}'):
+                if self.split_mode == 'streaming':
+                    self.split_data_streaming()  # memori tetap kecil walaupun file lebih besar dari RAM
+                else:
+                    self.split_data()
             
             logger.info('data ingestion completed succesfully')
         
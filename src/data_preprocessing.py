@@ -1,13 +1,16 @@
 import os
+import time
 import pandas as pd
 import numpy as np
 import sys
 from src.logger import get_logger
 from src.custom_exception import CustomException
 from config.paths_config import *
-from utils.common_functions import load_data, read_yaml
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
+from utils.common_functions import load_data, read_yaml, write_data
+from src.feature_transformer import FeatureTransformer
+from src.feature_selection import rank_features
+from src.balancing import smote_oversample
+from src.instrumentation import track_stage
 from imblearn.over_sampling import SMOTE
 
 logger = get_logger(__name__)
@@ -21,45 +24,42 @@ class DataProcessor:
 
         self.config = read_yaml(config_path)
 
+        # encoder & transformasi skew di-fit sekali di data train, lalu dipakai ulang untuk data test dan serving
+        self.transformer = FeatureTransformer(
+            self.config['data_processing']['categorical_columns'],
+            self.config['data_processing']['numerical_columns'],
+            self.config['data_processing']['skewness_threshold']
+        )
+
         if not os.path.exists(self.processed_dir):
             os.makedirs(self.processed_dir)
 
         # os.makedirs(self.processed_dir, exist_ok=True) --> bisa juga hanya pakai 1 baris ini
 
-    def preprocessed_data(self, df, file_name_path):
+    def preprocessed_data(self, df, file_name_path, fit=False):
         try:
-            logger.info(f'starting data processing step to {file_name_path}')
+            logger.info('starting data processing step to %s', file_name_path)
 
             logger.info('dropping the columns')
 
-            df.drop(columns=['Unnamed: 0', 'Booking_ID'], inplace=True)
-            df.drop_duplicates(inplace=True)
-
-            cat_cols = self.config['data_processing']['categorical_columns']
-            num_cols = self.config['data_processing']['numerical_columns']
+            # drop kolom id & baris duplikat dilakukan dalam 1x seleksi (hanya 1 copy dataframe)
+            feature_columns = [col for col in df.columns if col not in ('Unnamed: 0', 'Booking_ID')]  # 'Unnamed: 0' hanya ada di artifact csv lama
+            keep_rows = ~df.duplicated(subset=feature_columns).to_numpy()
+            df = df.loc[keep_rows, feature_columns]
 
             logger.info('applying label encoding')
 
-            label_encoder = LabelEncoder()
-            mappings = {}  # membuat penampungan yang bertipe dictionary yg berisi (key:value)
-
-            for col in cat_cols:
-                df[col] = label_encoder.fit_transform(df[col])
-
-                # melakukan label encoding & langsung mengubahnya didalam dataframe itu sendiri
-                mappings[col] = {label:code for label, code in zip(label_encoder.classes_, label_encoder.transform(label_encoder.classes_))}
+            if fit:
+                logger.info('fitting label encoding and skewness handling on training data')
+                df = self.transformer.fit_transform(df)
+            else:
+                df = self.transformer.transform(df)
 
             logger.info('label mapping are : ')
-            for col, mapping in mappings.items():
-                logger.info(f'{col} : {mapping}')
+            for col, mapping in self.transformer.mappings().items():
+                logger.info('%s : %s', col, mapping)  # args %-style : dict mapping baru diformat di thread logging
             
-            logger.info('doing skewness handling')
-
-            skew_threshold = self.config['data_processing']['skewness_threshold']
-            skewness = df[num_cols].apply(lambda x:x.skew())  # ini akan menghasilkan dataframe [nama fitur, value skew]
-
-            for column in skewness[skewness > skew_threshold].index:  # ambil fitur yang memiliki value skew > 5
-                df[column] = np.log1p(df[column])  # kemudian ubah menggunakan logaritma (agar range nya tdk jauh berbeda)
+            logger.info('doing skewness handling on %s', self.transformer.log_columns)
 
             return df
         
@@ -72,13 +72,39 @@ class DataProcessor:
         try:
             logger.info('handling imbalance data')
 
+            # metode balancing dari config/config.yaml : smote / imblearn_smote / class_weight
+            balancing_config = self.config['data_processing'].get('balancing', {})
+            method = balancing_config.get('method', 'smote')
+
+            if method == 'class_weight':
+                # tanpa oversampling, data tidak di-copy; ketidakseimbangan ditangani lewat class_weight saat training
+                logger.info('skipping oversampling, class weighting will be applied during training')
+                return df
+
             X = df.drop(columns=['booking_status'])
             y = df['booking_status']
 
-            smote = SMOTE(random_state=42)
-            X_resample, y_resample = smote.fit_resample(X, y)
+            if method == 'imblearn_smote':
+                smote = SMOTE(random_state=42)
+                X_resample, y_resample = smote.fit_resample(X, y)
+
+                balance_df = pd.DataFrame(X_resample, columns=X.columns)
+            else:
+                integer_columns = [i for i, col in enumerate(X.columns) if pd.api.types.is_integer_dtype(X[col])]
+
+                X_resample, y_resample = smote_oversample(
+                    X.to_numpy(dtype=np.float32),
+                    y.to_numpy(),
+                    k_neighbors=balancing_config.get('k_neighbors', 5),
+                    integer_columns=integer_columns,
+                    n_jobs=balancing_config.get('n_jobs', -1),
+                    chunk_size=balancing_config.get('chunk_size', 10000)
+                )
+
+                # matrix float32 dibungkus langsung jadi dataframe, kolom integer dikembalikan ke dtype asalnya
+                balance_df = pd.DataFrame(X_resample, columns=X.columns, copy=False)
+                balance_df = balance_df.astype({X.columns[i]: X.dtypes.iloc[i] for i in integer_columns})
 
-            balance_df = pd.DataFrame(X_resample, columns=X.columns)
             balance_df['booking_status'] = y_resample
 
             logger.info('data balance succesfully')
@@ -97,28 +123,29 @@ class DataProcessor:
             X = df.drop(columns=['booking_status'])
             y = df['booking_status']
 
-            model = RandomForestClassifier(random_state=42)
-            model.fit(X, y)
+            # metode ranking dipilih dari config/config.yaml (random_forest / subsample_rf / hist_gbdt / mutual_info / permutation)
+            selection_config = self.config['data_processing'].get('feature_selection', {})
+            method = selection_config.get('method', 'random_forest')
 
-            result_features_importance = model.feature_importances_
+            start = time.perf_counter()
+            feature_importance = rank_features(
+                X, y,
+                method=method,
+                sample_size=selection_config.get('sample_size', 20000),
+                n_jobs=selection_config.get('n_jobs', -1)
+            )
 
-            feature_importance_df = pd.DataFrame({
-                'Feature': X.columns,
-                'Importance': result_features_importance
-                })
-            
-            # urutkan berdasarkan value importance terbesar ke terkecil
-            top_feature_importance_df = feature_importance_df.sort_values(by=['Importance'], ascending=False)
+            logger.info('feature importance computed with %s in %.2f seconds', method, time.perf_counter() - start)
 
             # ambil 10 teratas dari features importance
             num_features_to_select = self.config['data_processing']['no_of_features']  # ambil dari config/config.yaml yg berisi 10 fitur yg nantinya akan diambil
 
-            # ambil 10 fitur teratas yg sudah diurutkan
-            top_10_features = top_feature_importance_df['Feature'].head(num_features_to_select).values
+            # ambil 10 fitur teratas yg sudah diurutkan (dari importance terbesar ke terkecil)
+            top_10_features = feature_importance.index[:num_features_to_select].tolist()
 
-            logger.info(f'features selected {top_10_features}')
+            logger.info('features selected %s', top_10_features)
 
-            top_10_df = df[top_10_features.tolist() + ['booking_status']]
+            top_10_df = df[top_10_features + ['booking_status']]
 
             logger.info('features selection completed succesfully')
 
@@ -133,7 +160,7 @@ class DataProcessor:
         try:
             logger.info('saving our data in processed folder')
 
-            df.to_csv(file_path, index=False)
+            write_data(df, file_path)
 
             logger.info(f'data saved succesfully to {file_path}')
 
@@ -142,25 +169,46 @@ class DataProcessor:
             raise CustomException('error while saving data', sys)
         
 
+    def save_transformer(self, df):
+        try:
+            self.transformer.selected_features = [col for col in df.columns if col != 'booking_status']
+
+            self.transformer.save(PREPROCESSOR_OUTPUT_PATH)  # disimpan di samping lgbm_model.pkl agar dipakai ulang saat serving
+
+            logger.info(f'preprocessing artifact saved to {PREPROCESSOR_OUTPUT_PATH}')
+
+        except Exception as e:
+            logger.error(f'error during save preprocessing artifact step {e}')
+            raise CustomException('error while saving preprocessing artifact', sys)
+        
+
     def process(self):  # method yang menggabungkan semua tahapan preprocess data
         try:
             logger.info('loading data from raw directory')
 
             # load data train dan test
-            train_df = load_data(self.train_path, TRAIN_FILE_PATH)   # ambil file yg berada di jalur artifacts/raw/train.csv
-            test_df = load_data(self.test_path, TEST_FILE_PATH)     # ambil file yg berada di jalur artifacts/raw/test.csv
+            with track_stage('data_processing.load_data') as stage:
+                train_df = load_data(self.train_path, TRAIN_FILE_PATH)   # ambil file yg berada di jalur artifacts/raw/train.csv
+                test_df = load_data(self.test_path, TEST_FILE_PATH)     # ambil file yg berada di jalur artifacts/raw/test.csv
+                stage.rows = len(train_df) + len(test_df)
+
+            with track_stage('data_processing.preprocessed_data', rows=len(train_df) + len(test_df)):
+                train_df = self.preprocessed_data(train_df, TRAIN_NAME_PATH, fit=True)  # setelah mengambil data train kemudian lakukan preprocessed (fit encoder)
+                test_df = self.preprocessed_data(test_df, TEST_NAME_PATH)    # setelah mengambil data test kemudian lakukan preprocessed (pakai encoder dari train)
 
-            train_df = self.preprocessed_data(train_df, TRAIN_NAME_PATH)  # setelah mengambil data train kemudian lakukan preprocessed
-            test_df = self.preprocessed_data(test_df, TEST_NAME_PATH)    # setelah mengambil data test kemudian lakukan preprocessed
+            with track_stage('data_processing.balance_data', rows=len(train_df)):
+                train_df = self.balance_data(train_df)      # lakukan balancing data hanya pada data (train.csv) saja
+                # test_df = self.balance_data(test_df)
 
-            train_df = self.balance_data(train_df)      # lakukan balancing data hanya pada data (train.csv) saja
-            # test_df = self.balance_data(test_df)
+            with track_stage('data_processing.select_feature', rows=len(train_df)):
+                train_df = self.select_feature(train_df)  # terapkan fitur selection based on (feature importance by random forest)
+                test_df = test_df[train_df.columns]  # kolom yg dipilih dari data train, juga diterapkan ke data test
 
-            train_df = self.select_feature(train_df)  # terapkan fitur selection based on (feature importance by random forest)
-            test_df = test_df[train_df.columns]  # kolom yg dipilih dari data train, juga diterapkan ke data test
+            with track_stage('data_processing.save_data', rows=len(train_df) + len(test_df)):
+                self.save_data(train_df, PROCESSED_TRAIN_DATA_PATH)  # simpan ke jalur yg sudah disediakan pada config/paths_config.py
+                self.save_data(test_df, PROCESSED_TEST_DATA_PATH)
 
-            self.save_data(train_df, PROCESSED_TRAIN_DATA_PATH)  # simpan ke jalur yg sudah disediakan pada config/paths_config.py
-            self.save_data(test_df, PROCESSED_TEST_DATA_PATH)
+                self.save_transformer(train_df)
 
             logger.info('data processing completed succesfully')
 
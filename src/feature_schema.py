@@ -0,0 +1,108 @@
+import numpy as np
+from config.data_schema import COLUMN_DTYPES, FEATURE_RANGES
+
+
+def _to_float(value):
+    # true/false dari json tidak diterima sebagai 1/0, int json yang terlalu besar untuk float64 dianggap rusak
+    if isinstance(value, (bool, np.bool_)):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+class FeatureSchema:
+
+    def __init__(self, specs):
+        # specs : list of {'name', 'kind' (categorical / integer / float), 'min', 'max'} sesuai urutan fitur model
+        self.specs = specs
+        self.feature_columns = [spec['name'] for spec in specs]
+        self.transformer = None
+
+    @classmethod
+    def from_transformer(cls, feature_columns, transformer=None, dtypes=COLUMN_DTYPES, ranges=FEATURE_RANGES):
+        # schema dibentuk dari fitur terpilih, encoder hasil training & tipe data di config/data_schema.py
+        specs = []
+        for column in feature_columns:
+            low, high = ranges.get(column, (None, None))
+
+            if transformer is not None and column in transformer.categorical_columns:
+                kind = 'categorical'
+            elif dtypes.get(column, 'float32').startswith('int'):
+                kind = 'integer'
+            else:
+                kind = 'float'
+
+            specs.append({'name': column, 'kind': kind, 'min': low, 'max': high})
+
+        schema = cls(specs)
+        schema.transformer = transformer
+        return schema
+
+    def _coerce_numeric(self, values, missing):
+        try:
+            # jalur cepat : angka & string angka dikonversi sekaligus oleh numpy, None menjadi NaN;
+            # numpy mengubah bool menjadi 1/0, batch yang berisi bool ikut lewat jalur per nilai
+            if bool in set(map(type, values)):
+                raise TypeError('boolean value in a numeric column')
+            return np.asarray(values, dtype=np.float64), np.zeros(len(values), dtype=bool)
+        except (TypeError, ValueError, OverflowError):
+            # hanya batch yang berisi nilai rusak yang dikonversi per nilai
+            numbers = np.fromiter((_to_float(value) for value in values), dtype=np.float64, count=len(values))
+            return numbers, np.isnan(numbers) & ~missing
+
+    def validate(self, records):
+        # return : X (baris valid saja, sudah di-encode & log1p), index baris valid, error per baris
+        n_rows = len(records)
+        X = np.empty((n_rows, len(self.specs)), dtype=np.float32)
+        invalid = np.zeros(n_rows, dtype=bool)
+        problems = []   # (mask, field, pesan)
+
+        for j, spec in enumerate(self.specs):
+            column = spec['name']
+            values = np.fromiter((record.get(column) for record in records), dtype=object, count=n_rows)
+
+            missing = np.equal(values, None) | np.equal(values, '')  # field form yang dikosongkan dianggap missing
+
+            if spec['kind'] == 'categorical':
+                codes = self.transformer.lookup_codes(column, values)
+                problems.append((np.isnan(codes) & ~missing, column, 'unknown category'))
+                X[:, j] = codes
+            else:
+                numbers, malformed = self._coerce_numeric(values, missing)
+                missing |= np.isnan(numbers) & ~malformed
+                problems.append((malformed, column, 'not a number'))
+
+                finite = np.isfinite(numbers)
+                problems.append((~finite & ~np.isnan(numbers), column, 'must be finite'))
+
+                if spec['kind'] == 'integer':
+                    problems.append((finite & (numbers != np.floor(numbers)), column, 'must be an integer'))
+                if spec['min'] is not None:
+                    problems.append((finite & (numbers < spec['min']), column, f"must be >= {spec['min']}"))
+                if spec['max'] is not None:
+                    problems.append((finite & (numbers > spec['max']), column, f"must be <= {spec['max']}"))
+
+                X[:, j] = numbers
+
+            problems.append((missing, column, 'missing value'))
+
+        for mask, _, _ in problems:
+            invalid |= mask
+
+        valid_rows = np.flatnonzero(~invalid)
+        X = X[valid_rows]
+
+        # log1p diterapkan setelah validasi, hanya ke baris yang valid
+        if self.transformer is not None:
+            for j, column in enumerate(self.feature_columns):
+                if column in self.transformer.log_columns:
+                    np.log1p(X[:, j], out=X[:, j])
+
+        errors = {}
+        for mask, field, message in problems:
+            for row in np.flatnonzero(mask).tolist():
+                errors.setdefault(row, []).append({'field': field, 'error': message})
+
+        return X, valid_rows, [{'row': row, 'errors': errors[row]} for row in sorted(errors)]
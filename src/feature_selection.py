@@ -0,0 +1,89 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+from lightgbm import LGBMClassifier
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_selection import mutual_info_classif
+from sklearn.inspection import permutation_importance
+from sklearn.model_selection import train_test_split
+
+SELECTION_METHODS = ['random_forest', 'subsample_rf', 'hist_gbdt', 'mutual_info', 'permutation']
+
+
+def sample_rows(X, y, sample_size, random_state=42):
+    # sampel stratified dengan ukuran tetap, agar biaya ranking tidak ikut membesar bersama data
+    if sample_size is None or len(X) <= sample_size:
+        return X, y
+
+    X_sample, _, y_sample, _ = train_test_split(X, y, train_size=sample_size, stratify=y, random_state=random_state)
+    return X_sample, y_sample
+
+
+def _proxy_gbdt(random_state, n_jobs):
+    return LGBMClassifier(n_estimators=50, num_leaves=31, importance_type='gain', random_state=random_state, n_jobs=n_jobs, verbose=-1)
+
+
+def rank_features(X, y, method='random_forest', sample_size=20000, n_jobs=-1, random_state=42):
+    if method == 'random_forest':
+        # metode awal : random forest 100 tree pada seluruh data (sekarang multicore)
+        model = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs).fit(X, y)
+        importance = model.feature_importances_
+
+    elif method == 'subsample_rf':
+        X_sample, y_sample = sample_rows(X, y, sample_size, random_state)
+        model = RandomForestClassifier(n_estimators=50, random_state=random_state, n_jobs=n_jobs).fit(X_sample, y_sample)
+        importance = model.feature_importances_
+
+    elif method == 'hist_gbdt':
+        X_sample, y_sample = sample_rows(X, y, sample_size, random_state)
+        importance = _proxy_gbdt(random_state, n_jobs).fit(X_sample, y_sample).feature_importances_
+
+    elif method == 'mutual_info':
+        X_sample, y_sample = sample_rows(X, y, sample_size, random_state)
+        discrete = [pd.api.types.is_integer_dtype(X_sample[col]) for col in X_sample.columns]
+        importance = mutual_info_classif(X_sample, y_sample, discrete_features=discrete, random_state=random_state, n_jobs=n_jobs)
+
+    elif method == 'permutation':
+        X_sample, y_sample = sample_rows(X, y, sample_size, random_state)
+        X_fit, X_valid, y_fit, y_valid = train_test_split(X_sample, y_sample, test_size=0.3, stratify=y_sample, random_state=random_state)
+        model = _proxy_gbdt(random_state, n_jobs).fit(X_fit, y_fit)
+        importance = permutation_importance(model, X_valid, y_valid, n_repeats=5, random_state=random_state, n_jobs=n_jobs).importances_mean
+
+    else:
+        raise ValueError(f'unknown feature selection method {method}, choose one of {SELECTION_METHODS}')
+
+    return pd.Series(importance, index=X.columns).sort_values(ascending=False)
+
+
+def ranking_stability(importance, reference, top_k):
+    # seberapa mirip ranking sebuah metode dibanding metode acuan (random forest penuh)
+    top = set(importance.index[:top_k])
+    reference_top = set(reference.index[:top_k])
+
+    correlation = spearmanr(importance.reindex(reference.index).values, reference.values).statistic
+
+    return {
+        'top_k_overlap': len(top & reference_top) / top_k,
+        'spearman': float(correlation)
+    }
+
+
+def compare_methods(X, y, top_k, methods=SELECTION_METHODS, reference_method='random_forest', **kwargs):
+    timings, rankings = {}, {}
+
+    for method in dict.fromkeys([reference_method] + list(methods)):
+        start = time.perf_counter()
+        rankings[method] = rank_features(X, y, method, **kwargs)
+        timings[method] = time.perf_counter() - start
+
+    report = []
+    for method in rankings:
+        report.append({
+            'method': method,
+            'seconds': round(timings[method], 3),
+            'top_features': rankings[method].index[:top_k].tolist(),
+            **ranking_stability(rankings[method], rankings[reference_method], top_k)
+        })
+
+    return report
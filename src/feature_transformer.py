@@ -0,0 +1,192 @@
+import os
+import json
+import numpy as np
+
+
+class FeatureTransformer:
+
+    def __init__(self, categorical_columns, numerical_columns, skewness_threshold, target_column='booking_status'):
+        self.categorical_columns = list(categorical_columns)
+        self.numerical_columns = list(numerical_columns)
+        self.skewness_threshold = skewness_threshold
+        self.target_column = target_column
+
+        self.categories = {}        # {kolom: [label dengan urutan = code]} sama seperti LabelEncoder.classes_
+        self.log_columns = []       # kolom numerik yang di-log1p karena skew > threshold
+        self.selected_features = [] # urutan fitur yang dipakai model
+
+        self._lookups = {}
+
+    @staticmethod
+    def _factorize(series):
+        # kolom category (dari parquet/feather) sudah punya codes, kolom string di-factorize berbasis hash (tanpa sort per baris)
+        if series.dtype.name != 'category':
+            series = series.astype('category')
+
+        return np.asarray(series.cat.categories.astype(str)), series.cat.codes.to_numpy()
+
+    def _encode(self, column, uniques, inverse):
+        lookup = self._lookups[column]
+        code_dtype = np.int8 if len(lookup) < 128 else np.int32
+
+        # mapping hanya untuk nilai unik, lalu disebar ke semua baris lewat inverse
+        # label yang tidak dikenal (tidak ada di data train) / NaN (code -1) diberi code -1
+        remap = np.array([lookup.get(label, -1) for label in uniques] + [-1], dtype=code_dtype)
+        return remap[inverse.reshape(-1)]
+
+    def _fit_skewness(self, df):
+        skewness = df[self.numerical_columns].skew()  # semua kolom dihitung sekaligus
+        self.log_columns = skewness[skewness > self.skewness_threshold].index.tolist()
+
+    def _apply_log(self, df):
+        log_columns = [col for col in self.log_columns if col in df.columns]
+        if log_columns:
+            df[log_columns] = np.log1p(df[log_columns].to_numpy(dtype=np.float64))
+        return df
+
+    def fit(self, df):
+        for col in self.categorical_columns:
+            uniques, _ = self._factorize(df[col])
+            self.categories[col] = np.unique(uniques).tolist()
+
+        self._fit_skewness(df)
+        self._build_lookups()
+        return self
+
+    def transform(self, df):
+        for col in self.categorical_columns:
+            if col in df.columns:
+                df[col] = self._encode(col, *self._factorize(df[col]))
+
+        return self._apply_log(df)
+
+    def fit_transform(self, df):
+        # 1x factorize per kolom dipakai untuk fit sekaligus encode
+        factorized = {}
+        for col in self.categorical_columns:
+            factorized[col] = self._factorize(df[col])
+            self.categories[col] = np.unique(factorized[col][0]).tolist()
+
+        self._fit_skewness(df)
+        self._build_lookups()
+
+        for col, (uniques, inverse) in factorized.items():
+            df[col] = self._encode(col, uniques, inverse)
+
+        return self._apply_log(df)
+
+    def extend_categories(self, df):
+        # label baru (mis. dari data booking terbaru) ditambahkan di akhir, code label lama tidak berubah sehingga model lama tetap valid
+        # kolom target tidak diperluas, baris dengan target yang tidak dikenal tetap mendapat code -1
+        added = {}
+        for col in self.categorical_columns:
+            if col == self.target_column or col not in df.columns:
+                continue
+
+            uniques, _ = self._factorize(df[col])
+            new_labels = [label for label in np.unique(uniques).tolist() if label not in self._lookups[col]]
+            if new_labels:
+                self.categories[col] = list(self.categories[col]) + new_labels
+                added[col] = new_labels
+
+        self._build_lookups()
+        return added
+
+    def mappings(self):
+        return {col: dict(lookup) for col, lookup in self._lookups.items()}
+
+    def _build_lookups(self):
+        self._lookups = {col: {label: code for code, label in enumerate(labels)} for col, labels in self.categories.items()}
+
+    def lookup_codes(self, column, values):
+        # lookup dilakukan per nilai unik saja, lalu disebar ke seluruh baris lewat index inverse
+        # nilai yang tidak dikenal diberi NaN, caller yang menentukan apakah itu error
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+
+        lookup = self._lookups[column]
+        n_codes = len(self.categories[column])
+        codes = np.full(len(uniques), np.nan, dtype=np.float32)
+
+        for i, label in enumerate(uniques):
+            code = lookup.get(label)
+            if code is None:
+                # caller boleh mengirim code integer yang sudah di-encode
+                try:
+                    number = float(label)
+                except ValueError:
+                    continue
+
+                if number.is_integer() and 0 <= number < n_codes:
+                    code = number
+
+            if code is not None:
+                codes[i] = code
+
+        return codes[inverse.reshape(-1)]
+
+    def encode_column(self, column, values):
+        codes = self.lookup_codes(column, values)
+
+        unknown = np.isnan(codes)
+        if unknown.any():
+            labels = np.unique(np.asarray(values, dtype=str)[unknown]).tolist()
+            raise ValueError(f'unknown categories for {column} : {labels}')
+
+        return codes
+
+    def transform_records(self, records, feature_columns=None):
+        feature_columns = list(feature_columns or self.selected_features)
+        n_rows = len(records)
+
+        X = np.empty((n_rows, len(feature_columns)), dtype=np.float32)
+        for j, col in enumerate(feature_columns):
+            values = [record[col] for record in records]
+
+            if col in self._lookups:
+                X[:, j] = self.encode_column(col, values)
+            else:
+                X[:, j] = np.asarray(values, dtype=np.float32)
+
+            if col in self.log_columns:
+                np.log1p(X[:, j], out=X[:, j])
+
+        return X
+
+    def decode_target(self, codes):
+        labels = np.asarray(self.categories[self.target_column], dtype=object)
+        return labels[np.asarray(codes, dtype=int)]
+
+    def to_dict(self):
+        return {
+            'categorical_columns': self.categorical_columns,
+            'numerical_columns': self.numerical_columns,
+            'skewness_threshold': self.skewness_threshold,
+            'target_column': self.target_column,
+            'categories': self.categories,
+            'log_columns': self.log_columns,
+            'selected_features': self.selected_features
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            state = json.load(f)
+
+        transformer = cls(
+            state['categorical_columns'],
+            state['numerical_columns'],
+            state['skewness_threshold'],
+            state['target_column']
+        )
+        transformer.categories = state['categories']
+        transformer.log_columns = state['log_columns']
+        transformer.selected_features = state['selected_features']
+        transformer._build_lookups()
+
+        return transformer
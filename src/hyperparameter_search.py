@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import lightgbm as lgb
+from concurrent.futures import ThreadPoolExecutor
+from lightgbm import LGBMClassifier
+from sklearn.model_selection import ParameterSampler, StratifiedKFold
+from sklearn.utils.class_weight import compute_sample_weight
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SuccessiveHalvingSearch:
+
+    def __init__(self, param_distributions, n_candidates=64, min_rounds=25, eta=3, cv=2, n_jobs=-1, random_state=42, metric='binary_logloss', class_weight=None):
+        self.param_distributions = param_distributions
+        self.n_candidates = n_candidates
+        self.min_rounds = min_rounds
+        self.eta = eta
+        self.cv = cv
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.random_state = random_state
+        self.metric = metric
+        self.class_weight = class_weight
+
+        self.best_params_ = None
+        self.best_score_ = None
+        self.best_estimator_ = None
+        self.history_ = []
+
+    def _booster_params(self, candidate):
+        # nama parameter sklearn -> parameter native LightGBM, n_estimators dipakai sebagai batas jumlah round
+        params = {key: value for key, value in candidate.items() if key != 'n_estimators'}
+        params.update({
+            'objective': 'binary',
+            'metric': self.metric,
+            'num_threads': 1,  # paralel antar kandidat/fold, bukan di dalam 1 booster
+            'seed': self.random_state,
+            'verbose': -1
+        })
+        return params
+
+    def _build_folds(self, X, y):
+        # binning histogram dibuat sekali dari seluruh data train, semua fold & kandidat memakai bin yang sama
+        weight = compute_sample_weight(self.class_weight, y) if self.class_weight is not None else None
+        full_data = lgb.Dataset(X, label=y, weight=weight, params={'verbose': -1}, free_raw_data=False).construct()
+
+        splitter = StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state)
+        folds = []
+        for train_index, valid_index in splitter.split(X, y):
+            folds.append((full_data.subset(train_index).construct(), full_data.subset(valid_index).construct()))
+
+        return folds
+
+    def fit(self, X, y):
+        candidates = list(ParameterSampler(self.param_distributions, n_iter=self.n_candidates, random_state=self.random_state))
+        folds = self._build_folds(X, y)
+
+        # booster dibuat saat kandidat pertama kali dijalankan & dilepas begitu kandidat tersingkir
+        boosters = {}
+        rounds_done = {}
+        stalled = set()     # (kandidat, fold) yang berhenti lebih awal karena tidak ada split lagi
+        scores = {}
+        survivors = list(range(len(candidates)))
+        greater_is_better = False
+        rung = 0
+
+        def advance(task):
+            c, f, target_rounds = task
+            booster = boosters.get((c, f))
+            if booster is None:
+                train_data, valid_data = folds[f]
+                booster = lgb.Booster(params=self._booster_params(candidates[c]), train_set=train_data)
+                booster.add_valid(valid_data, 'valid')
+                boosters[c, f] = booster
+
+            # lanjutkan boosting dari round terakhir (tidak mulai ulang dari nol)
+            if (c, f) not in stalled:
+                for _ in range(target_rounds - booster.current_iteration()):
+                    if booster.update():
+                        stalled.add((c, f))
+                        break
+
+            rounds_done[c, f] = booster.current_iteration()
+            _, _, score, maximize = booster.eval_valid()[0][:4]
+            return c, score, maximize
+
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            while True:
+                budget = self.min_rounds * self.eta ** rung
+                targets = {c: min(budget, candidates[c].get('n_estimators', budget)) for c in survivors}
+                keep = max(1, len(survivors) // self.eta)
+                order = {c: i for i, c in enumerate(survivors)}
+
+                # arah ranking mengikuti metric LightGBM (mis. auc makin besar makin baik, logloss sebaliknya)
+                def rank_key(c):
+                    return (-scores[c] if greater_is_better else scores[c], order[c])
+
+                tasks = [(c, f, targets[c]) for c in survivors for f in range(len(folds))]
+                fold_scores = {}
+                kept = []
+                for c, score, greater_is_better in executor.map(advance, tasks):
+                    fold_scores.setdefault(c, []).append(score)
+                    if len(fold_scores[c]) < len(folds):
+                        continue
+
+                    scores[c] = float(np.mean(fold_scores[c]))
+
+                    # booster kandidat yang sudah pasti tidak lolos ke rung berikutnya langsung dilepas
+                    kept = sorted(kept + [c], key=rank_key)
+                    for dropped in kept[keep:]:
+                        for f in range(len(folds)):
+                            boosters.pop((dropped, f), None)
+                    kept = kept[:keep]
+
+                ranked = sorted(survivors, key=rank_key)
+                self.history_.append({'rung': rung, 'budget': budget, 'candidates': len(survivors), 'best_score': scores[ranked[0]]})
+
+                logger.info(f'rung {rung} : {len(survivors)} candidates, up to {budget} rounds, best {self.metric} {scores[ranked[0]]:.5f}')
+
+                # kandidat yang lemah dibuang, yang bertahan mendapat jumlah round lebih banyak
+                finished = all(
+                    (c, f) in stalled or rounds_done[c, f] >= candidates[c].get('n_estimators', budget)
+                    for c in ranked for f in range(len(folds))
+                )
+                if len(ranked) == 1 or finished:
+                    break
+
+                survivors = ranked[:keep]
+                rung += 1
+
+        best = ranked[0]
+        best_rounds = max(rounds_done[best, f] for f in range(len(folds)))
+        self.best_params_ = dict(candidates[best], n_estimators=best_rounds)
+        self.best_score_ = scores[best]
+
+        logger.info(f'refitting best candidate on full training data with {best_rounds} rounds')
+
+        self.best_estimator_ = LGBMClassifier(random_state=self.random_state, class_weight=self.class_weight, **self.best_params_)
+        self.best_estimator_.fit(X, y)
+
+        return self
@@ -0,0 +1,274 @@
+import os
+import sys
+import json
+import time
+import shutil
+import joblib
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.data_ingestion import DataIngestion
+from src.feature_transformer import FeatureTransformer
+from src.model_training import ModelTraining
+from src.model_registry import publish_model_version, latest_artifact_paths
+from src.model_evaluation import binary_metrics, reference_distribution, population_stability_index
+from src.instrumentation import track_stage
+from config.paths_config import *
+from utils.common_functions import load_data
+
+import mlflow
+
+logger = get_logger(__name__)
+
+ID_COLUMN = 'Booking_ID'
+
+
+def raw_file_position(path, chunk_size):
+    # jumlah baris file raw & Booking_ID baris terakhir, dipakai sebagai watermark incremental training
+    n_rows, last_booking_id = 0, None
+    for chunk in pd.read_csv(path, usecols=[ID_COLUMN], dtype={ID_COLUMN: str}, chunksize=chunk_size):
+        if len(chunk):
+            n_rows += len(chunk)
+            last_booking_id = chunk[ID_COLUMN].iloc[-1]
+    return n_rows, last_booking_id
+
+
+def read_training_state(path=TRAINING_STATE_PATH):
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_training_state(state, path=TRAINING_STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+class IncrementalTrainer:
+
+    def __init__(self, config, state_path=TRAINING_STATE_PATH):
+        self.config = config
+        self.incremental_config = config.get('incremental_training', {})
+        self.state_path = state_path
+
+        self.num_boost_round = self.incremental_config.get('num_boost_round', 50)
+        self.min_new_rows = self.incremental_config.get('min_new_rows', 1000)
+        self.max_incremental_runs = self.incremental_config.get('max_incremental_runs', 10)
+        self.psi_bins = self.incremental_config.get('psi_bins', 10)
+        self.max_psi = self.incremental_config.get('max_psi', 0.2)
+        self.max_auc_drop = self.incremental_config.get('max_auc_drop', 0.02)
+        self.max_update_auc_drop = self.incremental_config.get('max_update_auc_drop', 0.0)
+        self.chunk_size = config['data_ingestion'].get('chunk_size', 100000)
+
+        self.data_ingestion = DataIngestion(config)
+
+    def prepare(self, df, transformer):
+        # sama seperti preprocessing : buang duplikat, encode & log1p, lalu ambil fitur yang dipakai model
+        feature_columns = [col for col in df.columns if col not in ('Unnamed: 0', ID_COLUMN)]
+        df = df.loc[~df.duplicated(subset=feature_columns).to_numpy(), feature_columns]
+
+        df = transformer.transform(df.copy())
+        df = df[df[transformer.target_column] >= 0]  # target yang tidak dikenal tidak bisa dipakai training
+
+        return df[transformer.selected_features], df[transformer.target_column].to_numpy()
+
+    def read_delta(self, row_offset, last_booking_id):
+        # file raw hanya ditambah di akhir : watermark adalah posisi baris (tidak bergantung format Booking_ID),
+        # baris sebelum row_offset sudah dipakai training; hanya baris setelahnya yang disimpan di memori.
+        # return None jika baris di posisi watermark bukan Booking_ID yang tercatat (file raw ditulis ulang)
+        chunks = []
+        position = 0
+        for chunk in pd.read_csv(RAW_FILE_PATH, dtype={ID_COLUMN: str}, chunksize=self.chunk_size):
+            end = position + len(chunk)
+            if row_offset > 0 and position < row_offset <= end:
+                if chunk[ID_COLUMN].iloc[row_offset - position - 1] != last_booking_id:
+                    return None
+
+            chunks.append(chunk.iloc[max(row_offset - position, 0):])
+            position = end
+
+        if position < row_offset:
+            return None
+
+        return pd.concat(chunks, ignore_index=True)
+
+    def save_state(self, source_fingerprint=None):
+        # dipanggil setelah full retrain : watermark, distribusi referensi (PSI) & metrik baseline dihitung ulang
+        try:
+            logger.info('saving training state for incremental training')
+
+            row_offset, last_booking_id = raw_file_position(RAW_FILE_PATH, self.chunk_size)
+
+            transformer = FeatureTransformer.load(PREPROCESSOR_OUTPUT_PATH)
+            model = joblib.load(MODEL_OUTPUT_PATH)
+
+            X_train, _ = self.prepare(load_data(TRAIN_FILE_PATH), transformer)
+            X_test, y_test = self.prepare(load_data(TEST_FILE_PATH), transformer)
+
+            state = {
+                'row_offset': row_offset,
+                'last_booking_id': last_booking_id,
+                'source_fingerprint': source_fingerprint,
+                'incremental_runs': 0,
+                'trained_at': time.time(),
+                'reference': reference_distribution(X_train.to_numpy(), transformer.selected_features, self.psi_bins),
+                'baseline': binary_metrics(y_test, model.predict_proba(X_test)[:, 1])
+            }
+            write_training_state(state, self.state_path)
+
+            logger.info(f"training state saved to {self.state_path} with row offset {row_offset}, baseline auc {state['baseline']['roc_auc']}")
+
+            return state
+
+        except Exception as e:
+            logger.error(f'error while saving training state {e}')
+            raise CustomException('failed to save training state', sys)
+
+    def continue_boosting(self, model, X_train, y_train):
+        # booster lama dilanjutkan dengan num_boost_round tree baru, parameter hasil tuning tetap dipakai
+        params = model.get_params()
+        params['n_estimators'] = self.num_boost_round
+
+        # delta tidak di-oversampling (SMOTE di data kecil hanya menambah noise), ketidakseimbangan ditangani bobot kelas
+        if params.get('class_weight') is None:
+            params['class_weight'] = 'balanced'
+
+        updated_model = LGBMClassifier(**params)
+        updated_model.fit(X_train, y_train, init_model=model.booster_)
+
+        return updated_model
+
+    def run(self, source_fingerprint=None):
+        # return : 'updated', 'up_to_date', 'skipped' (delta terlalu sedikit) atau 'full_retrain'
+        try:
+            # booster yang dilanjutkan adalah versi yang sedang dilayani (LATEST), bukan output stage cache di artifacts/models
+            model_path, preprocessor_path = latest_artifact_paths(MODEL_REGISTRY_DIR, [MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH])
+
+            state = read_training_state(self.state_path)
+            if state is None or 'row_offset' not in state or not os.path.exists(model_path):
+                logger.info('no previous training state found, full retrain needed')
+                return 'full_retrain'
+
+            if state['incremental_runs'] >= self.max_incremental_runs:
+                logger.info(f"{state['incremental_runs']} incremental runs since the last full retrain, full retrain needed")
+                return 'full_retrain'
+
+            if source_fingerprint is not None and source_fingerprint == state.get('source_fingerprint'):
+                logger.info('source file has not changed since the last run')
+                return 'up_to_date'
+
+            with track_stage('incremental_training.load_delta') as stage:
+                self.data_ingestion.download_csv_from_gcp()
+                delta = self.read_delta(state['row_offset'], state['last_booking_id'])
+                stage.rows = len(delta) if delta is not None else 0
+
+            if delta is None:
+                logger.info(f"raw file no longer starts with the {state['row_offset']} rows used for training, full retrain needed")
+                return 'full_retrain'
+
+            logger.info(f"{len(delta)} new rows after row offset {state['row_offset']}")
+
+            if len(delta) < self.min_new_rows:
+                # watermark tidak dimajukan, baris baru dikumpulkan sampai cukup
+                logger.info(f'less than {self.min_new_rows} new rows, incremental training skipped')
+                return 'skipped'
+
+            transformer = FeatureTransformer.load(preprocessor_path)
+            added = transformer.extend_categories(delta)
+            if added:
+                logger.info(f'new categories added to the preprocessor : {added}')
+
+            # split berdasarkan hash Booking_ID, baris holdout dipakai untuk quality gate
+            is_train = self.data_ingestion.assign_train_rows(delta[ID_COLUMN])
+            X_train, y_train = self.prepare(delta[is_train], transformer)
+            X_holdout, y_holdout = self.prepare(delta[~is_train], transformer)
+
+            # drift gate : distribusi fitur delta dibandingkan dengan data train saat full retrain terakhir
+            psi = population_stability_index(state['reference'], X_train.to_numpy(), transformer.selected_features)
+            max_psi_feature = max(psi, key=psi.get)
+
+            logger.info(f'population stability index : {psi}')
+
+            if psi[max_psi_feature] > self.max_psi:
+                logger.info(f'feature drift on {max_psi_feature} (psi {psi[max_psi_feature]:.4f} > {self.max_psi}), full retrain needed')
+                return 'full_retrain'
+
+            model = joblib.load(model_path)
+
+            # quality gate : model lama yang sudah turun jauh dari baseline tidak dilanjutkan, tapi di-train ulang
+            current_metrics = binary_metrics(y_holdout, model.predict_proba(X_holdout)[:, 1])
+            if state['baseline']['roc_auc'] - current_metrics['roc_auc'] > self.max_auc_drop:
+                logger.info(f"current model auc {current_metrics['roc_auc']:.4f} dropped from baseline {state['baseline']['roc_auc']:.4f}, full retrain needed")
+                return 'full_retrain'
+
+            with track_stage('incremental_training.continue_boosting', rows=len(X_train)):
+                updated_model = self.continue_boosting(model, X_train, y_train)
+
+            updated_metrics = binary_metrics(y_holdout, updated_model.predict_proba(X_holdout)[:, 1])
+
+            logger.info(f"holdout auc current model {current_metrics['roc_auc']:.4f}, updated model {updated_metrics['roc_auc']:.4f}")
+
+            # model yang sedang dilayani hanya diganti jika model hasil update tidak lebih buruk di holdout yang sama
+            if updated_metrics['roc_auc'] < current_metrics['roc_auc'] - self.max_update_auc_drop:
+                logger.info('updated model is worse than the current model, full retrain needed')
+                return 'full_retrain'
+
+            with mlflow.start_run(run_name='incremental_training'):
+                mlflow.set_tag('training_mode', 'incremental')
+                mlflow.log_params({'num_boost_round': self.num_boost_round, 'row_offset': state['row_offset'], 'new_rows': len(delta)})
+                mlflow.log_metrics({name: updated_metrics[name] for name in ('accuracy', 'precision', 'recall', 'f1 score', 'roc_auc', 'log_loss')})
+                mlflow.log_metric('max_psi', psi[max_psi_feature])
+
+                with track_stage('incremental_training.save_model'):
+                    # artifact disimpan di folder staging dengan nama file yang sama, lalu dipublish dari sana;
+                    # artifacts/models/* tetap milik full retrain (output stage cache model_training)
+                    staged_paths = [os.path.join(INCREMENTAL_MODEL_DIR, os.path.basename(path)) for path in (MODEL_OUTPUT_PATH, COMPILED_MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH, CALIBRATOR_OUTPUT_PATH)]
+                    shutil.rmtree(INCREMENTAL_MODEL_DIR, ignore_errors=True)
+
+                    model_training = ModelTraining(
+                        PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, staged_paths[0],
+                        compiled_model_output_path=staged_paths[1],
+                        calibrator_output_path=staged_paths[3]
+                    )
+                    model_training.save_model(updated_model)
+                    model_training.compile_model(updated_model, X_holdout)
+                    transformer.save(staged_paths[2])
+
+                    # kalibrasi & threshold dihitung ulang untuk booster yang sudah diperbarui
+                    if model_training.calibration_config.get('enabled', False):
+                        calibrator = model_training.calibrate_model(updated_model, X_holdout, pd.Series(y_holdout))
+                        mlflow.log_metrics({f'calibration {name}': value for name, value in calibrator.metrics.items()})
+
+                    model_version = publish_model_version(
+                        MODEL_REGISTRY_DIR,
+                        [path for path in staged_paths if os.path.exists(path)],
+                        metadata={'training_mode': 'incremental', 'metrics': updated_metrics, 'row_offset': state['row_offset'], 'run_id': mlflow.active_run().info.run_id},
+                        keep_versions=model_training.keep_versions
+                    )
+                    mlflow.set_tag('model_version', model_version)
+
+            # referensi & baseline tetap dari full retrain terakhir, sehingga drift yang menumpuk tetap terdeteksi
+            state.update({
+                'row_offset': state['row_offset'] + len(delta),
+                'last_booking_id': delta[ID_COLUMN].iloc[-1],
+                'source_fingerprint': source_fingerprint,
+                'incremental_runs': state['incremental_runs'] + 1,
+                'updated_at': time.time()
+            })
+            write_training_state(state, self.state_path)
+
+            logger.info(f"incremental training completed, model version {model_version}, row offset {state['row_offset']}")
+
+            return 'updated'
+
+        except Exception as e:
+            logger.error(f'error in incremental training {e}')
+            raise CustomException('failed during incremental training', sys)
@@ -0,0 +1,226 @@
+import sys
+import time
+import builtins
+import resource
+import threading
+from contextlib import ContextDecorator
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_stage_records = []
+_records_lock = threading.Lock()
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # linux : KB
+
+
+class track_stage(ContextDecorator):
+
+    # dipakai sebagai context manager (with track_stage('name', rows=n) as stage) atau decorator (@track_stage('name'))
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.record = None
+
+    def __enter__(self):
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._rss_start = peak_rss_mb()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall_start
+
+        self.record = {
+            'stage': self.name,
+            'status': 'error' if exc_type is not None else 'ok',
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(time.process_time() - self._cpu_start, 4),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'rss_growth_mb': round(peak_rss_mb() - self._rss_start, 1),
+            'rows': self.rows,
+            'rows_per_sec': round(self.rows / wall) if self.rows and wall > 0 else None
+        }
+
+        with _records_lock:
+            _stage_records.append(self.record)
+
+        logger.info('stage %s finished : %s', self.name, self.record)
+        return False
+
+
+def stage_records():
+    with _records_lock:
+        return list(_stage_records)
+
+
+def reset_stage_records():
+    with _records_lock:
+        _stage_records.clear()
+
+
+def stage_metrics(records):
+    # format datar untuk mlflow.log_metrics, mis. {'model_training.train_lgbm.wall_seconds': 12.3}
+    metrics = {}
+    for record in records:
+        for key in ('wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'rss_growth_mb', 'rows', 'rows_per_sec'):
+            if record[key] is not None:
+                metrics[f"{record['stage']}.{key}"] = record[key]
+    return metrics
+
+
+class ImportProfiler:
+
+    # waktu import per package top-level (self time, tanpa waktu package lain yang di-import di dalamnya), mirip python -X importtime
+    def __init__(self):
+        self.seconds = {}
+        self.total_seconds = 0.0
+        self._stack = []
+        self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+
+            package = name.partition('.')[0]
+            self.seconds[package] = self.seconds.get(package, 0.0) + elapsed - children
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def __enter__(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        builtins.__import__ = self._original_import
+        self.total_seconds = time.perf_counter() - self._start
+        return False
+
+    def breakdown(self, top=10):
+        ranked = sorted(self.seconds.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {package: round(seconds, 4) for package, seconds in ranked}
+
+
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ''
+
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for name, value in pairs]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Counter:
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self, const_labels=()):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.label_names, key, const_labels)} {value}')
+        return lines
+
+
+class Gauge:
+
+    # nilai dibaca saat /metrics dipanggil (mis. peak RSS proses, atau counter milik objek lain dengan metric_type='counter')
+    def __init__(self, name, documentation, value_fn, metric_type='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.value_fn = value_fn
+        self.metric_type = metric_type
+
+    def render(self, const_labels=()):
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}', f'{self.name}{_format_labels((), (), const_labels)} {self.value_fn()}']
+
+
+class Histogram:
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self, const_labels=()):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, list(const_labels) + [("le", le)])} {cumulative}')
+
+                lines.append(f'{self.name}_sum{_format_labels(self.label_names, key, const_labels)} {total}')
+                lines.append(f'{self.name}_count{_format_labels(self.label_names, key, const_labels)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+
+    # exporter format teks prometheus sederhana, tanpa dependency tambahan (prometheus_client);
+    # const_labels_fn : label yang ditambahkan ke semua series saat render, mis. pid worker gunicorn
+    def __init__(self, const_labels_fn=None):
+        self._metrics = []
+        self.const_labels_fn = const_labels_fn
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name, documentation, value_fn, metric_type='gauge'):
+        return self.register(Gauge(name, documentation, value_fn, metric_type))
+
+    def histogram(self, name, documentation, label_names=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self):
+        const_labels = list(self.const_labels_fn().items()) if self.const_labels_fn is not None else []
+
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(const_labels))
+        return '\n'.join(lines) + '\n'
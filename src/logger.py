@@ -1,19 +1,150 @@
 import logging
+import logging.handlers
 import os
+import json
+import queue
+import atexit
+import random
 from datetime import datetime
 
-LOGS_DIR = 'logs'
-os.makedirs(LOGS_DIR, exist_ok=True)
+LOGS_DIR = os.environ.get('LOGS_DIR', 'logs')
 
 LOG_FILE = os.path.join(LOGS_DIR, f'log_{datetime.now().strftime('%Y-%m-%d')}.log')
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')                       # json / text
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_MB', 50)) * 1024 * 1024     # file log dirotasi berdasarkan ukuran
+LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 5))
+LOG_SAMPLING = os.environ.get('LOG_SAMPLING', 'application.requests=0.01')  # logger=rate, dipisah koma; hanya level di bawah WARNING yang disampling
+LOG_ASYNC = os.environ.get('LOG_ASYNC', '1') != '0'
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# args log dengan tipe ini immutable, aman diformat belakangan oleh thread listener
+PRIMITIVE_TYPES = (str, bytes, int, float, bool, type(None))
+
+# atribut bawaan LogRecord, sisanya (dari extra={...}) ikut ditulis sebagai field json
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_configured = False
+_queue = None
+_listener = None
+
+
+class LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+
+    # folder & file log baru dibuat saat pesan pertama ditulis, bukan saat module di-import
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                payload[key] = value
+
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+
+    # event frekuensi tinggi (mis. 1 log per request) hanya ditulis sebagian, warning & error selalu ditulis
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rate = self.rates.get(record.name)
+        return rate is None or random.random() < rate
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+
+    # QueueHandler bawaan memformat pesan di thread pemanggil; di sini record dikirim apa adanya,
+    # pesan (args %-style) baru diformat oleh thread listener saat ditulis ke file
+    def prepare(self, record):
+        args = record.args.values() if isinstance(record.args, dict) else record.args or ()
+
+        # args selain tipe primitif (dict, list, objek) bisa berubah sebelum listener menulisnya,
+        # jadi pesannya diformat sekarang agar log sesuai dengan nilai saat dipanggil
+        if not all(isinstance(arg, PRIMITIVE_TYPES) for arg in args):
+            record.msg = record.getMessage()
+            record.args = None
+
+        return record
+
+
+def parse_sampling(value):
+    rates = {}
+    for item in value.split(','):
+        if '=' in item:
+            name, rate = item.split('=', 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _start_listener(queue_handler, file_handler):
+    # queue baru per proses : record milik proses induk yang masih di queue saat fork tidak ikut ditulis ulang oleh proses anak
+    global _queue, _listener
+    _queue = queue.SimpleQueue()
+    queue_handler.queue = _queue
+
+    _listener = logging.handlers.QueueListener(_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    # pesan yang masih di queue ditulis dulu sebelum proses berhenti
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging():
+    global _configured
+    if _configured:
+        return
+
+    _configured = True
+
+    file_handler = LazyRotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True)
+    file_handler.setFormatter(JsonFormatter() if LOG_FORMAT == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    handler = file_handler
+    if LOG_ASYNC:
+        # thread pemanggil hanya memasukkan record ke queue, I/O disk dikerjakan thread listener
+        handler = DeferredQueueHandler(None)
+        _start_listener(handler, file_handler)
+
+        atexit.register(_stop_listener)
+        # thread listener tidak ikut ter-copy saat fork (gunicorn worker), dijalankan ulang di proses anak
+        os.register_at_fork(after_in_child=lambda: _start_listener(handler, file_handler))
+
+    handler.addFilter(SamplingFilter(parse_sampling(LOG_SAMPLING)))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
 
 def get_logger(name):
+    configure_logging()
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL)
     return logger
@@ -0,0 +1,125 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+PREDICT_TIMEOUT = 10.0  # detik, request tidak pernah menunggu selamanya jika thread batch berhenti
+
+
+class MicroBatcher:
+
+    def __init__(self, predict_fn, max_batch_size=64, max_latency_ms=2.0):
+        self.predict_fn = predict_fn            # fungsi batch: X (n, k) -> (probabilities, labels)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._closed = False
+
+    def _ensure_started(self):
+        # dipanggil dengan _lock; thread tidak ikut ter-copy saat proses di-fork (multi worker), jadi dicek per pid
+        if self._worker is None or self._pid != os.getpid() or not self._worker.is_alive():
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._worker.start()
+
+    def submit(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        future = Future()
+
+        # cek closed & put dalam 1 lock dengan close, sehingga tidak ada request yang masuk antrean setelah sentinel
+        with self._lock:
+            if not self._closed:
+                self._ensure_started()
+                self._queue.put((X, future))
+                return future
+
+        # batcher sudah ditutup (predictor lama setelah hot reload) : diproses langsung tanpa menyalakan thread baru
+        try:
+            future.set_result(self.predict_fn(X))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def predict(self, X, timeout=PREDICT_TIMEOUT):
+        return self.submit(X).result(timeout=timeout)
+
+    def close(self):
+        # sentinel : thread berhenti setelah request yang sudah antre selesai diproses
+        with self._lock:
+            self._closed = True
+            if self._worker is not None and self._pid == os.getpid():
+                self._queue.put(None)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        n_rows = len(first[0])
+        deadline = time.monotonic() + self.max_latency
+
+        # tunggu request lain sampai batas ukuran batch atau deadline latency tercapai
+        while n_rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+
+        return batch
+
+    def _drain(self):
+        # request yang masih tertinggal di antrean setelah sentinel tetap diproses, future-nya tidak pernah menggantung
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is not None:
+                batch.append(item)
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                batch = self._drain()
+                if batch:
+                    self._predict_batch(batch)
+                return
+
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch):
+        futures = [future for _, future in batch]
+
+        try:
+            X = np.concatenate([rows for rows, _ in batch]) if len(batch) > 1 else batch[0][0]
+            probabilities, labels = self.predict_fn(X)
+
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        # kembalikan hasil ke masing-masing caller sesuai potongan barisnya
+        start = 0
+        for rows, future in batch:
+            end = start + len(rows)
+            future.set_result((probabilities[start:end], labels[start:end]))
+            start = end
@@ -0,0 +1,209 @@
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.balancing import smote_oversample
+
+logger = get_logger(__name__)
+
+EVALUATION_MODES = ['kfold', 'walk_forward']
+
+
+def binary_metrics(y_true, proba, threshold=0.5, eps=1e-15):
+    # semua metrik dari 1x sort probabilitas : kurva ROC (AUC), confusion matrix di threshold, log-loss
+    y_true = np.asarray(y_true, dtype=np.int8)
+    proba = np.asarray(proba, dtype=np.float64)
+    n_rows = len(y_true)
+    n_pos = int(y_true.sum())
+    n_neg = n_rows - n_pos
+
+    order = np.argsort(-proba, kind='mergesort')
+    sorted_proba = proba[order]
+    tps = np.cumsum(y_true[order], dtype=np.int64)
+    fps = np.arange(1, n_rows + 1) - tps
+
+    # titik kurva hanya di akhir setiap grup probabilitas yang sama (ties)
+    distinct = np.r_[np.flatnonzero(np.diff(sorted_proba)), n_rows - 1]
+    tpr = np.r_[0.0, tps[distinct] / n_pos] if n_pos else None
+    fpr = np.r_[0.0, fps[distinct] / n_neg] if n_neg else None
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)) if tpr is not None and fpr is not None else float('nan')
+
+    # baris dengan probabilitas > threshold diprediksi positif (sama seperti argmax predict_proba)
+    k = int(np.searchsorted(-sorted_proba, -threshold, side='left'))
+    tp = int(tps[k - 1]) if k else 0
+    fp = k - tp
+    fn = n_pos - tp
+    tn = n_neg - fp
+
+    clipped = np.clip(proba, eps, 1 - eps)
+    log_loss = float(-np.mean(y_true * np.log(clipped) + (1 - y_true) * np.log(1 - clipped)))
+
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / n_pos if n_pos else 0.0
+
+    return {
+        'rows': n_rows,
+        'accuracy': (tp + tn) / n_rows if n_rows else float('nan'),
+        'precision': precision,
+        'recall': recall,
+        'f1 score': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'roc_auc': auc,
+        'log_loss': log_loss,
+        'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn
+    }
+
+
+def segment_metrics(y_true, proba, segments, threshold=0.5):
+    # metrik per segmen (mis. market_segment_type), dihitung dari probabilitas yang sama tanpa predict ulang
+    segments = np.asarray(segments)
+    labels, inverse = np.unique(segments, return_inverse=True)
+
+    return {str(label): binary_metrics(np.asarray(y_true)[inverse == i], np.asarray(proba)[inverse == i], threshold) for i, label in enumerate(labels)}
+
+
+def reference_distribution(X, columns, n_bins=10):
+    # distribusi referensi per fitur (batas bin dari quantile data train & proporsi tiap bin) untuk menghitung PSI
+    X = np.asarray(X, dtype=np.float64)
+    reference = {}
+    for j, col in enumerate(columns):
+        # fitur diskrit menghasilkan quantile yang sama, batas bin dibuat unik
+        edges = np.unique(np.quantile(X[:, j], np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, X[:, j], side='right'), minlength=len(edges) + 1)
+        reference[col] = {'edges': edges.tolist(), 'proportions': (counts / len(X)).tolist()}
+    return reference
+
+
+def population_stability_index(reference, X, columns, eps=1e-4):
+    # PSI = sum((actual - expected) * ln(actual / expected)), > 0.2 umumnya dianggap drift yang signifikan
+    X = np.asarray(X, dtype=np.float64)
+    psi = {}
+    for j, col in enumerate(columns):
+        edges = np.asarray(reference[col]['edges'])
+        expected = np.clip(np.asarray(reference[col]['proportions']), eps, None)
+        actual = np.clip(np.bincount(np.searchsorted(edges, X[:, j], side='right'), minlength=len(edges) + 1) / len(X), eps, None)
+        psi[col] = float(np.sum((actual - expected) * np.log(actual / expected)))
+    return psi
+
+
+def kfold_splits(y, n_splits, random_state=42):
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def walk_forward_splits(periods, n_splits):
+    # periode (tahun * 12 + bulan) dibagi menjadi n_splits + 1 blok berurutan,
+    # fold ke-i training di semua blok sebelum blok i + 1 (expanding window) lalu dites di blok i + 1
+    unique_periods = np.unique(periods)
+    if len(unique_periods) < n_splits + 1:
+        raise ValueError(f'walk forward needs at least {n_splits + 1} periods, found {len(unique_periods)}')
+
+    blocks = np.array_split(unique_periods, n_splits + 1)
+
+    splits = []
+    for i in range(1, len(blocks)):
+        train_index = np.flatnonzero(periods <= blocks[i - 1][-1])
+        test_index = np.flatnonzero(np.isin(periods, blocks[i]))
+        splits.append((train_index, test_index))
+
+    return splits
+
+
+def _fit_fold(estimator, X, y, train_index, test_index, oversample, integer_columns):
+    X_train, y_train = X[train_index], y[train_index]
+
+    # oversampling hanya di data train fold, data test fold tidak disentuh
+    if oversample:
+        X_train, y_train = smote_oversample(X_train, y_train, integer_columns=integer_columns)
+
+    model = clone(estimator).fit(X_train, y_train)
+    return test_index, model.predict_proba(X[test_index])[:, 1]
+
+
+class BacktestEvaluator:
+
+    def __init__(self, estimator, mode='kfold', n_splits=5, n_jobs=-1, random_state=42, oversample=False, cache_dir=None):
+        if mode not in EVALUATION_MODES:
+            raise ValueError(f'unknown evaluation mode {mode}, choose one of {EVALUATION_MODES}')
+
+        self.estimator = estimator
+        self.mode = mode
+        self.n_splits = n_splits
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        self.random_state = random_state
+        self.oversample = oversample
+        self.cache_dir = cache_dir
+
+    def _cache_key(self, X, y, periods):
+        digest = hashlib.sha256()
+        for array in (X, y, periods):
+            if array is not None:
+                digest.update(np.ascontiguousarray(array).tobytes())
+
+        params = {key: value for key, value in self.estimator.get_params().items() if key != 'n_jobs'}
+        digest.update(json.dumps([self.mode, self.n_splits, self.random_state, self.oversample, params], sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def out_of_fold(self, X, y, periods=None, integer_columns=None):
+        # return : probabilitas out-of-fold (NaN untuk baris yang tidak pernah dites, mis. blok pertama walk forward) & nomor fold
+        try:
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            y = np.asarray(y)
+
+            cache_path = None
+            if self.cache_dir is not None:
+                cache_path = os.path.join(self.cache_dir, f'oof_{self._cache_key(X, y, periods)}.npz')
+                if os.path.exists(cache_path):
+                    logger.info(f'out of fold predictions restored from {cache_path}')
+                    cached = np.load(cache_path)
+                    return cached['proba'], cached['fold']
+
+            splits = kfold_splits(y, self.n_splits, self.random_state) if self.mode == 'kfold' else walk_forward_splits(np.asarray(periods), self.n_splits)
+
+            # fold dijalankan paralel, masing-masing model memakai 1 thread agar core tidak over-subscribe
+            estimator = clone(self.estimator).set_params(n_jobs=1) if self.n_jobs > 1 else self.estimator
+
+            logger.info(f'running {len(splits)} {self.mode} folds with {self.n_jobs} parallel jobs')
+
+            results = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                delayed(_fit_fold)(estimator, X, y, train_index, test_index, self.oversample, integer_columns)
+                for train_index, test_index in splits
+            )
+
+            proba = np.full(len(y), np.nan)
+            fold = np.full(len(y), -1, dtype=np.int16)
+            for i, (test_index, fold_proba) in enumerate(results):
+                proba[test_index] = fold_proba
+                fold[test_index] = i
+
+            if cache_path is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                np.savez(cache_path, proba=proba, fold=fold)
+
+            return proba, fold
+
+        except Exception as e:
+            logger.error(f'error while running {self.mode} backtest {e}')
+            raise CustomException(f'failed to run {self.mode} backtest', sys)
+
+    def evaluate(self, X, y, periods=None, segments=None, integer_columns=None, threshold=0.5):
+        proba, fold = self.out_of_fold(X, y, periods, integer_columns)
+        y = np.asarray(y)
+
+        tested = fold >= 0
+        report = {
+            'mode': self.mode,
+            'n_splits': self.n_splits,
+            'overall': binary_metrics(y[tested], proba[tested], threshold),
+            'folds': [binary_metrics(y[fold == i], proba[fold == i], threshold) for i in range(fold.max() + 1)]
+        }
+
+        if segments is not None:
+            report['segments'] = segment_metrics(y[tested], proba[tested], np.asarray(segments)[tested], threshold)
+
+        return report
@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import threading
+from datetime import datetime
+import numpy as np
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.batch_prediction import BatchPredictor
+from src.feature_transformer import FeatureTransformer
+from src.tree_engine import CompiledTreeEnsemble
+from src.calibration import ProbabilityCalibrator
+from src.stage_cache import file_digest
+
+logger = get_logger(__name__)
+
+LATEST_FILE = 'LATEST'
+MANIFEST_FILE = 'manifest.json'
+PINS_DIR = '.pins'    # .pins/<versi>/<pemakai>, diawali titik agar tidak terbaca sebagai versi
+
+
+def publish_model_version(registry_dir, artifact_paths, metadata=None, keep_versions=5):
+    # artifact_paths : list path artifact, disalin ke folder versi dengan nama file yang sama
+    try:
+        digest = hashlib.sha256()
+        for path in artifact_paths:
+            digest.update(file_digest(path).encode('ascii'))
+
+        version = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{digest.hexdigest()[:8]}"
+        version_dir = os.path.join(registry_dir, version)
+
+        if os.path.isdir(version_dir):
+            # artifact identik sudah dipublish di detik yang sama, cukup pastikan LATEST menunjuk ke versi ini
+            logger.info('model version %s already exists with identical artifacts', version)
+        else:
+            tmp_dir = os.path.join(registry_dir, f'.{version}.{os.getpid()}.tmp')
+
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+
+            for path in artifact_paths:
+                shutil.copy2(path, os.path.join(tmp_dir, os.path.basename(path)))
+
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump({'version': version, 'files': [os.path.basename(path) for path in artifact_paths], 'metadata': metadata or {}}, f, indent=2, default=str)
+
+            # folder versi & pointer LATEST diganti dengan rename, server tidak pernah membaca versi yang setengah jadi
+            try:
+                os.replace(tmp_dir, version_dir)
+            except OSError:
+                # proses lain mempublish artifact yang sama lebih dulu
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                if not os.path.isdir(version_dir):
+                    raise
+
+        latest_tmp = os.path.join(registry_dir, f'{LATEST_FILE}.{os.getpid()}.tmp')
+        with open(latest_tmp, 'w') as f:
+            f.write(version)
+        os.replace(latest_tmp, os.path.join(registry_dir, LATEST_FILE))
+
+        prune_versions(registry_dir, keep_versions)
+
+        logger.info('model version %s published to %s', version, registry_dir)
+
+        return version
+
+    except Exception as e:
+        logger.error('error while publishing model version %s', e)
+        raise CustomException('failed to publish model version', sys)
+
+
+def _pin_dir(registry_dir, version):
+    return os.path.join(registry_dir, PINS_DIR, version)
+
+
+def pin_version(registry_dir, version, owner):
+    # versi yang masih dipakai (mis. scoring job yang antri / berjalan) tidak ikut dihapus saat pruning
+    os.makedirs(_pin_dir(registry_dir, version), exist_ok=True)
+    open(os.path.join(_pin_dir(registry_dir, version), owner), 'w').close()
+
+
+def unpin_version(registry_dir, version, owner):
+    # folder pin yang kosong dibiarkan, dihapus bersama versinya saat pruning
+    try:
+        os.remove(os.path.join(_pin_dir(registry_dir, version), owner))
+    except FileNotFoundError:
+        pass
+
+
+def is_pinned(registry_dir, version):
+    pin_dir = _pin_dir(registry_dir, version)
+    return os.path.isdir(pin_dir) and len(os.listdir(pin_dir)) > 0
+
+
+def prune_versions(registry_dir, keep_versions):
+    # hanya versi lama di luar keep_versions terakhir yang tidak sedang di-pin yang dihapus
+    versions = sorted(name for name in os.listdir(registry_dir) if os.path.isdir(os.path.join(registry_dir, name)) and not name.startswith('.'))
+    latest = read_latest_version(registry_dir)
+
+    for old_version in versions[:-keep_versions]:
+        if old_version == latest or is_pinned(registry_dir, old_version):
+            logger.info('keeping model version %s, still in use', old_version)
+            continue
+        shutil.rmtree(os.path.join(registry_dir, old_version), ignore_errors=True)
+        shutil.rmtree(_pin_dir(registry_dir, old_version), ignore_errors=True)
+
+
+def read_latest_version(registry_dir):
+    latest_path = os.path.join(registry_dir, LATEST_FILE)
+    if not os.path.exists(latest_path):
+        return None
+
+    with open(latest_path, 'r') as f:
+        return f.read().strip() or None
+
+
+def latest_artifact_paths(registry_dir, artifact_paths):
+    # artifact versi yang sedang dilayani (LATEST), atau artifact_paths jika registry masih kosong
+    version = read_latest_version(registry_dir)
+    if version is None:
+        return list(artifact_paths)
+
+    return [os.path.join(registry_dir, version, os.path.basename(path)) for path in artifact_paths]
+
+
+def publish_if_changed(registry_dir, artifact_paths, metadata=None, keep_versions=5):
+    # versi baru hanya dipublish jika isi artifact berbeda dengan LATEST, mis. setelah stage training di-restore dari cache
+    version = read_latest_version(registry_dir)
+    if version is not None:
+        manifest_path = os.path.join(registry_dir, version, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                published_files = json.load(f)['files']
+
+            current = sorted((os.path.basename(path), file_digest(path)) for path in artifact_paths)
+            published = sorted((name, file_digest(os.path.join(registry_dir, version, name))) for name in published_files)
+            if current == published:
+                logger.info('artifacts are identical to model version %s, nothing to publish', version)
+                return version
+
+    return publish_model_version(registry_dir, artifact_paths, metadata, keep_versions)
+
+
+def load_predictor(model_path, compiled_model_path=None, preprocessor_path=None, calibrator_path=None):
+    # engine numpy hasil compile dipakai jika ada, sehingga lightgbm/sklearn tidak perlu di-import saat serving
+    if compiled_model_path and os.path.exists(compiled_model_path):
+        model = CompiledTreeEnsemble.load(compiled_model_path)
+    else:
+        import joblib
+        model = joblib.load(model_path)
+
+    transformer = FeatureTransformer.load(preprocessor_path) if preprocessor_path and os.path.exists(preprocessor_path) else None
+    calibrator = ProbabilityCalibrator.load(calibrator_path) if calibrator_path and os.path.exists(calibrator_path) else None
+
+    return BatchPredictor(model, transformer=transformer, calibrator=calibrator)
+
+
+class ModelRegistry:
+
+    def __init__(self, registry_dir, artifact_paths, poll_interval=10.0, warmup_rows=64, micro_batching=None, cache=None):
+        self.registry_dir = registry_dir
+        self.artifact_paths = artifact_paths    # (model, compiled model, preprocessor, calibrator) di luar registry, dipakai jika belum ada versi
+        self.poll_interval = poll_interval
+        self.warmup_rows = warmup_rows
+        self.micro_batching = micro_batching    # (max_batch_size, max_latency_ms) atau None
+        self.cache = cache                      # PredictionCache bersama, dikosongkan setiap ganti versi
+
+        self.active = (None, None)              # (versi, predictor) disimpan dalam 1 tuple agar swap atomik
+        self.failed_version = None
+        self.listeners = []
+        self.reloads = 0
+
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._pid = None
+
+    def latest_version(self):
+        return read_latest_version(self.registry_dir)
+
+    def artifact_paths_for(self, version):
+        if version is None or version == 'fallback':
+            return list(self.artifact_paths)
+
+        # nama file di folder versi sama dengan nama file artifact aslinya
+        version_dir = os.path.join(self.registry_dir, version)
+        return [os.path.join(version_dir, os.path.basename(path)) for path in self.artifact_paths]
+
+    def _build(self, version):
+        predictor = load_predictor(*self.artifact_paths_for(version))
+
+        # versi baru di-warm-up dengan 1 batch sebelum menerima traffic
+        predictor.predict_matrix(np.zeros((self.warmup_rows, len(predictor.feature_columns)), dtype=np.float32))
+
+        if self.micro_batching is not None:
+            predictor.enable_micro_batching(*self.micro_batching)
+
+        if self.cache is not None:
+            predictor.enable_cache(self.cache, version or 'fallback')
+
+        return predictor
+
+    def load(self, version=None):
+        try:
+            version = version or self.latest_version()
+            predictor = self._build(version)
+
+            with self._lock:
+                _, old_predictor = self.active
+                # swap atomik : request yang sudah memegang predictor lama tetap selesai dengan versi lama
+                self.active = (version or 'fallback', predictor)
+                self.reloads += 1
+
+            if old_predictor is not None:
+                old_predictor.close()
+
+            # entry versi lama tidak akan pernah cocok lagi, dibuang agar tidak memenuhi cache
+            if self.cache is not None:
+                self.cache.clear()
+
+            for listener in self.listeners:
+                listener(self.version)
+
+            logger.info('model version %s loaded and serving', self.version)
+
+            return self.version
+
+        except Exception as e:
+            self.failed_version = version
+            logger.error('error while loading model version %s %s', version, e)
+            raise CustomException(f'failed to load model version {version}', sys)
+
+    @property
+    def version(self):
+        return self.active[0]
+
+    def current(self):
+        # dipanggil di awal tiap request : (versi, predictor) diambil sekali lalu dipakai sampai request selesai
+        self._ensure_watching()
+        return self.active
+
+    def check_for_update(self):
+        latest = self.latest_version()
+        if latest is None or latest in (self.version, self.failed_version):
+            return False
+
+        logger.info('new model version %s found, current version %s', latest, self.version)
+        self.load(latest)
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.check_for_update()
+            except CustomException:
+                # versi yang gagal dimuat tidak dicoba ulang, server tetap melayani dengan versi sebelumnya
+                logger.warning('keeping model version %s', self.version)
+
+    def _ensure_watching(self):
+        # thread watcher tidak ikut ter-copy saat proses di-fork (gunicorn worker), jadi dicek per pid
+        if self.poll_interval is None or (self._watcher is not None and self._pid == os.getpid() and self._watcher.is_alive()):
+            return
+
+        with self._lock:
+            if self._watcher is None or self._pid != os.getpid() or not self._watcher.is_alive():
+                self._pid = os.getpid()
+                self._watcher = threading.Thread(target=self._watch, name='model-watcher', daemon=True)
+                self._watcher.start()
@@ -1,12 +1,20 @@
 import os
+import numpy as np
 import pandas as pd
 import joblib
 import sys
-from sklearn.model_selection import RandomizedSearchCV
+from sklearn.base import clone
+from sklearn.model_selection import RandomizedSearchCV, train_test_split
 from lightgbm import LGBMClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from src.tree_engine import CompiledTreeEnsemble
+from src.hyperparameter_search import SuccessiveHalvingSearch
+from src.model_registry import publish_model_version
+from src.model_evaluation import BacktestEvaluator, binary_metrics
+from src.feature_transformer import FeatureTransformer
+from src.calibration import ProbabilityCalibrator
+from src.instrumentation import track_stage, stage_records, stage_metrics
 from config.paths_config import *
 from config.model_params import *
 from utils.common_functions import read_yaml, load_data
@@ -19,13 +27,27 @@ logger = get_logger(__name__)
 
 class ModelTraining:
 
-    def __init__(self, train_path, test_path, model_output_path):  # akan mengambil jalur processed/processed_train.csv & processed_test.csv
+    def __init__(self, train_path, test_path, model_output_path, compiled_model_output_path=COMPILED_MODEL_OUTPUT_PATH, config_path=CONFIG_PATH, raw_train_path=TRAIN_FILE_PATH, calibrator_output_path=CALIBRATOR_OUTPUT_PATH):  # akan mengambil jalur processed/processed_train.csv & processed_test.csv
         self.train_path = train_path                             # dan model_output_path akan mengambil jalur tmpt menyimpan model
         self.test_path = test_path
         self.model_output_path = model_output_path
+        self.compiled_model_output_path = compiled_model_output_path
+        self.raw_train_path = raw_train_path                     # data train sebelum preprocessing (masih ada kolom waktu & segmen) untuk backtest
+        self.calibrator_output_path = calibrator_output_path
+
+        self.config = read_yaml(config_path)
+        self.evaluation_config = self.config.get('evaluation', {})
+        self.calibration_config = self.config.get('calibration', {})
+
+        # jika data train tidak di-oversampling, ketidakseimbangan kelas ditangani dengan bobot kelas
+        self.balancing_method = self.config['data_processing'].get('balancing', {}).get('method', 'smote')
+        self.class_weight = 'balanced' if self.balancing_method == 'class_weight' else None
 
         self.params_dist = LIGHTGBM_PARAMS
         self.random_search_params = RANDOM_SEARCH_PARAMS
+        self.search_mode = SEARCH_MODE
+        self.halving_search_params = HALVING_SEARCH_PARAMS
+        self.keep_versions = self.config['serving']['model_registry'].get('keep_versions', 5)
 
     
     def load_and_split_data(self):
@@ -51,11 +73,30 @@ class ModelTraining:
             raise CustomException('failed to load data', sys)
     
 
+    def train_lgbm_halving(self, X_train, y_train):
+        try:
+            logger.info(f'starting successive halving search with {self.halving_search_params}')
+
+            halving_search = SuccessiveHalvingSearch(self.params_dist, class_weight=self.class_weight, **self.halving_search_params)
+            halving_search.fit(X_train, y_train)
+
+            logger.info(f'best parameters are : {halving_search.best_params_}')
+
+            return halving_search.best_estimator_
+
+        except Exception as e:
+            logger.error(f'error while training model with halving search {e}')
+            raise CustomException('failed to train model', sys)
+
+
     def train_lgbm(self, X_train, y_train):
+        if self.search_mode == 'halving':
+            return self.train_lgbm_halving(X_train, y_train)
+
         try:
             logger.info('initializing our model')
 
-            lgbm_model = LGBMClassifier(random_state=self.random_search_params['random_state'])
+            lgbm_model = LGBMClassifier(random_state=self.random_search_params['random_state'], class_weight=self.class_weight)
 
             logger.info('starting our hyperparameter tuning')
 
@@ -92,30 +133,136 @@ class ModelTraining:
         try:
             logger.info('evaluating our model')
 
-            y_pred = model.predict(X_test)
-
-            accuracy = accuracy_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred)
-            recall = recall_score(y_test, y_pred)
-            f1 = f1_score(y_test, y_pred)
+            # 1x predict_proba, semua metrik (termasuk AUC & log-loss) dihitung dari 1x sort probabilitas
+            proba = model.predict_proba(X_test)[:, 1]
+            result = binary_metrics(y_test.to_numpy(), proba, self.evaluation_config.get('threshold', 0.5))
 
-            logger.info(f'accuracy score : {accuracy}')
-            logger.info(f'precision score : {precision}')
-            logger.info(f'recall score : {recall}')
-            logger.info(f'f1 score : {f1}')
+            logger.info(f"accuracy score : {result['accuracy']}")
+            logger.info(f"precision score : {result['precision']}")
+            logger.info(f"recall score : {result['recall']}")
+            logger.info(f"f1 score : {result['f1 score']}")
+            logger.info(f"roc auc : {result['roc_auc']}")
+            logger.info(f"log loss : {result['log_loss']}")
 
-            return {
-                'accuracy': accuracy,
-                'precision': precision,
-                'recall': recall,
-                'f1 score': f1
-            }
+            return {key: result[key] for key in ('accuracy', 'precision', 'recall', 'f1 score', 'roc_auc', 'log_loss')}
 
         except Exception as e:
             logger.error(f'error while evaluating model {e}')
             raise CustomException('failed to evaluate model', sys)
         
 
+    def backtest_model(self, model):
+        try:
+            mode = self.evaluation_config.get('mode', 'kfold')
+            segment_column = self.evaluation_config.get('segment_column', 'market_segment_type')
+
+            logger.info(f'starting {mode} backtest of the best parameters')
+
+            # data train mentah di-transform dengan encoder hasil training, kolom waktu & segmen tetap tersedia
+            transformer = FeatureTransformer.load(PREPROCESSOR_OUTPUT_PATH)
+            raw_df = load_data(self.raw_train_path)
+
+            # baris duplikat dibuang seperti di preprocessing, agar baris yang sama tidak muncul di train & test fold
+            feature_columns = [col for col in raw_df.columns if col not in ('Unnamed: 0', 'Booking_ID')]
+            raw_df = raw_df.loc[~raw_df.duplicated(subset=feature_columns).to_numpy(), feature_columns]
+
+            periods = raw_df['arrival_year'].to_numpy(dtype='int64') * 12 + raw_df['arrival_month'].to_numpy(dtype='int64')
+            segments = raw_df[segment_column].astype(str).to_numpy()
+
+            df = transformer.transform(raw_df.copy())
+            X = df[transformer.selected_features]
+            y = df['booking_status'].to_numpy()
+
+            evaluator = BacktestEvaluator(
+                clone(model),
+                mode=mode,
+                n_splits=self.evaluation_config.get('n_splits', 5),
+                n_jobs=self.evaluation_config.get('n_jobs', -1),
+                oversample=self.balancing_method in ('smote', 'imblearn_smote'),  # sama seperti pipeline : oversampling hanya di data train fold
+                cache_dir=EVALUATION_CACHE_DIR
+            )
+
+            report = evaluator.evaluate(
+                X.to_numpy(dtype='float32'), y,
+                periods=periods,
+                segments=segments,
+                integer_columns=[i for i, col in enumerate(X.columns) if pd.api.types.is_integer_dtype(X[col])],
+                threshold=self.evaluation_config.get('threshold', 0.5)
+            )
+
+            logger.info(f"backtest overall : {report['overall']}")
+            for segment, segment_result in report.get('segments', {}).items():
+                logger.info(f"backtest {segment_column} {segment} : auc {segment_result['roc_auc']:.4f}, f1 {segment_result['f1 score']:.4f}, rows {segment_result['rows']}")
+
+            return report
+
+        except Exception as e:
+            logger.error(f'error while running backtest {e}')
+            raise CustomException('failed to backtest model', sys)
+        
+
+    def calibrate_model(self, model, X_holdout, y_holdout):
+        try:
+            method = self.calibration_config.get('method', 'platt')
+            cost_false_positive = self.calibration_config.get('cost_false_positive', 3.0)
+            cost_false_negative = self.calibration_config.get('cost_false_negative', 1.0)
+
+            logger.info(f'fitting {method} calibrator and cost optimal threshold')
+
+            # kelas positif (Canceled) dicari dari encoder, kelas lainnya dari model
+            transformer = FeatureTransformer.load(PREPROCESSOR_OUTPUT_PATH)
+            positive_label = transformer.mappings()[transformer.target_column].get(self.calibration_config.get('positive_class', 'Canceled'), 0)
+            negative_label = next(int(label) for label in model.classes_ if label != positive_label)
+
+            # data holdout dibagi 2 : setengah untuk fit calibrator & threshold, setengah untuk mengukur hasilnya
+            X_fit, X_eval, y_fit, y_eval = train_test_split(
+                X_holdout, y_holdout,
+                test_size=self.calibration_config.get('evaluation_fraction', 0.5),
+                stratify=y_holdout,
+                random_state=42
+            )
+
+            calibrator = ProbabilityCalibrator.fit(
+                model.predict_proba(X_fit)[:, 1], y_fit.to_numpy(),
+                method=method,
+                positive_label=positive_label,
+                negative_label=negative_label,
+                cost_false_positive=cost_false_positive,
+                cost_false_negative=cost_false_negative
+            )
+
+            raw_proba = model.predict_proba(X_eval)[:, 1]
+            y_positive = (y_eval.to_numpy() == positive_label).astype(np.int64)
+            raw_scores = calibrator.scores(raw_proba)
+            calibrated = calibrator.transform(raw_proba)
+
+            def expected_cost(labels):
+                false_positives = np.sum((labels == positive_label) & (y_positive == 0))
+                false_negatives = np.sum((labels != positive_label) & (y_positive == 1))
+                return float((cost_false_positive * false_positives + cost_false_negative * false_negatives) / len(y_positive))
+
+            calibrator.metrics = {
+                'threshold': calibrator.threshold,
+                'brier_raw': float(np.mean((raw_scores - y_positive) ** 2)),
+                'brier_calibrated': float(np.mean((calibrated - y_positive) ** 2)),
+                'log_loss_raw': binary_metrics(y_positive, raw_scores)['log_loss'],
+                'log_loss_calibrated': binary_metrics(y_positive, calibrated)['log_loss'],
+                'expected_cost_default': expected_cost(np.where(raw_scores >= 0.5, positive_label, negative_label)),
+                'expected_cost_tuned': expected_cost(calibrator.decide(raw_proba))
+            }
+
+            calibrator.save(self.calibrator_output_path)
+
+            logger.info(f'calibration metrics on evaluation half : {calibrator.metrics}')
+            logger.info(f'calibrator saved to {self.calibrator_output_path}')
+
+            return calibrator
+
+        except Exception as e:
+            logger.error(f'error while calibrating model {e}')
+            raise CustomException('failed to calibrate model', sys)
+        
+
     def save_model(self, model):
         try:
             # if not os.path.exists(self.model_output_path):
@@ -134,6 +281,29 @@ class ModelTraining:
             raise CustomException('failed to save model', sys)
         
     
+    def compile_model(self, model, X_check=None):
+        try:
+            logger.info('compiling the model trees into numpy arrays')
+
+            compiled_model = CompiledTreeEnsemble.from_model(model)
+
+            # pastikan hasil engine numpy sama dengan hasil LightGBM sebelum disimpan
+            if X_check is not None:
+                max_diff = abs(compiled_model.predict_proba(X_check.values)[:, 1] - model.predict_proba(X_check)[:, 1]).max()
+                logger.info(f'max probability difference between compiled and lightgbm model : {max_diff}')
+
+                if max_diff > 1e-6:
+                    raise ValueError(f'compiled model does not match lightgbm predictions (max diff {max_diff})')
+
+            compiled_model.save(self.compiled_model_output_path)
+
+            logger.info(f'compiled model saved to {self.compiled_model_output_path}')
+
+        except Exception as e:
+            logger.error(f'error while compiling model {e}')
+            raise CustomException('failed to compile model', sys)
+        
+
     def run(self):
         try:
             with mlflow.start_run():
@@ -145,18 +315,57 @@ class ModelTraining:
                 mlflow.log_artifact(self.train_path, artifact_path='datasets')
                 mlflow.log_artifact(self.test_path, artifact_path='datasets')
 
-                X_train, y_train, X_test, y_test = self.load_and_split_data()
-                best_lgbm_model = self.train_lgbm(X_train, y_train)
-                metrics = self.evaluate_model(best_lgbm_model, X_test, y_test)
-                self.save_model(best_lgbm_model)
+                with track_stage('model_training.load_data') as stage:
+                    X_train, y_train, X_test, y_test = self.load_and_split_data()
+                    stage.rows = len(X_train) + len(X_test)
+
+                with track_stage('model_training.train_lgbm', rows=len(X_train)):
+                    best_lgbm_model = self.train_lgbm(X_train, y_train)
+
+                with track_stage('model_training.evaluate_model', rows=len(X_test)):
+                    metrics = self.evaluate_model(best_lgbm_model, X_test, y_test)
+
+                if self.calibration_config.get('enabled', False):
+                    with track_stage('model_training.calibrate_model', rows=len(X_test)):
+                        calibrator = self.calibrate_model(best_lgbm_model, X_test, y_test)
+                    mlflow.log_metrics({f'calibration {name}': value for name, value in calibrator.metrics.items()})
+                    mlflow.log_artifact(self.calibrator_output_path)
+                elif os.path.exists(self.calibrator_output_path):
+                    os.remove(self.calibrator_output_path)  # calibrator lama tidak cocok dengan model baru
+
+                with track_stage('model_training.save_model'):
+                    self.save_model(best_lgbm_model)
+                    self.compile_model(best_lgbm_model, X_test)
+
+                    # model, model compile & artifact preprocessing dipublish sebagai 1 versi, server memuatnya tanpa restart
+                    model_version = publish_model_version(
+                        MODEL_REGISTRY_DIR,
+                        [path for path in (self.model_output_path, self.compiled_model_output_path, PREPROCESSOR_OUTPUT_PATH, self.calibrator_output_path) if os.path.exists(path)],
+                        metadata={'metrics': metrics, 'run_id': mlflow.active_run().info.run_id},
+                        keep_versions=self.keep_versions
+                    )
+                    mlflow.set_tag('model_version', model_version)
 
                 logger.info('logging the model into mlflow')
                 mlflow.log_artifact(self.model_output_path)
+                mlflow.log_artifact(self.compiled_model_output_path)
 
                 logger.info('logging params and metrics to mlflow')
                 mlflow.log_params(best_lgbm_model.get_params())
                 mlflow.log_metrics(metrics)
 
+                if self.evaluation_config.get('enabled', False):
+                    with track_stage('model_training.backtest_model'):
+                        report = self.backtest_model(best_lgbm_model)
+
+                    metric_names = ('accuracy', 'precision', 'recall', 'f1 score', 'roc_auc', 'log_loss')
+                    mlflow.log_metrics({f"backtest {name}": report['overall'][name] for name in metric_names})
+                    mlflow.log_dict(report, 'evaluation/backtest.json')
+
+                # biaya tiap stage (waktu, cpu, memori, jumlah baris) di proses ini, termasuk ingestion & preprocessing dari training pipeline
+                logger.info('logging stage resource usage to mlflow')
+                mlflow.log_metrics(stage_metrics(stage_records()))
+
                 logger.info('model training successfully completed')
 
         except Exception as e:
@@ -0,0 +1,67 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class PredictionCache:
+
+    # cache LRU + TTL per baris fitur; key = (versi model, bytes baris float32 setelah preprocessing)
+    def __init__(self, max_entries=100000, ttl_seconds=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def row_keys(X, model_version):
+        # + 0.0 menyamakan -0.0 dengan 0.0, sehingga nilai yang sama selalu menghasilkan bytes yang sama
+        X = X + 0.0
+        return [(model_version, row.tobytes()) for row in X]
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = [None] * len(keys)
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+
+                expires_at, value = entry
+                if expires_at < now:
+                    del self._entries[key]
+                    continue
+
+                self._entries.move_to_end(key)
+                found[i] = value
+
+            n_hits = sum(value is not None for value in found)
+            self.hits += n_hits
+            self.misses += len(keys) - n_hits
+
+        return found
+
+    def put_many(self, keys, values):
+        expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import uuid
+import time
+import threading
+import multiprocessing
+import numpy as np
+from functools import partial
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.logger import get_logger
+from src.custom_exception import CustomException
+from src.model_registry import pin_version, unpin_version
+
+logger = get_logger(__name__)
+
+INPUT_FORMATS = ['jsonl', 'parquet']
+ID_COLUMN = 'Booking_ID'
+
+
+def _write_json(path, payload):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)  # status tidak pernah terbaca setengah tertulis
+
+
+def read_status(job_dir):
+    with open(os.path.join(job_dir, 'status.json'), 'r') as f:
+        return json.load(f)
+
+
+def iter_jsonl_batches(path, batch_size):
+    # dibaca per batch baris, file sebesar apapun tidak dimuat sekaligus ke memori
+    total_bytes = os.path.getsize(path)
+    bytes_read = 0
+
+    with open(path, 'rb') as f:
+        while True:
+            lines = list(islice(f, batch_size))
+            if not lines:
+                break
+
+            bytes_read += sum(len(line) for line in lines)
+            records = [json.loads(line) for line in lines if line.strip()]
+
+            yield records, bytes_read / total_bytes if total_bytes else 1.0
+
+
+def iter_parquet_batches(path, batch_size):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    total_rows = parquet_file.metadata.num_rows
+    rows_read = 0
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        rows_read += batch.num_rows
+        yield batch.to_pylist(), rows_read / total_rows if total_rows else 1.0
+
+
+def run_scoring_job(job_dir, artifact_paths, batch_size):
+    # dijalankan di proses terpisah : scoring jutaan baris tidak berebut GIL dengan endpoint interaktif
+    from src.model_registry import load_predictor
+
+    status = read_status(job_dir)
+    status.update({'status': 'running', 'started_at': time.time(), 'pid': os.getpid()})
+    _write_json(os.path.join(job_dir, 'status.json'), status)
+
+    result_path = os.path.join(job_dir, 'results.jsonl')
+    part_path = f'{result_path}.part'
+
+    try:
+        predictor = load_predictor(*artifact_paths)
+        input_path = os.path.join(job_dir, f"input.{status['input_format']}")
+        batches = iter_jsonl_batches(input_path, batch_size) if status['input_format'] == 'jsonl' else iter_parquet_batches(input_path, batch_size)
+
+        row, invalid_rows = 0, 0
+        with open(part_path, 'w') as out:
+            for records, progress in batches:
+                # 1 batch penuh langsung ke model, tanpa micro-batching / cache; baris yang tidak valid ditulis beserta errornya
+                X, valid_rows, errors = predictor.schema.validate(records)
+                probabilities, labels = predictor.predict_matrix(X) if len(valid_rows) else (np.empty(0), np.empty(0, dtype=np.int64))
+                label_names = predictor.transformer.decode_target(labels) if predictor.transformer is not None else labels
+
+                calibrated = predictor.calibrator.transform(probabilities).tolist() if predictor.calibrator is not None else [None] * len(valid_rows)
+
+                # sama seperti /predict/batch : dengan calibrator, probabilitas mentah model ditulis sebagai raw_score
+                score_field = 'raw_score' if predictor.calibrator is not None else 'probability'
+
+                outputs = [{score_field: None, 'cancellation_probability': None, 'prediction': None, 'prediction_label': None} for _ in records]
+                for i, probability, cancellation_probability, label, label_name in zip(valid_rows.tolist(), probabilities.tolist(), calibrated, labels.tolist(), label_names.tolist()):
+                    outputs[i] = {score_field: probability, 'cancellation_probability': cancellation_probability, 'prediction': label, 'prediction_label': label_name}
+                for error in errors:
+                    outputs[error['row']]['errors'] = error['errors']
+
+                lines = []
+                for record, output in zip(records, outputs):
+                    lines.append(json.dumps({'row': row, ID_COLUMN: record.get(ID_COLUMN), **output}))
+                    row += 1
+
+                invalid_rows += len(errors)
+                out.write('\n'.join(lines) + '\n')
+
+                status.update({'rows_done': row, 'invalid_rows': invalid_rows, 'progress': round(progress, 4)})
+                _write_json(os.path.join(job_dir, 'status.json'), status)
+
+        os.replace(part_path, result_path)
+
+        elapsed = time.time() - status['started_at']
+        status.update({'status': 'completed', 'finished_at': time.time(), 'progress': 1.0, 'rows_per_sec': round(row / elapsed) if elapsed > 0 else None})
+        _write_json(os.path.join(job_dir, 'status.json'), status)
+
+        logger.info(f"scoring job {status['job_id']} completed, {row} rows")
+
+    except Exception as e:
+        status.update({'status': 'failed', 'finished_at': time.time(), 'error': str(e)})
+        _write_json(os.path.join(job_dir, 'status.json'), status)
+
+        logger.error(f"scoring job {status['job_id']} failed {e}")
+
+
+class ScoringJobManager:
+
+    def __init__(self, jobs_dir, model_registry, batch_size=10000, max_workers=1):
+        self.jobs_dir = jobs_dir
+        self.model_registry = model_registry
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._pid = None
+        self._generation = 0    # naik setiap pool dibuat ulang, callback job dari pool lama tidak menandai pool baru
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def _ensure_executor(self):
+        # pool proses dibuat per pid (setelah fork gunicorn), proses anak di-spawn agar tidak mewarisi thread worker;
+        # pool yang rusak (proses anak mati, mis. OOM / SIGKILL) tidak bisa dipakai lagi dan juga dibuat ulang
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid() or self._broken:
+                self._pid = os.getpid()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+                self._generation += 1
+                self._broken = False
+            return self._executor, self._generation
+
+    def _mark_broken(self, generation):
+        # pool lama hanya ditandai, diganti di thread request : callback berjalan di thread manager pool yang rusak,
+        # melepas referensi terakhir pool dari thread itu membuat thread manager deadlock
+        with self._lock:
+            if generation == self._generation:
+                self._broken = True
+
+    def _pin(self, job_dir, model_version):
+        # versi model job tidak boleh dihapus pruning registry selama job masih antri / berjalan
+        if model_version not in (None, 'fallback'):
+            pin_version(self.model_registry.registry_dir, model_version, os.path.basename(job_dir))
+
+    def _unpin(self, job_dir, model_version):
+        if model_version not in (None, 'fallback'):
+            unpin_version(self.model_registry.registry_dir, model_version, os.path.basename(job_dir))
+
+    def _on_job_done(self, job_dir, generation, model_version, future):
+        try:
+            self._unpin(job_dir, model_version)
+        except Exception as e:
+            logger.error(f'error while unpinning model version {model_version} for {job_dir} {e}')
+
+        # run_scoring_job menulis status sendiri; di sini hanya job yang prosesnya gagal / mati sebelum sempat menulis status
+        error = 'scoring job was cancelled' if future.cancelled() else future.exception()
+        if error is None:
+            return
+
+        if isinstance(error, BrokenProcessPool):
+            self._mark_broken(generation)
+
+        try:
+            status = read_status(job_dir)
+            if status['status'] in ('completed', 'failed'):
+                return
+
+            status.update({'status': 'failed', 'finished_at': time.time(), 'error': str(error) or type(error).__name__})
+            _write_json(os.path.join(job_dir, 'status.json'), status)
+
+            logger.error(f"scoring job {status['job_id']} failed {status['error']}")
+
+        except Exception as e:
+            logger.error(f'error while marking scoring job {job_dir} as failed {e}')
+
+    def _submit_job(self, job_dir, model_version, artifact_paths):
+        executor, generation = self._ensure_executor()
+        try:
+            future = executor.submit(run_scoring_job, job_dir, artifact_paths, self.batch_size)
+        except BrokenProcessPool:
+            # pool rusak sebelum callback job sebelumnya sempat menandainya, dicoba 1x dengan pool baru
+            self._mark_broken(generation)
+            executor, generation = self._ensure_executor()
+            future = executor.submit(run_scoring_job, job_dir, artifact_paths, self.batch_size)
+
+        future.add_done_callback(partial(self._on_job_done, job_dir, generation, model_version))
+
+    def job_dir(self, job_id):
+        # job id hanya hex uuid, mencegah path traversal dari url
+        if not job_id or not all(c in '0123456789abcdef' for c in job_id):
+            raise ValueError(f'invalid job id {job_id}')
+        return os.path.join(self.jobs_dir, job_id)
+
+    def submit(self, stream, input_format):
+        try:
+            if input_format not in INPUT_FORMATS:
+                raise ValueError(f'unsupported input format {input_format}, choose one of {INPUT_FORMATS}')
+
+            job_id = uuid.uuid4().hex
+            job_dir = self.job_dir(job_id)
+            os.makedirs(job_dir)
+
+            # upload disalin per chunk ke folder job
+            with open(os.path.join(job_dir, f'input.{input_format}'), 'wb') as f:
+                for chunk in iter(lambda: stream.read(1024 * 1024), b''):
+                    f.write(chunk)
+
+            model_version, _ = self.model_registry.current()
+
+            # versi model dikunci saat submit, seluruh file di-score dengan versi yang sama walau ada hot reload
+            status = {
+                'job_id': job_id,
+                'status': 'queued',
+                'input_format': input_format,
+                'model_version': model_version,
+                'batch_size': self.batch_size,
+                'rows_done': 0,
+                'progress': 0.0,
+                'created_at': time.time()
+            }
+            _write_json(os.path.join(job_dir, 'status.json'), status)
+
+            self._pin(job_dir, model_version)
+            try:
+                self._submit_job(job_dir, model_version, self.model_registry.artifact_paths_for(model_version))
+            except Exception:
+                self._unpin(job_dir, model_version)
+                raise
+
+            logger.info(f'scoring job {job_id} submitted with model version {model_version}')
+
+            return status
+
+        except ValueError:
+            raise
+
+        except Exception as e:
+            logger.error(f'error while submitting scoring job {e}')
+            raise CustomException('failed to submit scoring job', sys)
+
+    def status(self, job_id):
+        job_dir = self.job_dir(job_id)
+        if not os.path.exists(os.path.join(job_dir, 'status.json')):
+            return None
+        return read_status(job_dir)
+
+    def result_path(self, job_id):
+        return os.path.join(self.job_dir(job_id), 'results.jsonl')
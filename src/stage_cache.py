@@ -0,0 +1,151 @@
+import os
+import sys
+import ast
+import json
+import shutil
+import hashlib
+from src.logger import get_logger
+from src.custom_exception import CustomException
+
+logger = get_logger(__name__)
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _module_path(module_name, root_dir):
+    path = os.path.join(root_dir, *module_name.split('.'))
+    if os.path.isfile(f'{path}.py'):
+        return f'{path}.py'
+    if os.path.isfile(os.path.join(path, '__init__.py')):
+        return os.path.join(path, '__init__.py')
+    return None
+
+
+def local_module_files(entry_files, root_dir='.'):
+    # semua file python milik project yang di-import (langsung maupun tidak langsung) oleh entry_files,
+    # sehingga perubahan di module mana pun yang dipakai stage ikut mengubah key cache
+    pending = list(entry_files)
+    found = set()
+
+    while pending:
+        path = os.path.normpath(pending.pop())
+        if path in found:
+            continue
+        found.add(path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # from src import logger -> src/logger.py, from src.logger import get_logger -> src/logger.py
+                names = [node.module] + [f'{node.module}.{alias.name}' for alias in node.names]
+            else:
+                continue
+
+            for name in names:
+                module_path = _module_path(name, root_dir)
+                if module_path is not None:
+                    pending.append(module_path)
+
+    return sorted(os.path.relpath(path, root_dir) for path in found)
+
+
+class StageCache:
+
+    def __init__(self, cache_dir, enabled=True):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    def make_key(self, stage, input_files=(), config=None, code_files=(), extra=None):
+        # key = hash dari isi data input, section config, source code stage, dan info tambahan (mis. versi blob gcs)
+        key_source = {
+            'stage': stage,
+            'inputs': {path: file_digest(path) for path in input_files},
+            'config': config,
+            'code': {path: file_digest(path) for path in code_files},
+            'extra': extra
+        }
+
+        encoded = json.dumps(key_source, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def entry_dir(self, stage, key):
+        return os.path.join(self.cache_dir, stage, key)
+
+    def restore(self, stage, key, outputs):
+        entry = self.entry_dir(stage, key)
+        manifest_path = os.path.join(entry, 'manifest.json')
+
+        if not os.path.exists(manifest_path):
+            return False
+
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+        if sorted(manifest['outputs']) != sorted(outputs):
+            return False
+
+        for i, path in enumerate(manifest['outputs']):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            shutil.copy2(os.path.join(entry, str(i)), path)
+
+        return True
+
+    def store(self, stage, key, outputs):
+        missing = [path for path in outputs if not os.path.exists(path)]
+        if missing:
+            logger.warning(f'stage {stage} did not produce {missing}, result is not cached')
+            return
+
+        entry = self.entry_dir(stage, key)
+        tmp_entry = f'{entry}.tmp'
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+
+        for i, path in enumerate(outputs):
+            shutil.copy2(path, os.path.join(tmp_entry, str(i)))
+
+        with open(os.path.join(tmp_entry, 'manifest.json'), 'w') as f:
+            json.dump({'stage': stage, 'key': key, 'outputs': list(outputs)}, f, indent=2)
+
+        # rename di akhir supaya entry cache yang setengah jadi tidak pernah terbaca
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+
+    def run(self, stage, fn, outputs, input_files=(), config=None, code_files=(), extra=None, cacheable=True):
+        # return : True jika output di-restore dari cache (fn tidak dijalankan), False jika stage dijalankan
+        try:
+            if not self.enabled or not cacheable:
+                logger.info(f'running stage {stage} without cache')
+                fn()
+                return False
+
+            key = self.make_key(stage, input_files, config, code_files, extra)
+
+            if self.restore(stage, key, outputs):
+                logger.info(f'stage {stage} restored from cache {key[:12]}')
+                return True
+
+            logger.info(f'cache miss for stage {stage} ({key[:12]}), running stage')
+            fn()
+
+            self.store(stage, key, outputs)
+            logger.info(f'stage {stage} outputs cached under {key[:12]}')
+
+            return False
+
+        except CustomException:
+            raise
+
+        except Exception as e:
+            logger.error(f'error in cached stage {stage} {e}')
+            raise CustomException(f'failed to run stage {stage}', sys)
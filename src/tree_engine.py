@@ -0,0 +1,173 @@
+import os
+import json
+import numpy as np
+
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+
+MISSING_TYPES = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+
+ZERO_THRESHOLD = 1e-35  # sama dengan kZeroThreshold di LightGBM
+
+
+def compile_booster(booster):
+    # ubah semua tree hasil dump_model() menjadi array numpy yang flat
+    model = booster.dump_model()
+
+    objective = model['objective'].split()
+    if objective[0] != 'binary' or model['num_class'] != 1:
+        raise ValueError(f'only binary models are supported, got objective {model["objective"]}')
+
+    sigmoid = 1.0
+    for token in objective[1:]:
+        if token.startswith('sigmoid:'):
+            sigmoid = float(token.split(':')[1])
+
+    feature, threshold, left, right, default_left, missing_type = [], [], [], [], [], []
+    leaf_value = []
+    roots = []
+
+    def add_node(node):
+        if 'leaf_value' in node:
+            leaf_value.append(node['leaf_value'])
+            return ~(len(leaf_value) - 1)  # index negatif = leaf
+
+        if node['decision_type'] != '<=':
+            raise ValueError(f'unsupported decision type {node["decision_type"]}')
+
+        index = len(feature)
+        feature.append(node['split_feature'])
+        threshold.append(node['threshold'])
+        default_left.append(node['default_left'])
+        missing_type.append(MISSING_TYPES[node['missing_type']])
+        left.append(0)
+        right.append(0)
+
+        left[index] = add_node(node['left_child'])
+        right[index] = add_node(node['right_child'])
+        return index
+
+    for tree in model['tree_info']:
+        roots.append(add_node(tree['tree_structure']))
+
+    return {
+        'feature': np.asarray(feature, dtype=np.int32),
+        'threshold': np.asarray(threshold, dtype=np.float64),
+        'left': np.asarray(left, dtype=np.int32),
+        'right': np.asarray(right, dtype=np.int32),
+        'default_left': np.asarray(default_left, dtype=bool),
+        'missing_type': np.asarray(missing_type, dtype=np.int8),
+        'leaf_value': np.asarray(leaf_value, dtype=np.float64),
+        'roots': np.asarray(roots, dtype=np.int32),
+        'meta': np.asarray(json.dumps({
+            'feature_names': model['feature_names'],
+            'sigmoid': sigmoid,
+            'average_output': model['average_output']
+        }))
+    }
+
+
+class CompiledTreeEnsemble:
+
+    def __init__(self, arrays, classes=(0, 1), chunk_size=4096):
+        meta = json.loads(str(arrays['meta']))
+
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.default_left = arrays['default_left']
+        self.missing_type = arrays['missing_type']
+        self.leaf_value = arrays['leaf_value']
+        self.roots = arrays['roots']
+
+        self.feature_name_ = meta['feature_names']
+        self.sigmoid = meta['sigmoid']
+        self.average_output = meta['average_output']
+        self.classes_ = np.asarray(arrays['classes'] if 'classes' in arrays else classes)
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_model(cls, model):
+        arrays = compile_booster(model.booster_)
+        arrays['classes'] = np.asarray(model.classes_)
+        return cls(arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        return cls(arrays)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        np.savez(
+            path,
+            feature=self.feature,
+            threshold=self.threshold,
+            left=self.left,
+            right=self.right,
+            default_left=self.default_left,
+            missing_type=self.missing_type,
+            leaf_value=self.leaf_value,
+            roots=self.roots,
+            classes=self.classes_,
+            meta=np.asarray(json.dumps({
+                'feature_names': self.feature_name_,
+                'sigmoid': self.sigmoid,
+                'average_output': self.average_output
+            }))
+        )
+
+    def _leaf_indices(self, X):
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        flat_X = np.ascontiguousarray(X, dtype=np.float64).ravel()
+
+        # aturan missing value hanya perlu dicek jika ada NaN / split dengan missing_type Zero
+        check_missing = bool(np.isnan(flat_X).any()) or bool((self.missing_type == MISSING_ZERO).any())
+
+        # posisi (baris, tree) di-flatten, semua tree ditelusuri bersamaan level demi level
+        node = np.tile(self.roots, n_rows)
+        offset = np.repeat(np.arange(n_rows) * X.shape[1], n_trees)
+        active = np.flatnonzero(node >= 0)
+
+        while active.size:
+            index = node[active]
+            value = flat_X[offset[active] + self.feature[index]]
+
+            if check_missing:
+                missing_type = self.missing_type[index]
+                is_nan = np.isnan(value)
+                value = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, value)
+
+                use_default = ((missing_type == MISSING_ZERO) & (np.abs(value) <= ZERO_THRESHOLD)) | ((missing_type == MISSING_NAN) & is_nan)
+                go_left = np.where(use_default, self.default_left[index], value <= self.threshold[index])
+            else:
+                go_left = value <= self.threshold[index]
+
+            next_node = np.where(go_left, self.left[index], self.right[index])
+            node[active] = next_node
+            active = active[next_node >= 0]
+
+        return (~node).reshape(n_rows, n_trees)
+
+    def predict_raw(self, X):
+        X = np.asarray(X)
+        raw = np.empty(len(X), dtype=np.float64)
+
+        # diproses per chunk supaya memori (baris x tree) tetap kecil
+        for start in range(0, len(X), self.chunk_size):
+            leaves = self._leaf_indices(X[start:start + self.chunk_size])
+            values = self.leaf_value[leaves]
+            raw[start:start + len(values)] = values.mean(axis=1) if self.average_output else values.sum(axis=1)
+
+        return raw
+
+    def predict_proba(self, X):
+        positive = 1.0 / (1.0 + np.exp(-self.sigmoid * self.predict_raw(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
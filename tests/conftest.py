@@ -0,0 +1,20 @@
+import pytest
+from src.feature_transformer import FeatureTransformer
+from benchmarks.synthetic_data import generate_bookings
+
+CATEGORICAL_COLUMNS = ['type_of_meal_plan', 'room_type_reserved', 'market_segment_type', 'booking_status']
+NUMERICAL_COLUMNS = ['lead_time', 'avg_price_per_room', 'no_of_special_requests', 'arrival_month']
+FEATURES = ['lead_time', 'avg_price_per_room', 'no_of_special_requests', 'arrival_month', 'type_of_meal_plan', 'room_type_reserved', 'market_segment_type']
+
+
+@pytest.fixture(scope='session')
+def raw_df():
+    # data booking sintetis yang sama dengan benchmark, tanpa perlu file raw dari bucket
+    return generate_bookings(3000, seed=1)
+
+
+@pytest.fixture(scope='session')
+def transformer(raw_df):
+    transformer = FeatureTransformer(CATEGORICAL_COLUMNS, NUMERICAL_COLUMNS, skewness_threshold=5).fit(raw_df)
+    transformer.selected_features = FEATURES
+    return transformer
@@ -0,0 +1,111 @@
+import os
+import json
+import numpy as np
+import pytest
+from src.blob_storage import BlobDownloader, LocalBackend, md5_base64
+from src.custom_exception import CustomException
+
+CHUNK_SIZE = 1024
+
+
+class CountingBackend(LocalBackend):
+
+    # mencatat range yang dibaca, dan bisa dibuat gagal setelah n chunk untuk mensimulasikan download yang terputus
+    def __init__(self, root_dir, fail_after=None):
+        super().__init__(root_dir)
+        self.reads = []
+        self.fail_after = fail_after
+
+    def read_range(self, name, start, end, generation=None):
+        if self.fail_after is not None and len(self.reads) >= self.fail_after:
+            raise ConnectionError('connection reset')
+        self.reads.append(start)
+        return super().read_range(name, start, end, generation)
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    root = tmp_path / 'bucket'
+    root.mkdir()
+    data = np.random.default_rng(0).bytes(CHUNK_SIZE * 10 + 100)   # 11 chunk, chunk terakhir tidak penuh
+    (root / 'raw.csv').write_bytes(data)
+    return str(root), data
+
+
+def test_download_resumes_a_partial_file(bucket, tmp_path):
+    root, data = bucket
+    cache_dir = str(tmp_path / 'cache')
+    destination = str(tmp_path / 'out' / 'raw.csv')
+
+    failing = BlobDownloader(CountingBackend(root, fail_after=4), cache_dir, chunk_size=CHUNK_SIZE, max_workers=1)
+    with pytest.raises(CustomException):
+        failing.download('raw.csv', destination)
+
+    info = failing.backend.stat('raw.csv')
+    cache_path = failing.cache_path(info)
+    with open(f'{cache_path}.progress') as f:
+        assert sorted(json.load(f)['done']) == [0, 1, 2, 3]
+
+    backend = CountingBackend(root)
+    BlobDownloader(backend, cache_dir, chunk_size=CHUNK_SIZE, max_workers=4).download('raw.csv', destination)
+
+    # hanya chunk yang belum ada yang dibaca ulang
+    assert sorted(backend.reads) == [i * CHUNK_SIZE for i in range(4, 11)]
+    with open(destination, 'rb') as f:
+        assert f.read() == data
+    assert not os.path.exists(f'{cache_path}.part')
+    assert not os.path.exists(f'{cache_path}.progress')
+
+
+def test_corrupted_partial_download_is_discarded(bucket, tmp_path):
+    root, data = bucket
+    cache_dir = str(tmp_path / 'cache')
+    destination = str(tmp_path / 'raw.csv')
+
+    failing = BlobDownloader(CountingBackend(root, fail_after=4), cache_dir, chunk_size=CHUNK_SIZE, max_workers=1)
+    with pytest.raises(CustomException):
+        failing.download('raw.csv', destination)
+
+    # chunk yang sudah tercatat selesai rusak di disk : md5 tidak cocok, file .part dibuang
+    cache_path = failing.cache_path(failing.backend.stat('raw.csv'))
+    with open(f'{cache_path}.part', 'r+b') as f:
+        f.write(b'\x00' * 16)
+
+    with pytest.raises(CustomException):
+        BlobDownloader(LocalBackend(root), cache_dir, chunk_size=CHUNK_SIZE).download('raw.csv', destination)
+    assert not os.path.exists(f'{cache_path}.part')
+
+    BlobDownloader(LocalBackend(root), cache_dir, chunk_size=CHUNK_SIZE).download('raw.csv', destination)
+    with open(destination, 'rb') as f:
+        assert f.read() == data
+
+
+def test_new_generation_invalidates_the_cache(bucket, tmp_path):
+    root, data = bucket
+    cache_dir = str(tmp_path / 'cache')
+    destination = str(tmp_path / 'raw.csv')
+
+    backend = CountingBackend(root)
+    downloader = BlobDownloader(backend, cache_dir, chunk_size=CHUNK_SIZE)
+    first = downloader.download('raw.csv', destination)
+
+    # generation sama : dilayani dari cache tanpa membaca bucket
+    backend.reads.clear()
+    assert downloader.download('raw.csv', destination) == first
+    assert backend.reads == []
+
+    # blob ditimpa (generation = mtime di LocalBackend) : cache lama tidak dipakai
+    new_data = data[::-1]
+    path = os.path.join(root, 'raw.csv')
+    with open(path, 'wb') as f:
+        f.write(new_data)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+
+    second = downloader.download('raw.csv', destination)
+
+    assert second.generation != first.generation
+    assert downloader.cache_path(second) != downloader.cache_path(first)
+    assert len(backend.reads) == 11
+    assert second.md5 == md5_base64(destination)
+    with open(destination, 'rb') as f:
+        assert f.read() == new_data
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from src.calibration import ProbabilityCalibrator, optimal_threshold
+from src.batch_prediction import BatchPredictor
+
+
+def brute_force_threshold(y, proba, cost_false_positive, cost_false_negative):
+    # evaluasi langsung setiap kandidat threshold (semua nilai unik + "tidak ada yang positif")
+    best_threshold, best_cost = None, None
+    for threshold in np.r_[np.unique(proba), np.inf]:
+        predicted = proba >= threshold
+        cost = cost_false_positive * np.sum(predicted & (y == 0)) + cost_false_negative * np.sum(~predicted & (y == 1))
+        if best_cost is None or cost < best_cost:
+            best_threshold, best_cost = threshold, cost
+    return best_threshold, best_cost / len(y)
+
+
+@pytest.mark.parametrize('decimals', [None, 2], ids=['continuous', 'ties'])
+@pytest.mark.parametrize('costs', [(3.0, 1.0), (1.0, 1.0), (1.0, 5.0), (100.0, 1.0)])
+def test_optimal_threshold_matches_brute_force(decimals, costs):
+    rng = np.random.default_rng(0)
+    y = (rng.random(2000) < 0.3).astype(np.int64)
+    proba = np.clip(0.3 * y + rng.random(2000) * 0.7, 0.0, 1.0)
+    if decimals is not None:
+        proba = np.round(proba, decimals)
+
+    threshold, cost = optimal_threshold(y, proba, *costs)
+    expected_threshold, expected_cost = brute_force_threshold(y, proba, *costs)
+
+    assert cost == pytest.approx(expected_cost)
+    assert threshold == expected_threshold
+
+
+def test_optimal_threshold_can_predict_nothing():
+    # false positive sangat mahal : lebih murah tidak memprediksi positif sama sekali
+    y = np.array([0, 1, 0, 0])
+    proba = np.array([0.9, 0.8, 0.7, 0.1])
+
+    threshold, cost = optimal_threshold(y, proba, 100.0, 1.0)
+
+    assert threshold == np.inf
+    assert cost == pytest.approx(0.25)
+
+
+@pytest.fixture(scope='module')
+def calibration_data():
+    # probabilities = P(kelas 1 = Not_Canceled), kelas positif (Canceled = 0) cenderung punya proba rendah
+    rng = np.random.default_rng(1)
+    y = (rng.random(4000) < 0.65).astype(np.int64)
+    probabilities = np.clip(0.4 * y + rng.random(4000) * 0.6, 0.0, 1.0)
+    return probabilities, y
+
+
+@pytest.mark.parametrize('method', ['platt', 'isotonic'])
+@pytest.mark.parametrize('positive_label', [0, 1])
+def test_score_cutoff_matches_calibrated_threshold(calibration_data, method, positive_label):
+    probabilities, y = calibration_data
+    calibrator = ProbabilityCalibrator.fit(probabilities, y, method=method, positive_label=positive_label, negative_label=1 - positive_label)
+
+    # skor training (tepat di knot) dan skor baru, termasuk batas 0 & 1
+    rng = np.random.default_rng(2)
+    candidates = np.r_[probabilities, rng.random(4000), 0.0, 1.0]
+
+    calibrated_positive = calibrator.transform(candidates) >= calibrator.threshold
+    decided_positive = calibrator.decide(candidates) == positive_label
+
+    np.testing.assert_array_equal(decided_positive, calibrated_positive)
+
+
+def test_save_load_keeps_cutoff(calibration_data, tmp_path):
+    probabilities, y = calibration_data
+    calibrator = ProbabilityCalibrator.fit(probabilities, y, method='isotonic')
+
+    path = str(tmp_path / 'calibrator.json')
+    calibrator.save(path)
+    loaded = ProbabilityCalibrator.load(path)
+
+    assert loaded.score_cutoff == calibrator.score_cutoff
+    np.testing.assert_array_equal(loaded.decide(probabilities), calibrator.decide(probabilities))
+
+
+class FakeModel:
+
+    classes_ = np.array([0, 1])
+    feature_name_ = ['lead_time', 'avg_price_per_room']
+
+    def predict_proba(self, X):
+        p = np.clip(X[:, 0] / 300.0, 0.0, 1.0)
+        return np.c_[1 - p, p]
+
+
+def test_batch_predictor_labels_follow_calibrated_probability(calibration_data):
+    probabilities, y = calibration_data
+    calibrator = ProbabilityCalibrator.fit(probabilities, y, method='platt')
+    predictor = BatchPredictor(FakeModel(), calibrator=calibrator)
+
+    records = [{'lead_time': float(lead_time), 'avg_price_per_room': 100.0} for lead_time in range(0, 300, 3)]
+    result = predictor.predict_records(records)
+
+    # skor mentah tidak dilaporkan sebagai probabilitas, label konsisten dengan probabilitas terkalibrasi
+    assert 'probabilities' not in result
+    assert len(result['raw_scores']) == len(records)
+    canceled = np.asarray(result['cancellation_probabilities']) >= result['decision_threshold']
+    np.testing.assert_array_equal(np.asarray(result['predictions']) == 0, canceled)
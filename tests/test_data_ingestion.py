@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src.data_ingestion as data_ingestion
+from src.data_ingestion import DataIngestion
+from utils.common_functions import read_yaml, load_data, ArtifactWriter
+from config.paths_config import CONFIG_PATH
+from benchmarks.synthetic_data import generate_bookings
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    raw = generate_bookings(40, seed=3)
+
+    # chunk awal sempit : harga bulat (dibaca int64) & lead_time kecil, chunk berikutnya butuh float & int16
+    raw.loc[:4, 'avg_price_per_room'] = 65
+    raw.loc[:4, 'lead_time'] = 3
+    raw.loc[30:, 'lead_time'] = 400
+
+    path = str(tmp_path / 'raw.csv')
+    raw.to_csv(path, index=False)
+    return raw, path
+
+
+@pytest.mark.parametrize('extension', ['parquet', 'feather'])
+def test_split_data_streaming_with_empty_partition_chunks(raw_csv, tmp_path, monkeypatch, extension):
+    raw, raw_path = raw_csv
+    train_path = str(tmp_path / f'train.{extension}')
+    test_path = str(tmp_path / f'test.{extension}')
+    monkeypatch.setattr(data_ingestion, 'RAW_FILE_PATH', raw_path)
+    monkeypatch.setattr(data_ingestion, 'TRAIN_FILE_PATH', train_path)
+    monkeypatch.setattr(data_ingestion, 'TEST_FILE_PATH', test_path)
+
+    config = read_yaml(CONFIG_PATH)
+    config['data_ingestion'].update({'storage_backend': 'local', 'local_storage_dir': str(tmp_path / 'bucket')})
+    monkeypatch.chdir(tmp_path)     # DataIngestion membuat folder raw relatif terhadap cwd
+    ingestion = DataIngestion(config)
+    ingestion.chunk_size = 1        # setiap chunk hanya masuk ke 1 partisi, partisi lain mendapat chunk kosong
+
+    ingestion.split_data_streaming()
+
+    train, test = load_data(train_path), load_data(test_path)
+    assert len(train) + len(test) == len(raw)
+    assert len(train) > 0 and len(test) > 0
+
+    # tipe mengikuti config/data_schema.py, bukan nilai chunk pertama
+    assert train['avg_price_per_room'].dtype == np.float32
+    assert train['lead_time'].dtype == np.int16
+    assert test.dtypes.equals(train.dtypes)
+
+    combined = pd.concat([train, test]).sort_values('Booking_ID').reset_index(drop=True)
+    expected = raw.sort_values('Booking_ID').reset_index(drop=True)
+    np.testing.assert_allclose(combined['avg_price_per_room'], expected['avg_price_per_room'], rtol=1e-6)
+    assert combined['lead_time'].tolist() == expected['lead_time'].tolist()
+    assert combined['booking_status'].tolist() == expected['booking_status'].tolist()
+
+
+def test_artifact_writer_rejects_values_outside_schema(tmp_path):
+    with pytest.raises(Exception):
+        with ArtifactWriter(str(tmp_path / 'data.parquet')) as writer:
+            writer.write(pd.DataFrame({'no_of_adults': [1, 2]}))
+            writer.write(pd.DataFrame({'no_of_adults': [1000]}))    # tidak muat di int8
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from src.feature_schema import FeatureSchema
+
+
+@pytest.fixture
+def schema(transformer):
+    return FeatureSchema.from_transformer(transformer.selected_features, transformer)
+
+
+@pytest.fixture
+def valid_record(raw_df, transformer):
+    return raw_df[transformer.selected_features].to_dict('records')[0]
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('lead_time', 5000, 'must be <= 1000'),
+    ('arrival_month', 0, 'must be >= 1'),
+    ('market_segment_type', 'Space Station', 'unknown category'),
+    ('lead_time', 10 ** 400, 'not a number'),
+    ('lead_time', True, 'not a number'),
+    ('avg_price_per_room', False, 'not a number'),
+    ('avg_price_per_room', 'abc', 'not a number'),
+    ('avg_price_per_room', float('inf'), 'must be finite'),
+    ('no_of_special_requests', 1.5, 'must be an integer'),
+    ('lead_time', None, 'missing value'),
+], ids=['above_max', 'below_min', 'unknown_category', 'overflow', 'bool_true', 'bool_false', 'string', 'infinite', 'fractional_integer', 'missing'])
+def test_schema_rejects_invalid_values(schema, valid_record, field, value, message):
+    X, valid_rows, errors = schema.validate([valid_record, {**valid_record, field: value}])
+
+    assert valid_rows.tolist() == [0]
+    assert len(X) == 1
+    assert errors == [{'row': 1, 'errors': [{'field': field, 'error': message}]}]
+
+
+def test_schema_accepts_valid_record(schema, transformer, valid_record):
+    X, valid_rows, errors = schema.validate([valid_record])
+
+    assert valid_rows.tolist() == [0]
+    assert errors == []
+    np.testing.assert_allclose(X[0], transformer.transform_records([valid_record])[0])
+
+
+def test_schema_accepts_numeric_strings_and_category_codes(schema, transformer, valid_record):
+    code = transformer.categories['market_segment_type'].index(valid_record['market_segment_type'])
+    record = {**valid_record, 'lead_time': str(valid_record['lead_time']), 'market_segment_type': code}
+
+    X, valid_rows, errors = schema.validate([valid_record, record])
+
+    assert valid_rows.tolist() == [0, 1]
+    assert errors == []
+    np.testing.assert_array_equal(X[0], X[1])
@@ -0,0 +1,34 @@
+import numpy as np
+from src.feature_transformer import FeatureTransformer
+
+
+def test_feature_transformer_json_round_trip(transformer, raw_df, tmp_path):
+    path = str(tmp_path / 'preprocessor.json')
+    transformer.save(path)
+    loaded = FeatureTransformer.load(path)
+
+    assert loaded.to_dict() == transformer.to_dict()
+
+    features = transformer.selected_features
+    expected = transformer.transform(raw_df.copy())
+    result = loaded.transform(raw_df.copy())
+    np.testing.assert_array_equal(result[features].to_numpy(), expected[features].to_numpy())
+
+    for column in transformer.categorical_columns:
+        labels = transformer.categories[column]
+        np.testing.assert_array_equal(loaded.lookup_codes(column, labels), np.arange(len(labels), dtype=np.float32))
+
+
+def test_unknown_category_is_encoded_as_minus_one(transformer, raw_df):
+    df = raw_df.head(3).copy()
+    df['room_type_reserved'] = ['Room_Type 99', df['room_type_reserved'].iloc[1], None]
+
+    codes = transformer.transform(df)['room_type_reserved'].tolist()
+
+    assert codes[0] == -1 and codes[2] == -1
+    assert transformer.categories['room_type_reserved'][codes[1]] == raw_df['room_type_reserved'].iloc[1]
+
+
+def test_decode_target_inverts_encoding(transformer, raw_df):
+    codes = transformer.transform(raw_df.copy())['booking_status'].to_numpy()
+    np.testing.assert_array_equal(transformer.decode_target(codes), raw_df['booking_status'].to_numpy())
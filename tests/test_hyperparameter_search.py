@@ -0,0 +1,87 @@
+import numpy as np
+import lightgbm as lgb
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.model_selection import ParameterSampler
+from src.hyperparameter_search import SuccessiveHalvingSearch
+
+PARAM_DISTRIBUTIONS = {
+    'num_leaves': [4, 8, 16, 31],
+    'learning_rate': [0.01, 0.05, 0.1, 0.3],
+    'min_child_samples': [5, 20, 50],
+    'n_estimators': [40, 80]
+}
+
+
+@pytest.fixture(scope='module')
+def data():
+    return make_classification(n_samples=600, n_features=8, n_informative=4, random_state=0)
+
+
+def rung_zero_scores(search, X, y):
+    # skor setiap kandidat setelah min_rounds, dihitung ulang tanpa logika halving
+    candidates = list(ParameterSampler(search.param_distributions, n_iter=search.n_candidates, random_state=search.random_state))
+    folds = search._build_folds(X, y)
+
+    scores, maximize = [], None
+    for candidate in candidates:
+        fold_scores = []
+        for train_data, valid_data in folds:
+            booster = lgb.Booster(params=search._booster_params(candidate), train_set=train_data)
+            booster.add_valid(valid_data, 'valid')
+            for _ in range(search.min_rounds):
+                booster.update()
+            _, _, score, maximize = booster.eval_valid()[0][:4]
+            fold_scores.append(score)
+        scores.append(np.mean(fold_scores))
+
+    return candidates, np.asarray(scores), maximize
+
+
+@pytest.mark.parametrize('metric', ['auc', 'binary_logloss'])
+def test_winner_is_best_candidate(data, metric):
+    X, y = data
+    # eta besar : hanya 1 kandidat yang lolos dari rung 0, jadi pemenang = kandidat terbaik di rung 0
+    search = SuccessiveHalvingSearch(PARAM_DISTRIBUTIONS, n_candidates=8, min_rounds=5, eta=10, cv=2, n_jobs=2, metric=metric)
+    search.fit(X, y)
+
+    candidates, scores, maximize = rung_zero_scores(search, X, y)
+    best = int(np.argmax(scores)) if maximize else int(np.argmin(scores))
+
+    winner = {key: value for key, value in search.best_params_.items() if key != 'n_estimators'}
+    expected = {key: value for key, value in candidates[best].items() if key != 'n_estimators'}
+    assert winner == expected
+    assert search.history_[0]['best_score'] == pytest.approx(scores[best])
+
+
+def test_records_real_rounds_when_boosting_stops_early(data):
+    X, y = data
+    # tidak ada leaf yang memenuhi min_child_samples : LightGBM berhenti setelah 1 round
+    search = SuccessiveHalvingSearch({'min_child_samples': [100000], 'n_estimators': [50]}, n_candidates=1, min_rounds=10, cv=2, n_jobs=1)
+    search.fit(X, y)
+
+    assert search.best_params_['n_estimators'] == 1
+
+
+def test_eliminated_boosters_are_released(data, monkeypatch):
+    X, y = data
+    live, peak = [0], [0]
+
+    class CountingBooster(lgb.Booster):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            live[0] += 1
+            peak[0] = max(peak[0], live[0])
+
+        def __del__(self):
+            live[0] -= 1
+            super().__del__()
+
+    monkeypatch.setattr(lgb, 'Booster', CountingBooster)
+
+    search = SuccessiveHalvingSearch(PARAM_DISTRIBUTIONS, n_candidates=12, min_rounds=3, eta=3, cv=2, n_jobs=1)
+    search.fit(X, y)
+
+    # booster tidak dibuat sekaligus untuk semua kandidat x fold
+    assert peak[0] < 12 * 2
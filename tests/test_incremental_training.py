@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+import src.incremental_training as incremental_training
+from src.incremental_training import IncrementalTrainer, raw_file_position
+from utils.common_functions import read_yaml
+from config.paths_config import CONFIG_PATH
+
+
+@pytest.fixture
+def trainer(tmp_path, monkeypatch):
+    raw_path = str(tmp_path / 'raw.csv')
+    monkeypatch.setattr(incremental_training, 'RAW_FILE_PATH', raw_path)
+
+    config = read_yaml(CONFIG_PATH)
+    monkeypatch.chdir(tmp_path)     # DataIngestion membuat folder raw relatif terhadap cwd
+
+    trainer = IncrementalTrainer(config, state_path=str(tmp_path / 'training_state.json'))
+    trainer.chunk_size = 3          # beberapa chunk, watermark jatuh di tengah chunk
+    return trainer, raw_path
+
+
+def write_raw(path, booking_ids, mode='w'):
+    pd.DataFrame({'Booking_ID': booking_ids, 'lead_time': range(len(booking_ids))}).to_csv(path, mode=mode, header=mode == 'w', index=False)
+
+
+def test_read_delta_returns_rows_appended_after_the_offset(trainer):
+    trainer, raw_path = trainer
+
+    # id tidak berurutan & tanpa angka di akhir : watermark tidak bergantung format Booking_ID
+    write_raw(raw_path, ['B-9', 'A-1', 'x', 'INN7', 'C'])
+    row_offset, last_booking_id = raw_file_position(raw_path, trainer.chunk_size)
+    assert (row_offset, last_booking_id) == (5, 'C')
+
+    write_raw(raw_path, ['Z', 'AA', '00'], mode='a')
+    delta = trainer.read_delta(row_offset, last_booking_id)
+
+    assert delta['Booking_ID'].tolist() == ['Z', 'AA', '00']
+    assert trainer.read_delta(8, '00').empty
+
+
+def test_read_delta_detects_a_rewritten_raw_file(trainer):
+    trainer, raw_path = trainer
+
+    write_raw(raw_path, ['a', 'b', 'c', 'd'])
+    row_offset, last_booking_id = raw_file_position(raw_path, trainer.chunk_size)
+
+    write_raw(raw_path, ['a', 'b', 'x', 'y', 'z'])
+    assert trainer.read_delta(row_offset, last_booking_id) is None
+
+    write_raw(raw_path, ['a', 'b'])
+    assert trainer.read_delta(row_offset, last_booking_id) is None
@@ -0,0 +1,40 @@
+import queue
+import logging
+import pytest
+from src.logger import DeferredQueueHandler
+
+
+@pytest.fixture
+def queued_logger():
+    records = queue.SimpleQueue()
+    logger = logging.getLogger('tests.deferred_queue')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    handler = DeferredQueueHandler(records)
+    logger.addHandler(handler)
+    yield logger, records
+    logger.removeHandler(handler)
+
+
+def test_mutable_args_are_formatted_when_logged(queued_logger):
+    logger, records = queued_logger
+    record = {'stage': 'split', 'rows': 10}
+
+    logger.info('stage %s finished : %s', 'split', record)
+    record['rows'] = 99     # berubah sebelum listener sempat menulis
+
+    queued = records.get_nowait()
+    assert queued.getMessage() == "stage split finished : {'stage': 'split', 'rows': 10}"
+    assert queued.args is None
+
+
+def test_primitive_args_stay_lazy(queued_logger):
+    logger, records = queued_logger
+
+    logger.info('model version %s loaded in %.2f s', '20260101-abc', 1.5)
+
+    queued = records.get_nowait()
+    assert queued.msg == 'model version %s loaded in %.2f s'
+    assert queued.args == ('20260101-abc', 1.5)
+    assert queued.getMessage() == 'model version 20260101-abc loaded in 1.50 s'
@@ -0,0 +1,83 @@
+import threading
+import numpy as np
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from src.micro_batcher import MicroBatcher
+
+
+def linear_model(X):
+    scores = (X * np.array([0.3, -0.2, 0.1], dtype=np.float32)).sum(axis=1)  # per baris, tidak bergantung ukuran batch
+    return scores, (scores > 0).astype(np.int64)
+
+
+class RecordingModel:
+
+    # mencatat ukuran tiap batch; batch pertama ditahan sampai semua request sudah antre
+    def __init__(self, fn, gate=None):
+        self.fn = fn
+        self.gate = gate
+        self.batch_sizes = []
+
+    def __call__(self, X):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batch_sizes.append(len(X))
+        return self.fn(X)
+
+
+def test_batched_results_equal_unbatched():
+    rng = np.random.default_rng(0)
+    requests = [rng.normal(size=(rng.integers(1, 4), 3)).astype(np.float32) for _ in range(300)]
+
+    model = RecordingModel(linear_model)
+    batcher = MicroBatcher(model, max_batch_size=32, max_latency_ms=5)
+
+    with ThreadPoolExecutor(32) as executor:
+        results = list(executor.map(batcher.predict, requests))
+
+    for X, (scores, labels) in zip(requests, results):
+        expected_scores, expected_labels = linear_model(X)
+        np.testing.assert_array_equal(scores, expected_scores)
+        np.testing.assert_array_equal(labels, expected_labels)
+
+    # request digabung : jumlah panggilan model lebih sedikit dari jumlah request, tidak ada baris yang hilang
+    assert len(model.batch_sizes) < len(requests)
+    assert sum(model.batch_sizes) == sum(len(X) for X in requests)
+    batcher.close()
+
+
+def test_exception_reaches_every_waiting_future():
+    gate = threading.Event()
+
+    def failing(X):
+        raise RuntimeError('model failed')
+
+    model = RecordingModel(failing, gate)
+    batcher = MicroBatcher(model, max_batch_size=64, max_latency_ms=50)
+
+    futures = [batcher.submit(np.zeros((1, 3), dtype=np.float32)) for _ in range(20)]
+    gate.set()
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match='model failed'):
+            future.result(timeout=5)
+
+    # thread batch tetap hidup setelah error, request berikutnya tetap dilayani
+    batcher.predict_fn = RecordingModel(linear_model)
+    scores, _ = batcher.predict(np.ones((1, 3), dtype=np.float32), timeout=5)
+    np.testing.assert_allclose(scores, [0.2], rtol=1e-6)
+    batcher.close()
+
+
+def test_requests_after_close_are_answered_inline():
+    model = RecordingModel(linear_model)
+    batcher = MicroBatcher(model)
+    batcher.predict(np.ones((1, 3), dtype=np.float32), timeout=5)
+
+    batcher.close()
+    batcher._worker.join(5)
+    assert not batcher._worker.is_alive()
+
+    scores, _ = batcher.predict(np.ones((2, 3), dtype=np.float32), timeout=5)
+    assert len(scores) == 2
+    assert not batcher._worker.is_alive()   # tidak ada thread baru untuk predictor yang sudah dipensiunkan
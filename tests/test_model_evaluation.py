@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.metrics import accuracy_score, f1_score, log_loss, precision_score, recall_score, roc_auc_score, confusion_matrix
+from src.model_evaluation import binary_metrics
+
+
+def sklearn_metrics(y, proba, threshold):
+    y_pred = (proba > threshold).astype(int)
+    tn, fp, fn, tp = confusion_matrix(y, y_pred, labels=[0, 1]).ravel()
+    return {
+        'accuracy': accuracy_score(y, y_pred),
+        'precision': precision_score(y, y_pred, zero_division=0),
+        'recall': recall_score(y, y_pred, zero_division=0),
+        'f1 score': f1_score(y, y_pred, zero_division=0),
+        'roc_auc': roc_auc_score(y, proba),
+        'log_loss': log_loss(y, proba, labels=[0, 1]),
+        'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn
+    }
+
+
+@pytest.mark.parametrize('decimals', [None, 2, 1], ids=['continuous', 'ties', 'heavy_ties'])
+@pytest.mark.parametrize('threshold', [0.5, 0.3])
+def test_binary_metrics_match_sklearn(decimals, threshold):
+    rng = np.random.default_rng(0)
+    y = (rng.random(5000) < 0.35).astype(int)
+    proba = np.clip(0.35 * y + rng.random(5000) * 0.65, 0.001, 0.999)
+
+    # skor dibulatkan : banyak probabilitas yang sama (ties), termasuk tepat di threshold
+    if decimals is not None:
+        proba = np.clip(np.round(proba, decimals), 0.001, 0.999)
+
+    result = binary_metrics(y, proba, threshold)
+    expected = sklearn_metrics(y, proba, threshold)
+
+    assert result['rows'] == len(y)
+    for name, value in expected.items():
+        assert result[name] == pytest.approx(value, abs=1e-12), name
+
+
+def test_binary_metrics_all_scores_tied():
+    y = np.array([0, 1, 0, 1, 1])
+    proba = np.full(5, 0.7)
+
+    result = binary_metrics(y, proba)
+
+    assert result['roc_auc'] == pytest.approx(0.5)
+    assert (result['tp'], result['fp']) == (3, 2)
+
+
+def test_binary_metrics_single_class_has_no_auc():
+    result = binary_metrics(np.ones(4), np.array([0.2, 0.6, 0.7, 0.9]))
+
+    assert np.isnan(result['roc_auc'])
+    assert result['recall'] == pytest.approx(0.75)
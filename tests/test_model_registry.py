@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import Future
+from datetime import datetime
+import pytest
+import src.model_registry as model_registry
+from src.model_registry import publish_model_version, read_latest_version, pin_version, unpin_version, is_pinned
+from src.scoring_jobs import ScoringJobManager
+
+
+class FrozenDatetime:
+
+    now_value = datetime(2026, 1, 1, 12, 0, 0)
+
+    @classmethod
+    def now(cls):
+        return cls.now_value
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(model_registry, 'datetime', FrozenDatetime)
+    return FrozenDatetime
+
+
+def write_artifact(tmp_path, content):
+    path = tmp_path / 'model.bin'
+    path.write_bytes(content)
+    return [str(path)]
+
+
+def publish_at(clock, second, registry_dir, artifact_paths, keep_versions=5):
+    clock.now_value = datetime(2026, 1, 1, 12, 0, second)
+    return publish_model_version(registry_dir, artifact_paths, keep_versions=keep_versions)
+
+
+def test_republishing_identical_artifacts_in_same_second_is_a_noop(tmp_path, frozen_clock):
+    registry_dir = str(tmp_path / 'registry')
+    artifact_paths = write_artifact(tmp_path, b'model-a')
+
+    first = publish_model_version(registry_dir, artifact_paths)
+    second = publish_model_version(registry_dir, artifact_paths)
+
+    assert first == second
+    assert read_latest_version(registry_dir) == first
+    assert sorted(name for name in os.listdir(registry_dir) if not name.startswith('.') and name != 'LATEST') == [first]
+
+
+def test_pruning_skips_pinned_versions(tmp_path, frozen_clock):
+    registry_dir = str(tmp_path / 'registry')
+
+    oldest = publish_at(frozen_clock, 0, registry_dir, write_artifact(tmp_path, b'v0'), keep_versions=2)
+    pin_version(registry_dir, oldest, 'job-1')
+
+    versions = [publish_at(frozen_clock, i, registry_dir, write_artifact(tmp_path, f'v{i}'.encode()), keep_versions=2) for i in range(1, 4)]
+
+    # versi yang di-pin tetap ada, versi lama lain yang tidak di-pin dihapus
+    assert os.path.isdir(os.path.join(registry_dir, oldest))
+    assert not os.path.exists(os.path.join(registry_dir, versions[0]))
+    assert all(os.path.isdir(os.path.join(registry_dir, version)) for version in versions[1:])
+
+    unpin_version(registry_dir, oldest, 'job-1')
+    publish_at(frozen_clock, 4, registry_dir, write_artifact(tmp_path, b'v4'), keep_versions=2)
+
+    assert not os.path.exists(os.path.join(registry_dir, oldest))
+    assert not is_pinned(registry_dir, oldest)
+
+
+class FakeRegistry:
+
+    def __init__(self, registry_dir):
+        self.registry_dir = registry_dir
+
+
+def test_scoring_job_pin_is_released_when_job_finishes(tmp_path):
+    registry_dir = str(tmp_path / 'registry')
+    job_dir = str(tmp_path / 'jobs' / 'abc123')
+    manager = ScoringJobManager(str(tmp_path / 'jobs'), FakeRegistry(registry_dir))
+
+    manager._pin(job_dir, '20260101120000-deadbeef')
+    assert is_pinned(registry_dir, '20260101120000-deadbeef')
+
+    future = Future()
+    future.set_result(None)
+    manager._on_job_done(job_dir, 1, '20260101120000-deadbeef', future)
+
+    assert not is_pinned(registry_dir, '20260101120000-deadbeef')
+
+    # artifact di luar registry (fallback) tidak perlu di-pin
+    manager._pin(job_dir, 'fallback')
+    assert not os.path.exists(os.path.join(registry_dir, '.pins', 'fallback'))
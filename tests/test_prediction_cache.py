@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import src.prediction_cache as prediction_cache
+from src.prediction_cache import PredictionCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache, 'time', clock)
+    return clock
+
+
+def keys(*names):
+    return [('v1', name) for name in names]
+
+
+def test_lru_evicts_least_recently_used_entry(clock):
+    cache = PredictionCache(max_entries=3, ttl_seconds=60)
+    cache.put_many(keys('a', 'b', 'c'), [1, 2, 3])
+
+    # 'a' dibaca sehingga menjadi yang terbaru, 'b' yang paling lama tidak dipakai
+    assert cache.get_many(keys('a')) == [1]
+    cache.put_many(keys('d'), [4])
+
+    assert cache.get_many(keys('a', 'b', 'c', 'd')) == [1, None, 3, 4]
+    assert cache.evictions == 1
+    assert len(cache) == 3
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=60)
+    cache.put_many(keys('a'), [1])
+
+    clock.now += 59
+    cache.put_many(keys('b'), [2])
+    assert cache.get_many(keys('a', 'b')) == [1, 2]
+
+    clock.now += 2
+    assert cache.get_many(keys('a', 'b')) == [None, 2]
+    assert len(cache) == 1   # entry kadaluarsa dibuang saat dibaca
+
+    clock.now += 60
+    assert cache.get_many(keys('b')) == [None]
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_row_keys_depend_on_values_and_model_version():
+    X = np.array([[1.0, -0.0], [1.0, 0.0], [2.0, 0.0]], dtype=np.float32)
+
+    v1 = PredictionCache.row_keys(X, 'v1')
+    v2 = PredictionCache.row_keys(X, 'v2')
+
+    assert v1[0] == v1[1]           # -0.0 dan 0.0 menghasilkan key yang sama
+    assert v1[0] != v1[2]
+    assert v1[0] != v2[0]           # versi model baru tidak memakai hasil versi lama
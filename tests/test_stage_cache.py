@@ -0,0 +1,124 @@
+import os
+import pytest
+from src.stage_cache import StageCache, local_module_files
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    # project kecil : stage.py -> src/helper.py -> utils/common.py, plus module pihak ketiga yang diabaikan
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'utils').mkdir()
+    (tmp_path / 'src' / '__init__.py').write_text('')
+    (tmp_path / 'src' / 'stage.py').write_text('import os\nimport numpy as np\nfrom src.helper import scale\n')
+    (tmp_path / 'src' / 'helper.py').write_text('from utils import common\n\ndef scale(x):\n    return x\n')
+    (tmp_path / 'utils' / 'common.py').write_text('FACTOR = 2\n')
+    (tmp_path / 'src' / 'unused.py').write_text('')
+    (tmp_path / 'input.csv').write_text('a,b\n1,2\n')
+
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class Stage:
+
+    # stage palsu : menulis output dari input & config, dan menghitung berapa kali dijalankan
+    def __init__(self):
+        self.calls = 0
+        self.config = {'factor': 2}
+
+    def __call__(self):
+        self.calls += 1
+        os.makedirs('out', exist_ok=True)
+        with open('input.csv', 'rb') as f:
+            data = f.read()
+        with open('out/result.bin', 'wb') as f:
+            f.write(data * self.config['factor'] + os.urandom(8))   # isi berbeda setiap run
+        with open('out/log.txt', 'w') as f:
+            f.write(f'run {self.calls}')
+
+
+def run(cache, stage):
+    return cache.run(
+        'stage',
+        stage,
+        outputs=['out/result.bin', 'out/log.txt'],
+        input_files=['input.csv'],
+        config=stage.config,
+        code_files=local_module_files(['src/stage.py'])
+    )
+
+
+def test_local_module_files_follows_project_imports(project):
+    assert local_module_files(['src/stage.py']) == [os.path.join('src', 'helper.py'), os.path.join('src', 'stage.py'), os.path.join('utils', 'common.py')]
+
+
+def test_cache_hit_restores_outputs_byte_for_byte(project):
+    cache, stage = StageCache('cache'), Stage()
+
+    assert run(cache, stage) is False
+    with open('out/result.bin', 'rb') as f:
+        produced = f.read()
+
+    os.remove('out/result.bin')
+    with open('out/log.txt', 'w') as f:
+        f.write('overwritten')
+
+    assert run(cache, stage) is True
+    assert stage.calls == 1
+    with open('out/result.bin', 'rb') as f:
+        assert f.read() == produced
+    with open('out/log.txt') as f:
+        assert f.read() == 'run 1'
+
+
+@pytest.mark.parametrize('change', ['input', 'config', 'imported_module'])
+def test_changes_cause_a_cache_miss(project, change):
+    cache, stage = StageCache('cache'), Stage()
+    run(cache, stage)
+
+    if change == 'input':
+        with open('input.csv', 'a') as f:
+            f.write('3,4\n')
+    elif change == 'config':
+        stage.config = {'factor': 3}
+    else:
+        # module yang di-import tidak langsung oleh stage
+        with open('utils/common.py', 'w') as f:
+            f.write('FACTOR = 3\n')
+
+    assert run(cache, stage) is False
+    assert stage.calls == 2
+
+    # perubahan yang sama tidak membuat miss lagi
+    assert run(cache, stage) is True
+    assert stage.calls == 2
+
+
+def test_unrelated_module_does_not_cause_a_cache_miss(project):
+    cache, stage = StageCache('cache'), Stage()
+    run(cache, stage)
+
+    with open('src/unused.py', 'w') as f:
+        f.write('X = 1\n')
+
+    assert run(cache, stage) is True
+
+
+def test_missing_output_is_not_cached(project):
+    cache = StageCache('cache')
+    calls = []
+
+    def incomplete():
+        calls.append(1)
+
+    for _ in range(2):
+        assert cache.run('stage', incomplete, outputs=['out/never.bin'], input_files=['input.csv']) is False
+    assert len(calls) == 2
+
+
+def test_disabled_cache_always_runs(project):
+    cache, stage = StageCache('cache', enabled=False), Stage()
+
+    assert run(cache, stage) is False
+    assert run(cache, stage) is False
+    assert stage.calls == 2
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from lightgbm import LGBMClassifier
+from src.tree_engine import CompiledTreeEnsemble, compile_booster
+
+
+@pytest.fixture(scope='module')
+def training_data(raw_df, transformer):
+    df = transformer.transform(raw_df.copy())
+    X = df[transformer.selected_features].to_numpy(dtype=np.float64)
+    y = df['booking_status'].to_numpy()
+
+    # NaN di kolom numerik & kode kategori, sehingga model belajar arah default untuk missing value
+    rng = np.random.default_rng(0)
+    X[rng.random(X.shape) < 0.1] = np.nan
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def model(training_data):
+    X, y = training_data
+    return LGBMClassifier(n_estimators=40, num_leaves=15, min_child_samples=5, verbose=-1).fit(X, y)
+
+
+def test_compiled_model_matches_lightgbm_with_missing_and_categorical_values(model, training_data, transformer, tmp_path):
+    X, _ = training_data
+    features = transformer.selected_features
+
+    rows = X[:500].copy()
+    rows[0] = np.nan                        # semua fitur kosong
+    rows[1, features.index('market_segment_type')] = np.nan
+    rows[2, features.index('lead_time')] = 0.0
+    rows[3, features.index('room_type_reserved')] = 6  # kode kategori terbesar
+
+    compiled = CompiledTreeEnsemble.from_model(model)
+    compiled.save(str(tmp_path / 'model_compiled.npz'))
+    reloaded = CompiledTreeEnsemble.load(str(tmp_path / 'model_compiled.npz'))
+
+    expected = model.predict_proba(rows)
+    np.testing.assert_allclose(compiled.predict_proba(rows), expected, atol=1e-6)
+    np.testing.assert_allclose(reloaded.predict_proba(rows), expected, atol=1e-6)
+    np.testing.assert_array_equal(reloaded.predict(rows), model.predict(rows))
+
+
+def test_compiled_model_matches_lightgbm_across_chunks(model, training_data):
+    X, _ = training_data
+
+    # batch lebih besar dari chunk_size ditelusuri per chunk
+    compiled = CompiledTreeEnsemble(compile_booster(model.booster_), chunk_size=128)
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+
+def test_compile_rejects_multiclass_models(training_data):
+    X, _ = training_data
+    y = np.arange(len(X)) % 3
+
+    multiclass = LGBMClassifier(n_estimators=2, verbose=-1).fit(X, y)
+    with pytest.raises(ValueError, match='only binary models'):
+        compile_booster(multiclass.booster_)
@@ -1,7 +1,8 @@
 import os
-import pandas as pd
+import numpy as np
 from src.logger import get_logger
 from src.custom_exception import CustomException
+from config.data_schema import COLUMN_DTYPES, CATEGORICAL_COLUMNS
 import yaml
 import sys
 
@@ -22,16 +23,157 @@ def read_yaml(file_path):
         raise CustomException('failed to  read YAML file', sys)
     
 
-def load_data(path, name_path=False):
+def artifact_format(path):
+    # format ditentukan dari ekstensi file : .parquet / .feather (arrow ipc) / .csv
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+
+    if extension in ('parquet', 'pq'):
+        return 'parquet'
+    if extension in ('feather', 'arrow', 'ipc'):
+        return 'feather'
+    if extension == 'csv':
+        return 'csv'
+
+    raise ValueError(f'unsupported artifact format for {path}')
+
+
+def optimize_dtypes(df, dtypes=COLUMN_DTYPES, categorize=True):
+    import pandas as pd  # di-import saat dipakai, serving (read_yaml) tidak perlu memuat pandas
+
+    for col in df.columns:
+        series = df[col]
+        target = dtypes.get(col)
+
+        if pd.api.types.is_bool_dtype(series):
+            continue
+
+        if pd.api.types.is_integer_dtype(series):
+            # pakai tipe dari schema jika range nilainya muat, selain itu downcast otomatis
+            if target is not None and target.startswith('int') and len(series) > 0:
+                info = np.iinfo(target)
+                if info.min <= series.min() and series.max() <= info.max:
+                    df[col] = series.astype(target)
+                    continue
+            df[col] = pd.to_numeric(series, downcast='integer')
+
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype('float32')
+
+        elif categorize and col in CATEGORICAL_COLUMNS and pd.api.types.is_string_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+            df[col] = series.astype('category')
+
+    return df
+
+
+def load_data(path, name_path=False, memory_map=True):
     try:
         if name_path==False:
             logger.info('loading the data')
         else:
             logger.info(f'Loading Data from {name_path}')
 
-        return pd.read_csv(path)
+        file_format = artifact_format(path)
+
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.read_table(path, memory_map=memory_map).to_pandas()
+
+        if file_format == 'feather':
+            import pyarrow.feather as feather
+            return feather.read_table(path, memory_map=memory_map).to_pandas()
+
+        import pandas as pd
+        return optimize_dtypes(pd.read_csv(path))
     
     except Exception as e:
         logger.error(f'Error loading the data {e}')
         raise CustomException('Failed to load the data', sys)
-    
\ No newline at end of file
+
+
+def write_data(df, path):
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        file_format = artifact_format(path)
+        df = optimize_dtypes(df.reset_index(drop=True))  # index tidak ikut disimpan (tidak ada lagi kolom 'Unnamed: 0')
+
+        if file_format == 'parquet':
+            df.to_parquet(path, index=False)
+        elif file_format == 'feather':
+            df.to_feather(path)
+        else:
+            df.to_csv(path, index=False)
+
+        logger.info(f'data written to {path} as {file_format}')
+
+    except Exception as e:
+        logger.error(f'Error writing the data {e}')
+        raise CustomException('Failed to write the data', sys)
+
+
+class ArtifactWriter:
+
+    # menulis dataframe per chunk ke 1 file artifact tanpa menampung semua data di memori
+    def __init__(self, path, dtypes=COLUMN_DTYPES):
+        self.path = path
+        self.file_format = artifact_format(path)
+        self.dtypes = dtypes
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        return self
+
+    def artifact_schema(self, df):
+        # schema ditentukan 1x dari tipe kolom (config/data_schema.py), bukan dari nilai chunk pertama
+        # yang bisa kosong atau rentangnya lebih sempit dari chunk berikutnya
+        import pandas as pd
+        import pyarrow as pa
+
+        fields = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series):
+                arrow_type = pa.bool_()
+            elif pd.api.types.is_numeric_dtype(series):
+                default = 'float32' if pd.api.types.is_float_dtype(series) else 'int64'
+                arrow_type = pa.from_numpy_dtype(np.dtype(self.dtypes.get(col, default)))
+            else:
+                arrow_type = pa.string()  # tanpa dictionary agar schema tiap chunk selalu sama
+            fields.append(pa.field(col, arrow_type))
+
+        return pa.schema(fields)
+
+    def write(self, df):
+        df = df.reset_index(drop=True)
+
+        if self.file_format == 'csv':
+            df = optimize_dtypes(df, self.dtypes, categorize=False)
+            df.to_csv(self.path, mode='a', header=self.rows == 0, index=False)
+            self.rows += len(df)
+            return
+
+        import pyarrow as pa
+
+        if self._writer is None:
+            self._schema = self.artifact_schema(df)
+            if self.file_format == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+
+        # setiap chunk (termasuk chunk pertama) di-cast ke schema yang sama, nilai di luar rentang tipe akan error
+        table = pa.Table.from_pandas(df, preserve_index=False).cast(self._schema)
+
+        self._writer.write_table(table)
+        self.rows += len(df)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._writer is not None:
+            self._writer.close()
+        return False